@@ -0,0 +1,203 @@
+"""Compare article body storage: inline text, compressed, compressed with a dictionary.
+
+A database in the old layout (summary and full_text as uncompressed
+columns of articles) is filled with synthetic articles built from the
+paragraphs of a corpus of texts, each ending in its feed's boilerplate.
+It is then migrated to compressed article_bodies, and finally a trained
+dictionary is added and the bodies recompressed. After each step the
+benchmark reports the file size (after VACUUM), the bytes of stored
+bodies, the time of a sort over every article row (as listing queries
+do) and the time to read one article's text. Articles drawn from a small
+corpus repeat its paragraphs, which flatters compression; point --corpus
+at a directory of many texts for realistic ratios. Run from the
+repository root:
+    
+    python benchmarks/article_bodies.py
+    python benchmarks/article_bodies.py --articles 20000 --corpus ~/texts
+"""
+
+import argparse
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from rss_reader.db import connection, models  # noqa: E402
+from rss_reader.db.bodies import train_dictionary  # noqa: E402
+
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "fixtures"
+
+FEEDS = 20
+
+# Articles table as it was before bodies moved to article_bodies
+LEGACY_SCHEMA_SQL = """
+CREATE TABLE feeds (
+    feed_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    last_updated TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE articles (
+    article_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    feed_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    link TEXT NOT NULL UNIQUE,
+    summary TEXT,
+    full_text TEXT,
+    published_date TIMESTAMP,
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (feed_id) REFERENCES feeds(feed_id) ON DELETE CASCADE
+);
+"""
+
+# Touches every article row, like sorting or filtering a listing does
+SCAN_SQL = "SELECT article_id, title FROM articles ORDER BY title DESC LIMIT 50"
+
+
+def load_paragraphs(directory: Path) -> list[str]:
+    """Split every .txt file in a directory into paragraphs (one per line)."""
+    paragraphs = []
+    for path in sorted(directory.glob("*.txt")):
+        text = path.read_text(encoding="utf-8", errors="replace")
+        paragraphs += [line.strip() for line in text.splitlines() if line.strip()]
+    return paragraphs
+
+
+def build_legacy_database(path: Path, paragraphs: list[str], articles: int) -> None:
+    """Create a database in the old layout filled with synthetic articles."""
+    rng = random.Random(42)
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA_SQL)
+    conn.executemany(
+        "INSERT INTO feeds (url, name) VALUES (?, ?)",
+        [(f"https://feed{n}.example.com/rss", f"Feed {n}") for n in range(FEEDS)]
+    )
+    rows = []
+    for n in range(articles):
+        feed = n % FEEDS
+        body = rng.sample(paragraphs, min(len(paragraphs), rng.randint(3, 12)))
+        title = " ".join(body[0].split()[:8])
+        footer = f"The post {title} appeared first on Feed {feed}. Subscribe to Feed {feed} for more."
+        rows.append((
+            feed + 1,
+            f"{title} {n}",
+            f"https://feed{feed}.example.com/{n}",
+            f"{body[0][:300]} {footer}",
+            "\n\n".join(body + [footer]),
+            f"2024-01-01 00:00:{n % 60:02d}",
+        ))
+    conn.executemany(
+        "INSERT INTO articles (feed_id, title, link, summary, full_text, published_date) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        rows
+    )
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+
+
+def timed(function, repeat: int) -> float:
+    """Median wall time of a call in milliseconds."""
+    function()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def measure_legacy(path: Path, article_ids: list[int], repeat: int) -> dict:
+    """Measure the old layout with plain SQL (the current code cannot read it)."""
+    conn = sqlite3.connect(path)
+    body_bytes = conn.execute(
+        "SELECT COALESCE(SUM(LENGTH(CAST(summary AS BLOB))), 0) "
+        "+ COALESCE(SUM(LENGTH(CAST(full_text AS BLOB))), 0) FROM articles"
+    ).fetchone()[0]
+    ids = iter(article_ids * (repeat + 1))
+    result = {
+        'database_bytes': path.stat().st_size,
+        'body_bytes': body_bytes,
+        'scan_ms': timed(lambda: conn.execute(SCAN_SQL).fetchall(), repeat),
+        'read_ms': timed(
+            lambda: conn.execute(
+                "SELECT summary, full_text FROM articles WHERE article_id = ?", (next(ids),)
+            ).fetchone(),
+            repeat
+        ),
+    }
+    conn.close()
+    return result
+
+
+def measure_current(article_ids: list[int], repeat: int) -> dict:
+    """Measure the database open through rss_reader.db."""
+    models.vacuum_database()
+    stats = models.get_database_stats()
+    conn = connection.get_connection()
+    ids = iter(article_ids * (repeat + 1))
+    return {
+        'database_bytes': stats['database_bytes'],
+        'body_bytes': stats['body_bytes'],
+        'scan_ms': timed(lambda: conn.execute(SCAN_SQL).fetchall(), repeat),
+        'read_ms': timed(lambda: models.get_article(next(ids)), repeat),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=5000, help="Synthetic articles to store")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Directory of .txt files")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed runs of each query")
+    args = parser.parse_args()
+    
+    paragraphs = load_paragraphs(args.corpus)
+    if not paragraphs:
+        print(f"No .txt files in {args.corpus}", file=sys.stderr)
+        return 1
+    
+    article_ids = random.Random(7).sample(range(1, args.articles + 1), min(args.articles, 100))
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bodies.db"
+        build_legacy_database(path, paragraphs, args.articles)
+        results["inline text"] = measure_legacy(path, article_ids, args.repeat)
+        
+        connection.set_database_path(path)
+        start = time.perf_counter()
+        connection.get_connection()  # migrates the bodies on open
+        migration_seconds = time.perf_counter() - start
+        results["zlib"] = measure_current(article_ids, args.repeat)
+        
+        dictionary = train_dictionary(models.get_body_samples())
+        models.add_compression_dictionary(dictionary)
+        models.recompress_article_bodies()
+        results["zlib + dictionary"] = measure_current(article_ids, args.repeat)
+        connection.close_connection()
+    
+    print(
+        f"{args.articles} articles from {len(paragraphs)} paragraphs in {args.corpus}; "
+        f"migration took {migration_seconds:.2f}s, dictionary {len(dictionary) / 1024:.1f} KiB\n"
+    )
+    print(f"{'layout':<18} {'file MiB':>9} {'bodies MiB':>11} {'scan ms':>8} {'read ms':>8}")
+    for layout, result in results.items():
+        print(
+            f"{layout:<18} {result['database_bytes'] / 1024 / 1024:>9.1f} "
+            f"{result['body_bytes'] / 1024 / 1024:>11.1f} "
+            f"{result['scan_ms']:>8.2f} {result['read_ms']:>8.3f}"
+        )
+    print("\nscan: sort of every article row by title; read: one article's summary and text.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
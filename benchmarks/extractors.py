@@ -0,0 +1,127 @@
+"""Compare article extractor engines on a corpus of saved HTML pages.
+
+Every registered engine extracts every page in the corpus. For each engine
+the benchmark reports pages per second, peak Python memory (tracemalloc)
+while extracting a page, mean extracted length and, for pages with a
+reference text next to them (page.html + page.txt), word-level recall and
+precision against that reference. Run from the repository root:
+    
+    python benchmarks/extractors.py
+    python benchmarks/extractors.py --corpus ~/saved-pages --repeat 20 readability
+"""
+
+import argparse
+import re
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from rss_reader.fetcher.article_extractor import engine_names, get_engine  # noqa: E402
+
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "fixtures"
+
+_WORD = re.compile(r"\w+")
+
+
+def load_corpus(directory: Path) -> list[tuple[str, str, str | None]]:
+    """Load saved pages and their optional reference texts.
+    
+    Returns:
+        Tuples of (name, html, reference text or None)
+    """
+    pages = []
+    for path in sorted(directory.glob("*.html")):
+        reference = path.with_suffix(".txt")
+        pages.append((
+            path.stem,
+            path.read_text(encoding="utf-8", errors="replace"),
+            reference.read_text(encoding="utf-8") if reference.exists() else None,
+        ))
+    return pages
+
+
+def word_overlap(extracted: str, reference: str) -> tuple[float, float]:
+    """Word-level recall and precision of extracted text against a reference."""
+    got = Counter(_WORD.findall(extracted.lower()))
+    expected = Counter(_WORD.findall(reference.lower()))
+    common = sum((got & expected).values())
+    recall = common / sum(expected.values()) if expected else 1.0
+    precision = common / sum(got.values()) if got else 0.0
+    return recall, precision
+
+
+def benchmark(engine_name: str, pages: list, repeat: int) -> dict:
+    """Run one engine over the corpus."""
+    engine = get_engine(engine_name)
+    
+    # Warm up (imports, lazily built backends) outside the measurements
+    for name, html, _ in pages:
+        engine.extract(f"https://example.com/{name}", html)
+    
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for name, html, _ in pages:
+            engine.extract(f"https://example.com/{name}", html)
+    elapsed = time.perf_counter() - start
+    
+    # Memory and quality from one separate pass, so tracing does not skew timing
+    peak = 0
+    lengths, recalls, precisions = [], [], []
+    for name, html, reference in pages:
+        tracemalloc.start()
+        text = engine.extract(f"https://example.com/{name}", html) or ""
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        
+        lengths.append(len(text))
+        if reference is not None:
+            recall, precision = word_overlap(text, reference)
+            recalls.append(recall)
+            precisions.append(precision)
+    
+    return {
+        'pages_per_second': repeat * len(pages) / elapsed if elapsed else 0.0,
+        'peak_kib': peak / 1024,
+        'mean_length': sum(lengths) / len(lengths),
+        'recall': sum(recalls) / len(recalls) if recalls else None,
+        'precision': sum(precisions) / len(precisions) if precisions else None,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("engines", nargs="*", help=f"Engines to run (default: {', '.join(engine_names())})")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Directory of saved .html pages")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed passes over the corpus")
+    args = parser.parse_args()
+    
+    pages = load_corpus(args.corpus)
+    if not pages:
+        print(f"No .html files in {args.corpus}", file=sys.stderr)
+        return 1
+    
+    print(f"{len(pages)} pages from {args.corpus}\n")
+    print(f"{'engine':<12} {'pages/s':>9} {'peak KiB':>9} {'chars':>8} {'recall':>7} {'precision':>9}")
+    for engine_name in args.engines or engine_names():
+        result = benchmark(engine_name, pages, max(1, args.repeat))
+        quality = (
+            f"{result['recall']:>7.2f} {result['precision']:>9.2f}"
+            if result['recall'] is not None else f"{'-':>7} {'-':>9}"
+        )
+        print(
+            f"{engine_name:<12} {result['pages_per_second']:>9.1f} {result['peak_kib']:>9.0f} "
+            f"{result['mean_length']:>8.0f} {quality}"
+        )
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
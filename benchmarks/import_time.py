@@ -0,0 +1,95 @@
+"""Measure the import cost of each top-level rss_reader package.
+
+Every package is imported in a fresh interpreter with `python -X importtime`,
+so the numbers match what a process pays at startup. Run from the
+repository root:
+    
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --repeat 5 --top 8 rss_reader.fetcher
+"""
+
+import argparse
+import pkgutil
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import rss_reader  # noqa: E402
+
+
+def discover_packages() -> list[str]:
+    """List rss_reader and its top-level packages and modules."""
+    names = [
+        f"rss_reader.{info.name}"
+        for info in pkgutil.iter_modules(rss_reader.__path__)
+    ]
+    return ["rss_reader"] + sorted(names)
+
+
+def measure(module: str) -> dict[str, tuple[int, int]]:
+    """Import a module in a fresh interpreter and parse -X importtime output.
+    
+    Args:
+        module: Dotted module name (empty to measure interpreter startup only)
+    
+    Returns:
+        Mapping of every imported module to (self, cumulative) microseconds
+    """
+    code = f"import {module}" if module else "pass"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=ROOT
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+    
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", help="Modules to measure (default: all packages)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per module; the median is reported")
+    parser.add_argument("--top", type=int, default=5, help="Slowest dependencies listed per module")
+    args = parser.parse_args()
+    
+    # Modules every interpreter imports at startup are not the package's cost
+    startup = set(measure(""))
+    
+    for module in args.modules or discover_packages():
+        runs = [measure(module) for _ in range(max(1, args.repeat))]
+        for run in runs:
+            for name in startup:
+                run.pop(name, None)
+        total = statistics.median(run[module][1] for run in runs)
+        
+        # Cost of each dependency by its own import time, median over runs
+        self_times: dict[str, list[int]] = {}
+        for run in runs:
+            for name, (self_us, _) in run.items():
+                self_times.setdefault(name, []).append(self_us)
+        heaviest = sorted(
+            ((statistics.median(times), name) for name, times in self_times.items() if name != module),
+            reverse=True
+        )[:args.top]
+        
+        print(f"{module:<24} {total / 1000:8.1f} ms  ({len(runs[0])} modules)")
+        for self_us, name in heaviest:
+            print(f"    {self_us / 1000:8.1f} ms  {name}")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
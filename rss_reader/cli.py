@@ -0,0 +1,332 @@
+"""Headless command-line interface for cron-style use.
+
+Each command imports only the subsystems it needs, so `fetch` and
+`stats` never load Textual, PyTorch or scikit-learn.
+"""
+
+import argparse
+import logging
+import sys
+from typing import Optional
+
+from .db.connection import set_database_path
+
+
+logger = logging.getLogger(__name__)
+
+
+def cmd_fetch(args: argparse.Namespace) -> int:
+    """Fetch feeds and store new articles."""
+    from .db import models
+    from .fetcher.refresh import fetch_all_feeds
+    from .fetcher.article_extractor import set_default_engine
+    from .fetcher.parse_pool import configure_parse_pool
+    
+    if args.feed:
+        feeds = [feed for feed in models.get_all_feeds() if feed['feed_id'] in set(args.feed)]
+        missing = set(args.feed) - {feed['feed_id'] for feed in feeds}
+        if missing:
+            print(f"Unknown feed id(s): {', '.join(map(str, sorted(missing)))}", file=sys.stderr)
+            return 2
+    else:
+        feeds = models.get_all_feeds()
+    
+    if not feeds:
+        print("No feeds to fetch.")
+        return 0
+    
+    set_default_engine(args.engine)
+    configure_parse_pool(args.parse_workers, timeout=args.parse_timeout, engine=args.engine)
+    summary = fetch_all_feeds(
+        feeds,
+        max_workers=args.max_workers,
+        per_host_limit=args.per_host,
+        generate_embeddings=not args.no_embeddings,
+        ignore_breaker=args.force
+    )
+    
+    print(
+        f"Fetched {summary.total_feeds - len(summary.errors)}/{summary.total_feeds} feeds, "
+        f"added {summary.total_new} new articles."
+    )
+    for name in summary.errors:
+        print(f"  failed: {name}", file=sys.stderr)
+    for name in summary.skipped:
+        print(f"  skipped (failing, retry later): {name}", file=sys.stderr)
+    
+    # Only fail the run when nothing could be fetched at all
+    return 1 if summary.errors and len(summary.errors) == summary.total_feeds else 0
+
+
+def cmd_import_opml(args: argparse.Namespace) -> int:
+    """Subscribe to the feeds listed in an OPML file."""
+    from .fetcher.opml import OpmlError, import_opml
+    
+    try:
+        result = import_opml(
+            args.file,
+            validate=not args.no_validate,
+            fetch=args.fetch,
+            max_workers=args.max_workers,
+            per_host_limit=args.per_host,
+            generate_embeddings=not args.no_embeddings
+        )
+    except (OSError, OpmlError) as e:
+        print(f"Cannot import {args.file}: {e}", file=sys.stderr)
+        return 2
+    
+    print(
+        f"Added {len(result.added)} feeds, {len(result.existing)} already subscribed, "
+        f"{len(result.invalid)} invalid."
+    )
+    for url, error in result.invalid.items():
+        print(f"  invalid: {url} ({error})", file=sys.stderr)
+    if result.refresh is not None:
+        print(
+            f"Fetched {result.refresh.total_feeds - len(result.refresh.errors)}/"
+            f"{result.refresh.total_feeds} feeds, added {result.refresh.total_new} new articles."
+        )
+    return 0
+
+
+def cmd_export_opml(args: argparse.Namespace) -> int:
+    """Write all subscriptions as an OPML file."""
+    from .fetcher.opml import export_opml
+    
+    if args.file == "-":
+        export_opml(sys.stdout.buffer)
+        sys.stdout.buffer.write(b"\n")
+        return 0
+    
+    count = export_opml(args.file)
+    print(f"Exported {count} feeds to {args.file}.")
+    return 0
+
+
+def cmd_backfill(args: argparse.Namespace) -> int:
+    """Generate embeddings for articles that have none."""
+    from .ml.backfill import backfill_embeddings
+    
+    generated, missing = backfill_embeddings()
+    print(f"Generated {generated}/{missing} missing embeddings.")
+    return 0 if generated == missing else 1
+
+
+def cmd_recommend(args: argparse.Namespace) -> int:
+    """Print personalized recommendations."""
+    from .ml import get_recommendations
+    
+    recommendations = get_recommendations(limit=args.limit)
+    if not recommendations:
+        print("No recommendations available (like at least 5 articles first).")
+        return 0
+    
+    for rec in recommendations:
+        print(f"{rec['similarity_score']:.2f}  [{rec['feed_name']}] {rec['title']}")
+        print(f"      {rec['link']}")
+    return 0
+
+
+def cmd_stats(args: argparse.Namespace) -> int:
+    """Print database statistics."""
+    from .db import models
+    from .fetcher.extraction_cache import get_extraction_cache
+    
+    stats = models.get_database_stats()
+    cache = get_extraction_cache().stats()
+    
+    print(f"Feeds:              {stats['feeds']}")
+    print(f"Articles:           {stats['articles']}")
+    print(f"  with full text:   {stats['articles_with_text']}")
+    print(f"  near duplicates:  {stats['duplicates']}")
+    print(f"  with embeddings:  {stats['embeddings']}")
+    print(f"Liked articles:     {stats['likes']}")
+    print(f"Article bodies:     {stats['body_bytes'] / 1024 / 1024:.1f} MiB compressed")
+    print(f"Database file:      {stats['database_bytes'] / 1024 / 1024:.1f} MiB")
+    print(f"Extraction cache:   {cache['entries']} entries, {cache['bytes'] / 1024 / 1024:.1f} MiB")
+    return 0
+
+
+def cmd_compact(args: argparse.Namespace) -> int:
+    """Recompress article bodies and shrink the database file."""
+    from .db import models
+    from .db.bodies import train_dictionary
+    
+    before = models.get_database_stats()['database_bytes']
+    
+    if args.train_dictionary:
+        dictionary = train_dictionary(models.get_body_samples(args.samples))
+        if not dictionary:
+            print("Stored articles share no text to build a dictionary from.")
+        else:
+            models.add_compression_dictionary(dictionary)
+            recompressed = models.recompress_article_bodies()
+            print(f"Trained a {len(dictionary) / 1024:.1f} KiB dictionary, recompressed {recompressed} articles.")
+    
+    models.vacuum_database()
+    after = models.get_database_stats()['database_bytes']
+    print(f"Database file: {before / 1024 / 1024:.1f} MiB -> {after / 1024 / 1024:.1f} MiB.")
+    return 0
+
+
+def cmd_report(args: argparse.Namespace) -> int:
+    """Print the slowest or costliest feeds from the fetch log."""
+    from .fetcher.telemetry import STEPS, feed_report
+    
+    reports = feed_report(days=args.days, sort=args.sort, limit=args.limit)
+    if not reports:
+        print(f"No fetches recorded in the last {args.days:g} days.")
+        return 0
+    
+    steps = "".join(f"{step:>9}" for step in STEPS)
+    print(f"{'Feed':<30} {'fetches':>7} {'errors':>6} {'p50':>7} {'p90':>7} {'p99':>7} "
+          f"{'total':>8}{steps} {'KiB':>8} {'new':>5}")
+    for report in reports:
+        means = "".join(f"{report.step_seconds[step]:>9.2f}" for step in STEPS)
+        print(
+            f"{report.name[:30]:<30} {report.fetches:>7} {report.errors:>6} "
+            f"{report.p50:>7.2f} {report.p90:>7.2f} {report.p99:>7.2f} "
+            f"{report.total_seconds:>8.1f}{means} "
+            f"{report.bytes_received / 1024:>8.0f} {report.new_articles:>5}"
+        )
+    print("Times in seconds; step columns are means per fetch.")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for rss-reader-cli."""
+    from .fetcher.refresh import DEFAULT_MAX_WORKERS, DEFAULT_PER_HOST_LIMIT
+    from .fetcher.article_extractor import NewspaperEngine, engine_names
+    from .fetcher.parse_pool import DEFAULT_PARSE_TIMEOUT
+    from .fetcher.telemetry import SORT_KEYS
+    
+    parser = argparse.ArgumentParser(
+        prog="rss-reader-cli",
+        description="Headless RSS reader commands."
+    )
+    parser.add_argument("--db", help="Path to SQLite database (default: rss_reader.db)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log progress to stderr")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    fetch = subparsers.add_parser("fetch", help="Fetch feeds and store new articles")
+    fetch.add_argument(
+        "--feed", type=int, action="append", metavar="FEED_ID",
+        help="Only fetch this feed (repeatable; default: all feeds)"
+    )
+    fetch.add_argument(
+        "--max-workers", type=int, default=DEFAULT_MAX_WORKERS,
+        help="Maximum number of feeds fetched at once"
+    )
+    fetch.add_argument(
+        "--per-host", type=int, default=DEFAULT_PER_HOST_LIMIT,
+        help="Maximum number of feeds fetched at once from one host"
+    )
+    fetch.add_argument(
+        "--no-embeddings", action="store_true",
+        help="Do not generate ML embeddings for new articles"
+    )
+    fetch.add_argument(
+        "--engine", choices=engine_names(), default=NewspaperEngine.name,
+        help="Extractor for pages Tavily does not handle (default: newspaper)"
+    )
+    fetch.add_argument(
+        "--parse-workers", type=int, default=0, metavar="N",
+        help="Parse pages in N worker processes (default: parse in-process)"
+    )
+    fetch.add_argument(
+        "--parse-timeout", type=float, default=DEFAULT_PARSE_TIMEOUT, metavar="SECONDS",
+        help="Kill a parse worker stuck on one page for this long"
+    )
+    fetch.add_argument(
+        "--force", action="store_true",
+        help="Also fetch feeds that are being skipped after repeated failures"
+    )
+    fetch.set_defaults(func=cmd_fetch)
+    
+    import_opml = subparsers.add_parser("import-opml", help="Subscribe to the feeds in an OPML file")
+    import_opml.add_argument("file", help="OPML file to import")
+    import_opml.add_argument(
+        "--no-validate", action="store_true",
+        help="Add feeds without fetching them first to check they work"
+    )
+    import_opml.add_argument(
+        "--fetch", action="store_true",
+        help="Fetch articles of the added feeds right away"
+    )
+    import_opml.add_argument(
+        "--max-workers", type=int, default=DEFAULT_MAX_WORKERS,
+        help="Maximum number of feeds fetched at once"
+    )
+    import_opml.add_argument(
+        "--per-host", type=int, default=DEFAULT_PER_HOST_LIMIT,
+        help="Maximum number of feeds fetched at once from one host"
+    )
+    import_opml.add_argument(
+        "--no-embeddings", action="store_true",
+        help="Do not generate ML embeddings when fetching"
+    )
+    import_opml.set_defaults(func=cmd_import_opml)
+    
+    export_opml = subparsers.add_parser("export-opml", help="Write all subscriptions as OPML")
+    export_opml.add_argument(
+        "file", nargs="?", default="-",
+        help="File to write (default: standard output)"
+    )
+    export_opml.set_defaults(func=cmd_export_opml)
+    
+    backfill = subparsers.add_parser("backfill", help="Generate missing article embeddings")
+    backfill.set_defaults(func=cmd_backfill)
+    
+    recommend = subparsers.add_parser("recommend", help="Show personalized recommendations")
+    recommend.add_argument("--limit", type=int, default=20, help="Number of recommendations")
+    recommend.set_defaults(func=cmd_recommend)
+    
+    stats = subparsers.add_parser("stats", help="Show database statistics")
+    stats.set_defaults(func=cmd_stats)
+    
+    compact = subparsers.add_parser(
+        "compact", help="Recompress article bodies and shrink the database file"
+    )
+    compact.add_argument(
+        "--train-dictionary", action="store_true",
+        help="Train a compression dictionary on stored articles and recompress them with it"
+    )
+    compact.add_argument(
+        "--samples", type=int, default=1000,
+        help="Most recent articles to train the dictionary on (default: 1000)"
+    )
+    compact.set_defaults(func=cmd_compact)
+    
+    report = subparsers.add_parser("report", help="Show the slowest and costliest feeds")
+    report.add_argument(
+        "--days", type=float, default=7,
+        help="Only include fetches from this many days back (default: 7)"
+    )
+    report.add_argument(
+        "--sort", choices=list(SORT_KEYS), default="slowest",
+        help="slowest: p90 fetch time, costliest: total time, largest: bytes (default: slowest)"
+    )
+    report.add_argument("--limit", type=int, default=10, help="Number of feeds to show")
+    report.set_defaults(func=cmd_report)
+    
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Entry point for rss-reader-cli."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(levelname)s: %(message)s'
+    )
+    
+    if args.db:
+        set_database_path(args.db)
+    
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
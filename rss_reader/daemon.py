@@ -0,0 +1,112 @@
+"""Headless daemon that keeps feeds fresh on an adaptive schedule."""
+
+import argparse
+import logging
+import signal
+import threading
+from typing import Optional
+
+from .db.connection import set_database_path
+from .fetcher.article_extractor import NewspaperEngine, engine_names, set_default_engine
+from .fetcher.parse_pool import DEFAULT_PARSE_TIMEOUT, configure_parse_pool
+from .fetcher.refresh import DEFAULT_MAX_WORKERS
+from .fetcher.scheduler import FeedScheduler
+
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on a single sleep, so newly added feeds are picked up
+MAX_SLEEP_SECONDS = 5 * 60
+
+
+def run_daemon(
+    scheduler: FeedScheduler,
+    stop_event: Optional[threading.Event] = None,
+    max_sleep: float = MAX_SLEEP_SECONDS
+) -> None:
+    """Poll due feeds until stopped, sleeping until the next feed is due.
+    
+    Args:
+        scheduler: Scheduler deciding which feeds to poll
+        stop_event: Event that ends the loop when set
+        max_sleep: Longest time to sleep between scheduling passes
+    """
+    stop_event = stop_event or threading.Event()
+    logger.info("Feed daemon started")
+    
+    while not stop_event.is_set():
+        try:
+            summary = scheduler.run_once()
+            if summary.total_feeds:
+                logger.info(
+                    f"Polled {summary.total_feeds} feeds: {summary.total_new} new articles, "
+                    f"{len(summary.errors)} failed"
+                )
+        except Exception as e:
+            logger.error(f"Error during scheduled poll: {e}", exc_info=True)
+        
+        wait = scheduler.seconds_until_next()
+        stop_event.wait(max_sleep if wait is None else min(wait, max_sleep))
+    
+    logger.info("Feed daemon stopped")
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Entry point for rss-reader-daemon."""
+    parser = argparse.ArgumentParser(
+        prog="rss-reader-daemon",
+        description="Poll feeds in the background on a per-feed adaptive schedule."
+    )
+    parser.add_argument("--db", help="Path to SQLite database (default: rss_reader.db)")
+    parser.add_argument(
+        "--max-workers", type=int, default=DEFAULT_MAX_WORKERS,
+        help="Maximum number of feeds polled at once"
+    )
+    parser.add_argument(
+        "--no-embeddings", action="store_true",
+        help="Do not generate ML embeddings for new articles"
+    )
+    parser.add_argument(
+        "--engine", choices=engine_names(), default=NewspaperEngine.name,
+        help="Extractor for pages Tavily does not handle (default: newspaper)"
+    )
+    parser.add_argument(
+        "--parse-workers", type=int, default=0, metavar="N",
+        help="Parse pages in N worker processes (default: parse in-process)"
+    )
+    parser.add_argument(
+        "--parse-timeout", type=float, default=DEFAULT_PARSE_TIMEOUT, metavar="SECONDS",
+        help="Kill a parse worker stuck on one page for this long"
+    )
+    parser.add_argument("--once", action="store_true", help="Poll due feeds once and exit")
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s %(levelname)s: %(message)s',
+        filename='rss_reader.log'
+    )
+    
+    if args.db:
+        set_database_path(args.db)
+    
+    set_default_engine(args.engine)
+    configure_parse_pool(args.parse_workers, timeout=args.parse_timeout, engine=args.engine)
+    scheduler = FeedScheduler(
+        max_workers=args.max_workers,
+        generate_embeddings=not args.no_embeddings
+    )
+    
+    if args.once:
+        scheduler.run_once()
+        return
+    
+    stop_event = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop_event.set())
+    
+    run_daemon(scheduler, stop_event)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,47 @@
 """Database layer for RSS reader."""
 
-from .connection import get_connection, initialize_database
+from .connection import get_connection, initialize_database, transaction
 from .models import (
     add_feed,
     get_feed,
     get_all_feeds,
     delete_feed,
     add_article,
+    get_existing_links,
     get_article,
     get_articles_by_feed,
     get_all_articles_sorted,
+    get_articles_page,
+    get_feed_counts,
+    mark_article_read,
     like_article,
     unlike_article,
+    is_article_liked,
     get_liked_articles,
+    get_liked_canonical_ids,
+    get_liked_article_list,
 )
 
 __all__ = [
     "get_connection",
     "initialize_database",
+    "transaction",
     "add_feed",
     "get_feed",
     "get_all_feeds",
     "delete_feed",
     "add_article",
+    "get_existing_links",
     "get_article",
     "get_articles_by_feed",
     "get_all_articles_sorted",
+    "get_articles_page",
+    "get_feed_counts",
+    "mark_article_read",
     "like_article",
     "unlike_article",
+    "is_article_liked",
     "get_liked_articles",
+    "get_liked_canonical_ids",
+    "get_liked_article_list",
 ]
@@ -1,8 +1,9 @@
 """SQLite connection management."""
 
 import sqlite3
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 import threading
 
 from .schema import initialize_database
@@ -42,3 +43,48 @@ def close_connection() -> None:
     if hasattr(_thread_local, 'connection') and _thread_local.connection is not None:
         _thread_local.connection.close()
         _thread_local.connection = None
+
+
+@contextmanager
+def transaction(immediate: bool = False) -> Iterator[sqlite3.Connection]:
+    """Group writes on the current thread's connection into one transaction.
+    
+    The outermost transaction() commits when its block exits and rolls
+    back if it raises. Nested calls, including those made by model
+    functions, join the enclosing transaction instead of committing; each
+    runs in a savepoint, so a nested block that raises undoes only its own
+    writes and the caller may handle the error and carry on.
+    
+    Args:
+        immediate: Take the database write lock when the outermost
+            transaction begins rather than at its first write
+    
+    Yields:
+        The thread's database connection
+    """
+    conn = get_connection()
+    depth = getattr(_thread_local, 'transaction_depth', 0)
+    if depth:
+        savepoint = f"rss_reader_{depth}"
+        conn.execute(f"SAVEPOINT {savepoint}")
+    elif not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    
+    _thread_local.transaction_depth = depth + 1
+    try:
+        yield conn
+    except BaseException:
+        if depth:
+            conn.execute(f"ROLLBACK TO {savepoint}")
+            conn.execute(f"RELEASE {savepoint}")
+        else:
+            conn.rollback()
+        raise
+    else:
+        if depth:
+            conn.execute(f"RELEASE {savepoint}")
+        else:
+            conn.commit()
+    finally:
+        _thread_local.transaction_depth = depth
+
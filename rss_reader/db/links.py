@@ -0,0 +1,117 @@
+"""Migration giving articles stored before canonical links one.
+
+Articles are unique by canonical link, the link as normalized by
+rss_reader.urls. Databases from before canonical links store articles
+without one, possibly the same article several times under variants of
+its URL. On upgrade each gets its canonical link, and articles sharing
+one are merged into the copy stored first.
+"""
+
+import json
+import logging
+import sqlite3
+from typing import Callable
+
+from ..urls import canonical_link
+
+
+logger = logging.getLogger(__name__)
+
+
+def _fold_article(conn: sqlite3.Connection, duplicate_id: int, kept_id: int) -> None:
+    """Merge an article stored twice under different links into one row."""
+    # The kept row may itself have been a near duplicate of the one removed
+    conn.execute(
+        """
+        UPDATE articles SET
+            minhash = COALESCE(minhash, (SELECT minhash FROM articles WHERE article_id = ?)),
+            duplicate_of = NULLIF(duplicate_of, ?)
+        WHERE article_id = ?
+        """,
+        (duplicate_id, duplicate_id, kept_id)
+    )
+    # A kept row without text takes over the removed row's body
+    conn.execute(
+        """
+        DELETE FROM article_bodies
+        WHERE article_id = ? AND full_text IS NULL
+            AND EXISTS (SELECT 1 FROM article_bodies WHERE article_id = ? AND full_text IS NOT NULL)
+        """,
+        (kept_id, duplicate_id)
+    )
+    conn.execute(
+        "UPDATE articles SET duplicate_of = ? WHERE duplicate_of = ?",
+        (kept_id, duplicate_id)
+    )
+    tables = ["article_bodies", "user_likes"]
+    # Only canonical articles are embedded and indexed for near-duplicate lookups
+    if conn.execute(
+        "SELECT duplicate_of IS NULL FROM articles WHERE article_id = ?", (kept_id,)
+    ).fetchone()[0]:
+        tables += ["embeddings", "minhash_bands"]
+    for table in tables:
+        conn.execute(
+            f"UPDATE OR IGNORE {table} SET article_id = ? WHERE article_id = ?",
+            (kept_id, duplicate_id)
+        )
+    conn.execute("DELETE FROM articles WHERE article_id = ?", (duplicate_id,))
+
+
+def fold_duplicate_links(
+    conn: sqlite3.Connection,
+    canonicalize: Callable[[str], str] = canonical_link
+) -> int:
+    """Give articles without a canonical link one, folding duplicates.
+    
+    Each article without a canonical link gets canonicalize(link);
+    articles sharing a canonical link are merged into the one stored
+    first, which takes over their likes, body, embedding and near
+    duplicates. Does nothing once every article has a canonical link.
+    
+    Args:
+        conn: SQLite database connection
+        canonicalize: Maps an article link to its canonical form
+    
+    Returns:
+        Number of articles folded into another
+    """
+    if conn.execute("SELECT 1 FROM articles WHERE canonical_link IS NULL LIMIT 1").fetchone() is None:
+        return 0
+    
+    # Take the write lock up front so concurrent connections fold once
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        rows = conn.execute(
+            "SELECT article_id, link FROM articles WHERE canonical_link IS NULL ORDER BY article_id"
+        ).fetchall()
+        links = {article_id: canonicalize(link) for article_id, link in rows}
+        kept = {
+            canonical: article_id
+            for canonical, article_id in conn.execute(
+                """
+                SELECT canonical_link, article_id FROM articles
+                WHERE canonical_link IN (SELECT value FROM json_each(?))
+                """,
+                (json.dumps(list(set(links.values()))),)
+            )
+        }
+        
+        folded = 0
+        for article_id, canonical in links.items():
+            if canonical in kept:
+                _fold_article(conn, article_id, kept[canonical])
+                folded += 1
+            else:
+                kept[canonical] = article_id
+                conn.execute(
+                    "UPDATE articles SET canonical_link = ? WHERE article_id = ?",
+                    (canonical, article_id)
+                )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    
+    if folded:
+        logger.info(f"Folded {folded} articles stored under duplicate links")
+    return folded
@@ -1,10 +1,14 @@
 """Data access models for feeds, articles, and user interactions."""
 
+import base64
+import json
 import sqlite3
 from datetime import datetime
 from typing import Optional
 
-from .connection import get_connection
+from ..urls import canonical_link
+from .bodies import body_column, compress_body, latest_dictionary
+from .connection import get_connection, transaction
 
 
 # Feed operations
@@ -22,15 +26,38 @@ def add_feed(url: str, name: str) -> int:
     Raises:
         sqlite3.IntegrityError: If feed URL already exists
     """
-    conn = get_connection()
-    cursor = conn.execute(
-        "INSERT INTO feeds (url, name) VALUES (?, ?)",
-        (url, name)
-    )
-    conn.commit()
+    with transaction() as conn:
+        cursor = conn.execute(
+            "INSERT INTO feeds (url, name) VALUES (?, ?)",
+            (url, name)
+        )
     return cursor.lastrowid
 
 
+def add_feeds(feeds: list[tuple[str, str]]) -> dict[str, int]:
+    """Add several feeds in a single transaction.
+    
+    Feeds whose URL is already subscribed are skipped.
+    
+    Args:
+        feeds: (url, name) pairs
+    
+    Returns:
+        Mapping of URL to feed_id for the feeds that were added
+    """
+    added = {}
+    with transaction() as conn:
+        for url, name in feeds:
+            row = conn.execute(
+                "INSERT INTO feeds (url, name) VALUES (?, ?) "
+                "ON CONFLICT(url) DO NOTHING RETURNING feed_id",
+                (url, name)
+            ).fetchone()
+            if row is not None:
+                added[url] = row[0]
+    return added
+
+
 def get_feed(feed_id: int) -> Optional[sqlite3.Row]:
     """Get feed by ID.
     
@@ -67,23 +94,329 @@ def update_feed_timestamp(feed_id: int) -> None:
     Args:
         feed_id: Feed ID
     """
+    with transaction() as conn:
+        conn.execute(
+            "UPDATE feeds SET last_updated = CURRENT_TIMESTAMP WHERE feed_id = ?",
+            (feed_id,)
+        )
+
+
+def update_feed_http_cache(
+    feed_id: int,
+    etag: Optional[str],
+    modified: Optional[str],
+    status: Optional[int]
+) -> None:
+    """Store HTTP cache validators from the latest poll of a feed.
+    
+    Args:
+        feed_id: Feed ID
+        etag: ETag header returned by the server
+        modified: Last-Modified header returned by the server
+        status: HTTP status code of the response
+    """
+    with transaction() as conn:
+        conn.execute(
+            """
+            UPDATE feeds SET etag = ?, modified = ?, last_status = ?
+            WHERE feed_id = ?
+            """,
+            (etag, modified, status, feed_id)
+        )
+
+
+def get_feed_high_water_mark(feed_id: int) -> set[str]:
+    """Get the entry keys remembered from a feed's previous poll.
+    
+    Args:
+        feed_id: Feed ID
+        
+    Returns:
+        Set of entry GUIDs/links (empty if the feed was never parsed)
+    """
     conn = get_connection()
-    conn.execute(
-        "UPDATE feeds SET last_updated = CURRENT_TIMESTAMP WHERE feed_id = ?",
+    row = conn.execute(
+        "SELECT high_water_mark FROM feeds WHERE feed_id = ?",
         (feed_id,)
+    ).fetchone()
+    if row is None or row[0] is None:
+        return set()
+    return set(json.loads(row[0]))
+
+
+def update_feed_high_water_mark(feed_id: int, entry_keys: list[str]) -> None:
+    """Remember the newest entry keys of a feed for incremental parsing.
+    
+    Args:
+        feed_id: Feed ID
+        entry_keys: GUIDs/links of the feed's newest entries, newest first
+    """
+    with transaction() as conn:
+        conn.execute(
+            "UPDATE feeds SET high_water_mark = ? WHERE feed_id = ?",
+            (json.dumps(entry_keys), feed_id)
+        )
+
+
+def update_feed_content_hash(feed_id: int, content_hash: str) -> None:
+    """Remember the hash of the last feed body that was fully processed.
+    
+    Args:
+        feed_id: Feed ID
+        content_hash: Hex digest of the raw feed body
+    """
+    with transaction() as conn:
+        conn.execute(
+            "UPDATE feeds SET content_hash = ? WHERE feed_id = ?",
+            (content_hash, feed_id)
+        )
+
+
+def get_due_feeds(now: datetime) -> list[sqlite3.Row]:
+    """Get feeds whose next scheduled poll is due.
+    
+    Feeds that were never scheduled are always due.
+    
+    Args:
+        now: Current UTC time
+        
+    Returns:
+        List of feed rows, most overdue first
+    """
+    conn = get_connection()
+    cursor = conn.execute(
+        """
+        SELECT * FROM feeds
+        WHERE next_poll_at IS NULL OR next_poll_at <= ?
+        ORDER BY next_poll_at IS NOT NULL, next_poll_at
+        """,
+        (now,)
     )
-    conn.commit()
+    return cursor.fetchall()
+
+
+def get_next_poll_time() -> Optional[datetime]:
+    """Get the earliest scheduled poll across all feeds.
+    
+    Returns:
+        Earliest next_poll_at, or None if no feed is scheduled
+    """
+    conn = get_connection()
+    row = conn.execute("SELECT MIN(next_poll_at) FROM feeds").fetchone()
+    if row[0] is None:
+        return None
+    return datetime.fromisoformat(row[0])
+
+
+def update_feed_schedule(feed_id: int, poll_interval: int, next_poll_at: datetime) -> None:
+    """Store a feed's learned polling interval and next poll time.
+    
+    Args:
+        feed_id: Feed ID
+        poll_interval: Polling interval in seconds
+        next_poll_at: UTC time of the next poll
+    """
+    with transaction() as conn:
+        conn.execute(
+            "UPDATE feeds SET poll_interval = ?, next_poll_at = ? WHERE feed_id = ?",
+            (poll_interval, next_poll_at, feed_id)
+        )
+
+
+def record_feed_success(feed_id: int) -> None:
+    """Close a feed's circuit breaker after a successful fetch.
+    
+    Args:
+        feed_id: Feed ID
+    """
+    with transaction() as conn:
+        conn.execute(
+            """
+            UPDATE feeds SET consecutive_failures = 0, last_error = NULL, retry_at = NULL
+            WHERE feed_id = ?
+            """,
+            (feed_id,)
+        )
+
+
+def record_feed_failure(feed_id: int, error: str, retry_at: Optional[datetime]) -> None:
+    """Count a failed fetch and set when the feed may be tried again.
+    
+    Args:
+        feed_id: Feed ID
+        error: Error message of the failed fetch
+        retry_at: UTC time before which the feed is skipped, or None to
+            allow an immediate retry
+    """
+    with transaction() as conn:
+        conn.execute(
+            """
+            UPDATE feeds
+            SET consecutive_failures = consecutive_failures + 1, last_error = ?, retry_at = ?
+            WHERE feed_id = ?
+            """,
+            (error, retry_at, feed_id)
+        )
+
+
+def _promote_duplicates(conn: sqlite3.Connection, feed_id: int) -> None:
+    """Make a near duplicate in another feed canonical for each article of a feed.
+    
+    Near duplicates are stored without text, embedding or MinHash bands
+    and read their canonical article's. Before the feed's articles are
+    deleted, the first surviving duplicate of each takes those over and
+    the other duplicates are linked to it.
+    """
+    promotions = conn.execute(
+        """
+        SELECT a.article_id, MIN(d.article_id)
+        FROM articles a
+        JOIN articles d ON d.duplicate_of = a.article_id
+        WHERE a.feed_id = ? AND d.feed_id != ?
+        GROUP BY a.article_id
+        """,
+        (feed_id, feed_id)
+    ).fetchall()
+    if not promotions:
+        return
+    
+    dictionary_id, dictionary = latest_dictionary(conn)
+    for canonical_id, promoted_id in promotions:
+        conn.execute(
+            "UPDATE articles SET duplicate_of = NULLIF(?, article_id) WHERE duplicate_of = ?",
+            (promoted_id, canonical_id)
+        )
+        # The promoted row keeps its summary and takes the canonical's text,
+        # recompressed since the two may use different dictionaries
+        summary, full_text = conn.execute(
+            f"""
+            SELECT
+                (SELECT {body_column('body', 'summary')} FROM article_bodies body WHERE body.article_id = ?),
+                (SELECT {body_column('body', 'full_text')} FROM article_bodies body WHERE body.article_id = ?)
+            """,
+            (promoted_id, canonical_id)
+        ).fetchone()
+        if full_text is not None:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO article_bodies (article_id, summary, full_text, dictionary_id)
+                VALUES (?, ?, ?, ?)
+                """,
+                (
+                    promoted_id, compress_body(summary, dictionary),
+                    compress_body(full_text, dictionary), dictionary_id
+                )
+            )
+        for table in ("embeddings", "minhash_bands"):
+            conn.execute(
+                f"UPDATE OR IGNORE {table} SET article_id = ? WHERE article_id = ?",
+                (promoted_id, canonical_id)
+            )
 
 
 def delete_feed(feed_id: int) -> None:
     """Delete a feed and all its articles.
     
+    Near duplicates of its articles stored from other feeds are kept,
+    one of each becoming the canonical copy.
+    
+    Args:
+        feed_id: Feed ID
+    """
+    # Promotion reads before it writes; a deferred transaction whose snapshot
+    # went stale would fail at its first write instead of waiting for the lock
+    with transaction(immediate=True) as conn:
+        _promote_duplicates(conn, feed_id)
+        conn.execute("DELETE FROM feeds WHERE feed_id = ?", (feed_id,))
+
+
+# Fetch telemetry operations
+
+def add_feed_fetch_log(
+    feed_id: int,
+    outcome: str,
+    total_seconds: float,
+    http_status: Optional[int] = None,
+    bytes_received: int = 0,
+    entries_seen: int = 0,
+    new_articles: int = 0,
+    download_seconds: float = 0.0,
+    parse_seconds: float = 0.0,
+    extract_seconds: float = 0.0,
+    embed_seconds: float = 0.0,
+    store_seconds: float = 0.0,
+    error: Optional[str] = None
+) -> None:
+    """Record where the time of one feed refresh went.
+    
     Args:
         feed_id: Feed ID
+        outcome: 'new', 'not_modified', 'unchanged' or 'error'
+        total_seconds: Wall time of the whole refresh
+        http_status: HTTP status code of the feed response
+        bytes_received: Size of the feed body
+        entries_seen: Entries parsed from the feed
+        new_articles: New articles stored
+        download_seconds: Time to resolve, connect and download the feed
+        parse_seconds: Time to parse the feed and pick out new entries
+        extract_seconds: Busy time extracting article text
+        embed_seconds: Busy time fingerprinting and embedding articles
+        store_seconds: Busy time writing articles and embeddings
+        error: Error message if the refresh failed
+    """
+    with transaction() as conn:
+        conn.execute(
+            """
+            INSERT INTO feed_fetch_log (
+                feed_id, outcome, http_status, bytes_received, entries_seen, new_articles,
+                total_seconds, download_seconds, parse_seconds, extract_seconds, embed_seconds,
+                store_seconds, error
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                feed_id, outcome, http_status, bytes_received, entries_seen, new_articles,
+                total_seconds, download_seconds, parse_seconds, extract_seconds, embed_seconds,
+                store_seconds, error
+            )
+        )
+
+
+def get_feed_fetch_log(since: datetime) -> list[sqlite3.Row]:
+    """Get the recorded refreshes of all feeds since a point in time.
+    
+    Args:
+        since: UTC time from which refreshes are returned
+        
+    Returns:
+        Log rows with the feed's name as feed_name, oldest first
     """
     conn = get_connection()
-    conn.execute("DELETE FROM feeds WHERE feed_id = ?", (feed_id,))
-    conn.commit()
+    cursor = conn.execute(
+        """
+        SELECT l.*, f.name AS feed_name
+        FROM feed_fetch_log l
+        JOIN feeds f ON f.feed_id = l.feed_id
+        WHERE l.fetched_at >= ?
+        ORDER BY l.fetched_at, l.log_id
+        """,
+        (since,)
+    )
+    return cursor.fetchall()
+
+
+def prune_feed_fetch_log(before: datetime) -> int:
+    """Delete refresh records older than a point in time.
+    
+    Args:
+        before: UTC time before which records are deleted
+        
+    Returns:
+        Number of records deleted
+    """
+    with transaction() as conn:
+        cursor = conn.execute("DELETE FROM feed_fetch_log WHERE fetched_at < ?", (before,))
+    return cursor.rowcount
 
 
 # Article operations
@@ -94,7 +427,11 @@ def add_article(
     link: str,
     summary: Optional[str] = None,
     full_text: Optional[str] = None,
-    published_date: Optional[datetime] = None
+    published_date: Optional[datetime] = None,
+    minhash: Optional[bytes] = None,
+    minhash_bands: Optional[list[int]] = None,
+    duplicate_of: Optional[int] = None,
+    canonical_link: Optional[str] = None
 ) -> Optional[int]:
     """Add a new article.
     
@@ -105,24 +442,219 @@ def add_article(
         summary: Article summary
         full_text: Full article text
         published_date: Publication date
+        minhash: MinHash signature of the article text
+        minhash_bands: Band keys of the signature to index for
+            near-duplicate lookups, stored in the same transaction
+        duplicate_of: article_id of the canonical article this one
+            duplicates
+        canonical_link: Link identifying the article (must be unique
+            once normalized by rss_reader.urls); defaults to the link
+            itself
         
     Returns:
         article_id of created article, or None if duplicate
     """
-    conn = get_connection()
+    row = {
+        'title': title,
+        'link': link,
+        'summary': summary,
+        'full_text': full_text,
+        'published_date': published_date,
+        'minhash': minhash,
+        'minhash_bands': minhash_bands,
+        'duplicate_of': duplicate_of,
+        'canonical_link': canonical_link,
+    }
     try:
-        cursor = conn.execute(
+        return add_articles(feed_id, [row])[0]
+    except sqlite3.IntegrityError:
+        # Constraint other than link uniqueness (e.g. unknown feed)
+        return None
+
+
+def add_articles(feed_id: int, rows: list[dict]) -> list[Optional[int]]:
+    """Add several articles of a feed in a single transaction.
+    
+    Canonical links are normalized with the configured link normalizer.
+    Articles whose link or canonical link is already stored (or repeated
+    earlier in rows) are skipped without raising.
+    
+    Args:
+        feed_id: Feed ID
+        rows: Article dictionaries with the keys title and link, and
+            optionally the other arguments of add_article plus embedding
+            (serialized bytes, stored in the same transaction)
+        
+    Returns:
+        article_id for each row, or None where the row was skipped
+        
+    Raises:
+        sqlite3.IntegrityError: If a row violates another constraint; no
+            row of the batch is stored then
+    """
+    # Compress before taking the write lock
+    dictionary_id, dictionary = latest_dictionary(get_connection())
+    bodies = [
+        (compress_body(row.get('summary'), dictionary), compress_body(row.get('full_text'), dictionary))
+        for row in rows
+    ]
+    
+    article_ids = []
+    with transaction() as conn:
+        for row in rows:
+            inserted = conn.execute(
+                """
+                INSERT INTO articles (
+                    feed_id, title, link, published_date, minhash, duplicate_of, canonical_link
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT DO NOTHING
+                RETURNING article_id
+                """,
+                (
+                    feed_id, row['title'], row['link'], row.get('published_date'),
+                    row.get('minhash'), row.get('duplicate_of'),
+                    canonical_link(row.get('canonical_link') or row['link'])
+                )
+            ).fetchone()
+            article_ids.append(inserted[0] if inserted else None)
+        
+        conn.executemany(
             """
-            INSERT INTO articles (feed_id, title, link, summary, full_text, published_date)
-            VALUES (?, ?, ?, ?, ?, ?)
+            INSERT INTO article_bodies (article_id, summary, full_text, dictionary_id)
+            VALUES (?, ?, ?, ?)
             """,
-            (feed_id, title, link, summary, full_text, published_date)
+            [
+                (article_id, summary, full_text, dictionary_id)
+                for article_id, (summary, full_text) in zip(article_ids, bodies)
+                if article_id and (summary is not None or full_text is not None)
+            ]
         )
-        conn.commit()
-        return cursor.lastrowid
-    except sqlite3.IntegrityError:
-        # Duplicate article (link already exists)
-        return None
+        stored = [(article_id, row) for article_id, row in zip(article_ids, rows) if article_id]
+        conn.executemany(
+            "INSERT INTO minhash_bands (band, key, article_id) VALUES (?, ?, ?)",
+            [
+                (band, key, article_id)
+                for article_id, row in stored
+                for band, key in enumerate(row.get('minhash_bands') or ())
+            ]
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (article_id, embedding) VALUES (?, ?)",
+            [(article_id, row['embedding']) for article_id, row in stored if row.get('embedding')]
+        )
+    return article_ids
+
+
+def get_minhash_candidates(minhash_bands: list[int]) -> list[tuple[int, bytes]]:
+    """Get indexed articles sharing at least one MinHash band.
+    
+    Args:
+        minhash_bands: Band keys of a signature, as passed to add_article
+        
+    Returns:
+        (article_id, minhash) pairs of the matching articles
+    """
+    conn = get_connection()
+    cursor = conn.execute(
+        """
+        SELECT DISTINCT a.article_id, a.minhash
+        FROM json_each(?) j
+        JOIN minhash_bands b ON b.band = j.key AND b.key = j.value
+        JOIN articles a ON a.article_id = b.article_id
+        """,
+        (json.dumps(minhash_bands),)
+    )
+    return cursor.fetchall()
+
+
+def get_existing_links(links: list[str]) -> set[str]:
+    """Find which article links are already stored.
+    
+    Args:
+        links: Article URLs to check
+        
+    Returns:
+        Subset of links that already exist in the articles table
+    """
+    if not links:
+        return set()
+    
+    conn = get_connection()
+    cursor = conn.execute(
+        "SELECT link FROM articles WHERE link IN (SELECT value FROM json_each(?))",
+        (json.dumps(links),)
+    )
+    return {row[0] for row in cursor}
+
+
+def get_existing_canonical_links(canonical_links: list[str]) -> set[str]:
+    """Find which canonical article links are already stored.
+    
+    Args:
+        canonical_links: Normalized article URLs to check
+        
+    Returns:
+        Subset of canonical_links that already exist in the articles table
+    """
+    if not canonical_links:
+        return set()
+    
+    conn = get_connection()
+    cursor = conn.execute(
+        """
+        SELECT canonical_link FROM articles
+        WHERE canonical_link IN (SELECT value FROM json_each(?))
+        """,
+        (json.dumps(canonical_links),)
+    )
+    return {row[0] for row in cursor}
+
+
+def get_recent_publish_dates(feed_id: int, limit: int = 20) -> list[datetime]:
+    """Get publication dates of a feed's most recent articles.
+    
+    Args:
+        feed_id: Feed ID
+        limit: Maximum number of dates to return
+        
+    Returns:
+        Publication dates, newest first
+    """
+    conn = get_connection()
+    cursor = conn.execute(
+        """
+        SELECT published_date FROM articles
+        WHERE feed_id = ? AND published_date IS NOT NULL
+        ORDER BY published_date DESC
+        LIMIT ?
+        """,
+        (feed_id, limit)
+    )
+    return [datetime.fromisoformat(row[0]) for row in cursor]
+
+
+# Near duplicates are stored without text and read their canonical article's
+_ARTICLES_WITH_CANONICAL = """
+    articles a
+    LEFT JOIN article_bodies body ON body.article_id = a.article_id
+    LEFT JOIN article_bodies canonical ON canonical.article_id = a.duplicate_of
+"""
+
+# Columns of list views: no link, summary or text, so listing costs the
+# same however long the articles are
+_LIST_COLUMNS = """
+    a.article_id, a.feed_id, a.title, a.published_date, f.name AS feed_name,
+    EXISTS (
+        SELECT 1 FROM user_likes ul WHERE ul.article_id = a.article_id AND ul.user_id = ?
+    ) AS liked
+"""
+
+_ARTICLE_COLUMNS = f"""
+    a.article_id, a.feed_id, a.title, a.link, {body_column('body', 'summary')} AS summary,
+    COALESCE({body_column('body', 'full_text')}, {body_column('canonical', 'full_text')}) AS full_text,
+    a.published_date, a.fetched_at, a.duplicate_of
+"""
 
 
 def get_article(article_id: int) -> Optional[sqlite3.Row]:
@@ -136,7 +668,7 @@ def get_article(article_id: int) -> Optional[sqlite3.Row]:
     """
     conn = get_connection()
     cursor = conn.execute(
-        "SELECT * FROM articles WHERE article_id = ?",
+        f"SELECT {_ARTICLE_COLUMNS} FROM {_ARTICLES_WITH_CANONICAL} WHERE a.article_id = ?",
         (article_id,)
     )
     return cursor.fetchone()
@@ -154,10 +686,10 @@ def get_articles_by_feed(feed_id: int, limit: int = 100) -> list[sqlite3.Row]:
     """
     conn = get_connection()
     cursor = conn.execute(
-        """
-        SELECT * FROM articles 
-        WHERE feed_id = ? 
-        ORDER BY published_date DESC 
+        f"""
+        SELECT {_ARTICLE_COLUMNS} FROM {_ARTICLES_WITH_CANONICAL}
+        WHERE a.feed_id = ?
+        ORDER BY a.published_date DESC
         LIMIT ?
         """,
         (feed_id, limit)
@@ -175,27 +707,282 @@ def get_all_articles_sorted(limit: Optional[int] = None) -> list[sqlite3.Row]:
         List of article rows with feed_name included
     """
     conn = get_connection()
-    query = """
-        SELECT 
-            a.article_id,
-            a.feed_id,
-            a.title,
-            a.link,
-            a.summary,
-            a.full_text,
-            a.published_date,
-            a.fetched_at,
-            f.name as feed_name
-        FROM articles a
+    cursor = conn.execute(
+        f"""
+        SELECT {_ARTICLE_COLUMNS}, f.name AS feed_name
+        FROM {_ARTICLES_WITH_CANONICAL}
         JOIN feeds f ON a.feed_id = f.feed_id
         ORDER BY a.published_date DESC, f.name ASC, a.title ASC
+        LIMIT ?
+        """,
+        (limit or -1,)
+    )
+    return cursor.fetchall()
+
+
+def _encode_cursor(row: sqlite3.Row) -> str:
+    """Make the next-page token pointing just past a row."""
+    key = json.dumps([row['published_date'], row['article_id']])
+    return base64.urlsafe_b64encode(key.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[Optional[str], int]:
+    """Read the (published_date, article_id) key of a next-page token."""
+    try:
+        published_date, article_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid page cursor: {cursor!r}") from e
+    if not isinstance(article_id, int) or not isinstance(published_date, (str, type(None))):
+        raise ValueError(f"Invalid page cursor: {cursor!r}")
+    return published_date, article_id
+
+
+def get_articles_page(
+    feed_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    page_size: int = 50,
+    user_id: int = 1,
+    until: Optional[str] = None
+) -> tuple[list[sqlite3.Row], Optional[str]]:
+    """Get one page of an article list, newest first.
+    
+    Articles are ordered by (published_date, article_id) descending, with
+    undated articles last. Each page continues from the key of the
+    previous page's last row rather than skipping an offset, so through
+    the composite published_date/article_id indexes every page costs the
+    same however deep it is, and articles stored meanwhile do not shift
+    later pages.
+    
+    Rows carry only what a list shows; get_article loads the rest of an
+    article once it is opened. Passing the token of the last page loaded
+    as until reloads everything up to it in one query, as a list being
+    refreshed needs; the token stays valid for the pages after it.
+    
+    Args:
+        feed_id: Only list this feed's articles (default: all feeds)
+        cursor: Token returned for the previous page, or None for the
+            first page
+        page_size: Maximum number of articles per page
+        user_id: User whose likes set the liked flag (defaults to 1)
+        until: Token returned for a page; if given, every article from
+            the start up to that page's end is returned instead of one
+            page, with until as the token for the next page
+        
+    Returns:
+        Tuple of (rows of article_id, feed_id, title, published_date,
+        feed_name and liked, token for the next page or None if this is
+        the last page)
+        
+    Raises:
+        ValueError: If cursor is not a token returned by this function
     """
+    conn = get_connection()
+    select = f"""
+        SELECT {_LIST_COLUMNS}
+        FROM articles a
+        JOIN feeds f ON a.feed_id = f.feed_id
+        WHERE {{where}}
+        ORDER BY a.published_date DESC, a.article_id DESC
+        LIMIT ?
+    """
+    feed_filter = "a.feed_id = ? AND " if feed_id is not None else ""
+    feed_params = (feed_id,) if feed_id is not None else ()
     
-    if limit:
-        query += f" LIMIT {limit}"
+    def fetch(where: str, *params) -> list[sqlite3.Row]:
+        return conn.execute(
+            select.format(where=feed_filter + where), (user_id, *feed_params, *params)
+        ).fetchall()
     
-    cursor = conn.execute(query)
-    return cursor.fetchall()
+    if until is not None:
+        published_date, article_id = _decode_cursor(until)
+        # LIMIT -1 is no limit
+        if published_date is not None:
+            rows = fetch("(a.published_date, a.article_id) >= (?, ?)", published_date, article_id, -1)
+        else:
+            rows = fetch("a.published_date IS NOT NULL", -1)
+            rows += fetch("a.published_date IS NULL AND a.article_id >= ?", article_id, -1)
+        return rows, until
+    
+    # Fetch one row more than asked for to learn whether another page follows
+    limit = page_size + 1
+    if cursor is None:
+        rows = fetch("1", limit)
+    else:
+        published_date, article_id = _decode_cursor(cursor)
+        if published_date is not None:
+            rows = fetch("(a.published_date, a.article_id) < (?, ?)", published_date, article_id, limit)
+            # Row values never match NULL, so undated articles are a range of their own
+            if len(rows) < limit:
+                rows += fetch("a.published_date IS NULL", limit - len(rows))
+        else:
+            rows = fetch("a.published_date IS NULL AND a.article_id < ?", article_id, limit)
+    
+    if len(rows) > page_size:
+        return rows[:page_size], _encode_cursor(rows[page_size - 1])
+    return rows, None
+
+
+def get_feed_counts(user_id: int = 1) -> dict[int, dict[str, int]]:
+    """Count the articles of every feed in one query.
+    
+    Args:
+        user_id: User whose likes are counted (defaults to 1)
+        
+    Returns:
+        Dictionary mapping each feed_id to its total, unread and liked
+        article counts
+    """
+    conn = get_connection()
+    cursor = conn.execute(
+        """
+        SELECT
+            f.feed_id,
+            COUNT(a.article_id) AS total,
+            COUNT(a.article_id) - COUNT(a.read_at) AS unread,
+            COUNT(ul.article_id) AS liked
+        FROM feeds f
+        LEFT JOIN articles a ON a.feed_id = f.feed_id
+        LEFT JOIN user_likes ul ON ul.article_id = a.article_id AND ul.user_id = ?
+        GROUP BY f.feed_id
+        """,
+        (user_id,)
+    )
+    return {
+        row['feed_id']: {'total': row['total'], 'unread': row['unread'], 'liked': row['liked']}
+        for row in cursor
+    }
+
+
+def get_database_stats() -> dict:
+    """Get row counts for the main tables and storage sizes.
+    
+    Returns:
+        Dictionary with feeds, articles, articles_with_text, duplicates,
+        embeddings and likes counts, body_bytes (compressed summaries and
+        texts) and database_bytes (size of the database file)
+    """
+    conn = get_connection()
+    row = conn.execute(
+        """
+        SELECT
+            (SELECT COUNT(*) FROM feeds),
+            (SELECT COUNT(*) FROM articles),
+            (SELECT COUNT(*) FROM article_bodies WHERE full_text IS NOT NULL),
+            (SELECT COUNT(*) FROM articles WHERE duplicate_of IS NOT NULL),
+            (SELECT COUNT(*) FROM embeddings),
+            (SELECT COUNT(*) FROM user_likes),
+            (SELECT COALESCE(SUM(LENGTH(summary)), 0) + COALESCE(SUM(LENGTH(full_text)), 0)
+                FROM article_bodies),
+            (SELECT page_count * page_size FROM pragma_page_count, pragma_page_size)
+        """
+    ).fetchone()
+    return {
+        'feeds': row[0],
+        'articles': row[1],
+        'articles_with_text': row[2],
+        'duplicates': row[3],
+        'embeddings': row[4],
+        'likes': row[5],
+        'body_bytes': row[6],
+        'database_bytes': row[7],
+    }
+
+
+# Article body maintenance
+
+def get_body_samples(limit: int = 1000) -> list[str]:
+    """Get the summaries and texts of the most recently stored articles.
+    
+    Args:
+        limit: Maximum number of articles to sample
+        
+    Returns:
+        Non-empty summaries and texts, for training a compression dictionary
+    """
+    conn = get_connection()
+    cursor = conn.execute(
+        f"""
+        SELECT {body_column('body', 'summary')}, {body_column('body', 'full_text')}
+        FROM article_bodies body
+        ORDER BY body.article_id DESC
+        LIMIT ?
+        """,
+        (limit,)
+    )
+    return [text for row in cursor for text in row if text]
+
+
+def add_compression_dictionary(content: bytes) -> int:
+    """Store a compression dictionary, which new bodies are compressed against.
+    
+    Args:
+        content: Dictionary from bodies.train_dictionary
+        
+    Returns:
+        dictionary_id of the stored dictionary
+    """
+    with transaction() as conn:
+        cursor = conn.execute(
+            "INSERT INTO compression_dictionaries (content) VALUES (?)",
+            (content,)
+        )
+    return cursor.lastrowid
+
+
+def recompress_article_bodies(batch_size: int = 500) -> int:
+    """Recompress bodies not compressed against the latest dictionary.
+    
+    Bodies are read and compressed a batch at a time outside any
+    transaction; each batch is then written in one short transaction.
+    
+    Args:
+        batch_size: Bodies recompressed per transaction
+        
+    Returns:
+        Number of bodies recompressed
+    """
+    conn = get_connection()
+    dictionary_id, dictionary = latest_dictionary(conn)
+    recompressed = 0
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            f"""
+            SELECT body.article_id, body.dictionary_id,
+                {body_column('body', 'summary')}, {body_column('body', 'full_text')}
+            FROM article_bodies body
+            WHERE body.article_id > ? AND body.dictionary_id IS NOT ?
+            ORDER BY body.article_id
+            LIMIT ?
+            """,
+            (last_id, dictionary_id, batch_size)
+        ).fetchall()
+        if not rows:
+            return recompressed
+        
+        updates = [
+            (
+                compress_body(summary, dictionary), compress_body(full_text, dictionary),
+                dictionary_id, article_id, old_dictionary_id
+            )
+            for article_id, old_dictionary_id, summary, full_text in rows
+        ]
+        with transaction():
+            # Skip bodies changed since they were read
+            conn.executemany(
+                """
+                UPDATE article_bodies SET summary = ?, full_text = ?, dictionary_id = ?
+                WHERE article_id = ? AND dictionary_id IS ?
+                """,
+                updates
+            )
+        recompressed += len(rows)
+        last_id = rows[-1][0]
+
+
+def vacuum_database() -> None:
+    """Rebuild the database file, returning free pages to the filesystem."""
+    get_connection().execute("VACUUM")
 
 
 # User interaction operations
@@ -207,13 +994,12 @@ def like_article(article_id: int, user_id: int = 1) -> None:
         article_id: Article ID
         user_id: User ID (defaults to 1)
     """
-    conn = get_connection()
     try:
-        conn.execute(
-            "INSERT INTO user_likes (article_id, user_id) VALUES (?, ?)",
-            (article_id, user_id)
-        )
-        conn.commit()
+        with transaction() as conn:
+            conn.execute(
+                "INSERT INTO user_likes (article_id, user_id) VALUES (?, ?)",
+                (article_id, user_id)
+            )
     except sqlite3.IntegrityError:
         # Already liked
         pass
@@ -226,12 +1012,97 @@ def unlike_article(article_id: int, user_id: int = 1) -> None:
         article_id: Article ID
         user_id: User ID (defaults to 1)
     """
+    with transaction() as conn:
+        conn.execute(
+            "DELETE FROM user_likes WHERE article_id = ? AND user_id = ?",
+            (article_id, user_id)
+        )
+
+
+def mark_article_read(article_id: int) -> None:
+    """Mark an article as read, keeping the time it was first read.
+    
+    Args:
+        article_id: Article ID
+    """
+    with transaction() as conn:
+        conn.execute(
+            "UPDATE articles SET read_at = CURRENT_TIMESTAMP WHERE article_id = ? AND read_at IS NULL",
+            (article_id,)
+        )
+
+
+def is_article_liked(article_id: int, user_id: int = 1) -> bool:
+    """Check whether a user likes an article.
+    
+    Args:
+        article_id: Article ID
+        user_id: User ID (defaults to 1)
+        
+    Returns:
+        True if the article is liked
+    """
     conn = get_connection()
-    conn.execute(
-        "DELETE FROM user_likes WHERE article_id = ? AND user_id = ?",
+    cursor = conn.execute(
+        "SELECT 1 FROM user_likes WHERE article_id = ? AND user_id = ?",
         (article_id, user_id)
     )
-    conn.commit()
+    return cursor.fetchone() is not None
+
+
+def get_liked_canonical_ids(user_id: int = 1, limit: int = 100) -> list[int]:
+    """Get the canonical articles of the articles liked by user.
+    
+    Near duplicates are stored without an embedding; a liked near
+    duplicate counts as a like of its canonical article.
+    
+    Args:
+        user_id: User ID (defaults to 1)
+        limit: Maximum number of article IDs to return
+        
+    Returns:
+        Canonical article IDs, most recently liked first
+    """
+    conn = get_connection()
+    cursor = conn.execute(
+        """
+        SELECT COALESCE(a.duplicate_of, a.article_id) AS canonical_id
+        FROM user_likes ul
+        INNER JOIN articles a ON a.article_id = ul.article_id
+        WHERE ul.user_id = ?
+        GROUP BY canonical_id
+        ORDER BY MAX(ul.liked_at) DESC
+        LIMIT ?
+        """,
+        (user_id, limit)
+    )
+    return [row[0] for row in cursor]
+
+
+def get_liked_article_list(user_id: int = 1, limit: int = 100) -> list[sqlite3.Row]:
+    """Get the list view of articles liked by a user, most recently liked first.
+    
+    Args:
+        user_id: User ID (defaults to 1)
+        limit: Maximum number of articles to return
+        
+    Returns:
+        Rows with the columns of get_articles_page plus liked_date
+    """
+    conn = get_connection()
+    cursor = conn.execute(
+        f"""
+        SELECT {_LIST_COLUMNS}, likes.liked_at AS liked_date
+        FROM user_likes likes
+        JOIN articles a ON a.article_id = likes.article_id
+        JOIN feeds f ON a.feed_id = f.feed_id
+        WHERE likes.user_id = ?
+        ORDER BY likes.liked_at DESC
+        LIMIT ?
+        """,
+        (user_id, user_id, limit)
+    )
+    return cursor.fetchall()
 
 
 def get_liked_articles(user_id: int = 1, limit: int = 100) -> list[sqlite3.Row]:
@@ -246,9 +1117,9 @@ def get_liked_articles(user_id: int = 1, limit: int = 100) -> list[sqlite3.Row]:
     """
     conn = get_connection()
     cursor = conn.execute(
-        """
-        SELECT a.*, f.name as feed_name, ul.liked_at as liked_date
-        FROM articles a
+        f"""
+        SELECT {_ARTICLE_COLUMNS}, f.name as feed_name, ul.liked_at as liked_date
+        FROM {_ARTICLES_WITH_CANONICAL}
         INNER JOIN user_likes ul ON a.article_id = ul.article_id
         INNER JOIN feeds f ON a.feed_id = f.feed_id
         WHERE ul.user_id = ?
@@ -3,8 +3,11 @@
 import sqlite3
 from pathlib import Path
 
+from .bodies import migrate_inline_bodies, register_functions
+from .links import fold_duplicate_links
 
-SCHEMA_VERSION = 1
+
+SCHEMA_VERSION = 14
 
 SCHEMA_SQL = """
 -- Feeds table
@@ -13,7 +16,17 @@ CREATE TABLE IF NOT EXISTS feeds (
     url TEXT NOT NULL UNIQUE,
     name TEXT NOT NULL,
     last_updated TIMESTAMP,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    etag TEXT,
+    modified TEXT,
+    last_status INTEGER,
+    poll_interval INTEGER,
+    next_poll_at TIMESTAMP,
+    high_water_mark TEXT,
+    consecutive_failures INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    retry_at TIMESTAMP,
+    content_hash TEXT
 );
 
 -- Articles table
@@ -22,13 +35,33 @@ CREATE TABLE IF NOT EXISTS articles (
     feed_id INTEGER NOT NULL,
     title TEXT NOT NULL,
     link TEXT NOT NULL UNIQUE,
-    summary TEXT,
-    full_text TEXT,
     published_date TIMESTAMP,
     fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    minhash BLOB,
+    duplicate_of INTEGER REFERENCES articles(article_id) ON DELETE SET NULL,
+    canonical_link TEXT,
+    read_at TIMESTAMP,
     FOREIGN KEY (feed_id) REFERENCES feeds(feed_id) ON DELETE CASCADE
 );
 
+-- Article summaries and text, compressed (see bodies.py); kept out of the
+-- articles table so listing and sorting queries scan small rows
+CREATE TABLE IF NOT EXISTS article_bodies (
+    article_id INTEGER PRIMARY KEY,
+    summary BLOB,
+    full_text BLOB,
+    dictionary_id INTEGER REFERENCES compression_dictionaries(dictionary_id),
+    FOREIGN KEY (article_id) REFERENCES articles(article_id) ON DELETE CASCADE
+);
+
+-- Preset dictionaries bodies are compressed against; the latest is used
+-- for new bodies
+CREATE TABLE IF NOT EXISTS compression_dictionaries (
+    dictionary_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    content BLOB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- User likes table
 CREATE TABLE IF NOT EXISTS user_likes (
     article_id INTEGER NOT NULL,
@@ -46,20 +79,130 @@ CREATE TABLE IF NOT EXISTS embeddings (
     FOREIGN KEY (article_id) REFERENCES articles(article_id) ON DELETE CASCADE
 );
 
+-- MinHash band keys of canonical articles, for near-duplicate lookup
+CREATE TABLE IF NOT EXISTS minhash_bands (
+    band INTEGER NOT NULL,
+    key INTEGER NOT NULL,
+    article_id INTEGER NOT NULL,
+    PRIMARY KEY (band, key, article_id),
+    FOREIGN KEY (article_id) REFERENCES articles(article_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+-- One row per feed per refresh: where the time and bytes went
+CREATE TABLE IF NOT EXISTS feed_fetch_log (
+    log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    feed_id INTEGER NOT NULL,
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    outcome TEXT NOT NULL,
+    http_status INTEGER,
+    bytes_received INTEGER NOT NULL DEFAULT 0,
+    entries_seen INTEGER NOT NULL DEFAULT 0,
+    new_articles INTEGER NOT NULL DEFAULT 0,
+    total_seconds REAL NOT NULL,
+    download_seconds REAL NOT NULL DEFAULT 0,
+    parse_seconds REAL NOT NULL DEFAULT 0,
+    extract_seconds REAL NOT NULL DEFAULT 0,
+    embed_seconds REAL NOT NULL DEFAULT 0,
+    store_seconds REAL NOT NULL DEFAULT 0,
+    error TEXT,
+    FOREIGN KEY (feed_id) REFERENCES feeds(feed_id) ON DELETE CASCADE
+);
+
+-- Extracted article text keyed by normalized URL
+-- (content last so size scans do not read overflow pages)
+CREATE TABLE IF NOT EXISTS extraction_cache (
+    url_key TEXT PRIMARY KEY,
+    extractor TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    -- Compressed like article bodies
+    content BLOB NOT NULL
+);
+
 -- Indexes for common queries
-CREATE INDEX IF NOT EXISTS idx_articles_feed_id ON articles(feed_id);
-CREATE INDEX IF NOT EXISTS idx_articles_published_date ON articles(published_date DESC);
+-- Keyset pagination walks these in (published_date, article_id) order
+CREATE INDEX IF NOT EXISTS idx_articles_feed_page ON articles(feed_id, published_date DESC, article_id DESC);
+CREATE INDEX IF NOT EXISTS idx_articles_page ON articles(published_date DESC, article_id DESC);
 CREATE INDEX IF NOT EXISTS idx_user_likes_article_id ON user_likes(article_id);
+CREATE INDEX IF NOT EXISTS idx_extraction_cache_last_access ON extraction_cache(last_access);
+CREATE INDEX IF NOT EXISTS idx_minhash_bands_article_id ON minhash_bands(article_id);
+CREATE INDEX IF NOT EXISTS idx_feed_fetch_log_fetched_at ON feed_fetch_log(fetched_at);
+CREATE INDEX IF NOT EXISTS idx_feed_fetch_log_feed_id ON feed_fetch_log(feed_id);
 """
 
+# Columns added after a table was first released. Databases created by an
+# older version are upgraded in place by adding whichever are missing.
+ADDED_COLUMNS = {
+    "feeds": [
+        ("etag", "TEXT"),
+        ("modified", "TEXT"),
+        ("last_status", "INTEGER"),
+        ("poll_interval", "INTEGER"),
+        ("next_poll_at", "TIMESTAMP"),
+        ("high_water_mark", "TEXT"),
+        ("consecutive_failures", "INTEGER NOT NULL DEFAULT 0"),
+        ("last_error", "TEXT"),
+        ("retry_at", "TIMESTAMP"),
+        ("content_hash", "TEXT"),
+    ],
+    "articles": [
+        ("minhash", "BLOB"),
+        ("duplicate_of", "INTEGER REFERENCES articles(article_id) ON DELETE SET NULL"),
+        ("canonical_link", "TEXT"),
+        ("read_at", "TIMESTAMP"),
+    ],
+}
+
+# Indexes on added columns, created once add_missing_columns has run, and
+# indexes superseded by later ones
+ADDED_INDEXES_SQL = """
+DROP INDEX IF EXISTS idx_articles_feed_id;
+DROP INDEX IF EXISTS idx_articles_published_date;
+CREATE INDEX IF NOT EXISTS idx_articles_duplicate_of ON articles(duplicate_of);
+-- NULL until an article from before canonical links is folded in
+CREATE UNIQUE INDEX IF NOT EXISTS idx_articles_canonical_link ON articles(canonical_link);
+-- Covers the per-feed counts, which otherwise read every article row
+CREATE INDEX IF NOT EXISTS idx_articles_feed_read ON articles(feed_id, read_at);
+"""
+
+
+def add_missing_columns(conn: sqlite3.Connection) -> None:
+    """Add columns introduced after the initial schema to existing tables.
+    
+    Args:
+        conn: SQLite database connection
+    """
+    for table, columns in ADDED_COLUMNS.items():
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for name, definition in columns:
+            if name not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
 
 def create_schema(conn: sqlite3.Connection) -> None:
-    """Create database schema.
+    """Create database schema, or upgrade it if it predates SCHEMA_VERSION.
+    
+    The version is stored in user_version, so a current database is left
+    alone; new databases and databases from before versioning report 0
+    and get every (idempotent) step.
     
     Args:
         conn: SQLite database connection
     """
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version >= SCHEMA_VERSION:
+        return
+    
     conn.executescript(SCHEMA_SQL)
+    add_missing_columns(conn)
+    conn.executescript(ADDED_INDEXES_SQL)
+    migrate_inline_bodies(conn)
+    # After the bodies move, so folded articles hand over their text
+    fold_duplicate_links(conn)
+    # Cached extractions from before compression are dropped, not converted
+    conn.execute("DELETE FROM extraction_cache WHERE typeof(content) = 'text'")
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     conn.commit()
 
 
@@ -73,6 +216,7 @@ def initialize_database(db_path: str | Path = "rss_reader.db") -> sqlite3.Connec
         Database connection
     """
     conn = sqlite3.connect(db_path)
+    register_functions(conn)
     conn.execute("PRAGMA foreign_keys = ON")
     conn.execute("PRAGMA journal_mode = WAL")
     
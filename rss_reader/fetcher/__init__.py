@@ -1,13 +1,20 @@
 """RSS fetching and article extraction."""
 
 from .feed_parser import fetch_feed, parse_feed, FeedFetchError
-from .article_extractor import extract_article_text
-from .pipeline import fetch_and_store_feed
+from .article_extractor import extract_article_text, extract_articles, TavilyBatchExtractor
+from .pipeline import fetch_and_store_feed, ingest_feed, IngestResult
+from .refresh import fetch_all_feeds, RefreshSummary
 
 __all__ = [
     "fetch_feed",
     "parse_feed",
     "FeedFetchError",
     "extract_article_text",
+    "extract_articles",
+    "TavilyBatchExtractor",
     "fetch_and_store_feed",
+    "ingest_feed",
+    "IngestResult",
+    "fetch_all_feeds",
+    "RefreshSummary",
 ]
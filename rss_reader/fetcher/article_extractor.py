@@ -1,39 +1,53 @@
 """Article full-text extraction from web pages."""
 
 import logging
-import os
-from typing import Optional
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from typing import Iterable, Optional
 
-from newspaper import Article
+from .backends import get_backend, registry
+from .extraction_cache import ExtractionCache, get_extraction_cache
+from .http_pool import fetch_html
+from .parse_pool import ParsePool, get_parse_pool
 
 
 logger = logging.getLogger(__name__)
 
-# Tavily client (initialized lazily if API key available)
-tavily_client = None
+# Number of URLs sent to Tavily in a single extract call
+DEFAULT_TAVILY_BATCH_SIZE = 10
 
+# Seconds a URL waits for its batch to fill before the batch is sent anyway
+DEFAULT_TAVILY_MAX_WAIT = 0.5
 
-def _initialize_tavily():
-    """Initialize Tavily client if API key is available."""
-    global tavily_client
-    
-    api_key = os.getenv("TAVILY_API_KEY")
-    if not api_key:
-        logger.info("TAVILY_API_KEY not set, using newspaper3k only for article extraction")
-        return
+_batcher: Optional["TavilyBatchExtractor"] = None
+_batcher_lock = threading.Lock()
+
+
+def get_tavily_client():
+    """Get the Tavily client, creating it on first use.
     
-    try:
-        from tavily import TavilyClient
-        tavily_client = TavilyClient(api_key=api_key)
-        logger.info("Tavily client initialized successfully for article extraction")
-    except ImportError:
-        logger.warning("tavily-python not installed. Install with: pip install -e '.[tavily]'")
-    except Exception as e:
-        logger.error(f"Failed to initialize Tavily client: {e}")
+    Returns:
+        TavilyClient instance, or None if Tavily is unavailable
+    """
+    return get_backend("tavily")
 
 
-# Initialize on module load
-_initialize_tavily()
+def get_tavily_batcher() -> Optional["TavilyBatchExtractor"]:
+    """Get the process-wide Tavily batcher, creating it on first use.
+    
+    Returns:
+        Shared TavilyBatchExtractor, or None if Tavily is unavailable
+    """
+    global _batcher
+    
+    client = get_tavily_client()
+    if not client:
+        return None
+    with _batcher_lock:
+        if _batcher is None or _batcher.client is not client:
+            _batcher = TavilyBatchExtractor(client)
+        return _batcher
 
 
 def extract_with_tavily(url: str) -> Optional[str]:
@@ -45,13 +59,14 @@ def extract_with_tavily(url: str) -> Optional[str]:
     Returns:
         Extracted article text or None if failed
     """
-    if not tavily_client:
+    client = get_tavily_client()
+    if not client:
         return None
     
     try:
         logger.debug(f"Attempting Tavily extraction: {url}")
-        # Tavily Extract accepts multiple URLs, but we'll use one at a time for now
-        response = tavily_client.extract(urls=[url])
+        # Single-URL request; use extract_articles to batch several URLs
+        response = client.extract(urls=[url])
         
         if not response or "results" not in response:
             logger.warning(f"Tavily returned empty response for {url}")
@@ -77,33 +92,260 @@ def extract_with_tavily(url: str) -> Optional[str]:
         return None
 
 
-def extract_article_text(url: str) -> Optional[str]:
-    """Extract full article text from web page.
+class TavilyBatchExtractor:
+    """Collects URLs from concurrent callers into shared Tavily requests.
+    
+    Every feed pipeline of a refresh submits its URLs to the same
+    extractor, so feeds with only a few new articles still fill requests.
+    A batch is sent by the thread that submits its batch_size-th URL, or
+    by a timer once its first URL has waited max_wait seconds, so a lone
+    caller is not held up for long. Callers block in extract() until all
+    their URLs are answered.
+    """
+    
+    def __init__(
+        self,
+        client,
+        batch_size: int = DEFAULT_TAVILY_BATCH_SIZE,
+        max_wait: float = DEFAULT_TAVILY_MAX_WAIT
+    ):
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+        self.client = client
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self._pending: list[tuple[str, Future]] = []
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self.requests_sent = 0
+    
+    def submit(self, url: str) -> Future:
+        """Add a URL to the next batch.
+        
+        Args:
+            url: Article URL
+        
+        Returns:
+            Future resolving to the extracted text, or None if Tavily
+            could not extract it
+        """
+        future: Future = Future()
+        with self._lock:
+            self._pending.append((url, future))
+            if len(self._pending) >= self.batch_size:
+                batch = self._take_batch()
+            else:
+                batch = []
+                if self._timer is None:
+                    self._timer = threading.Timer(self.max_wait, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+        self._send_batch(batch)
+        return future
+    
+    def flush(self) -> None:
+        """Send every waiting URL now."""
+        with self._lock:
+            batches = []
+            while self._pending:
+                batches.append(self._take_batch())
+        for batch in batches:
+            self._send_batch(batch)
+    
+    def extract(self, urls: Iterable[str]) -> dict[str, Optional[str]]:
+        """Extract several URLs, sharing requests with other callers.
+        
+        Args:
+            urls: Article URLs
+            
+        Returns:
+            Mapping of URL to extracted text, or None if extraction failed
+        """
+        futures = {url: self.submit(url) for url in urls}
+        return {url: future.result() for url, future in futures.items()}
+    
+    def _take_batch(self) -> list[tuple[str, Future]]:
+        """Remove the next batch from the waiting URLs; the lock must be held."""
+        batch = self._pending[:self.batch_size]
+        del self._pending[:self.batch_size]
+        if not self._pending and self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+    
+    def _send_batch(self, batch: list[tuple[str, Future]]) -> None:
+        """Send one batch in one extract call and resolve its futures."""
+        if not batch:
+            return
+        
+        contents = self._extract_batch([url for url, _ in batch])
+        for url, future in batch:
+            future.set_result(contents.get(url))
+    
+    def _extract_batch(self, urls: list[str]) -> dict[str, Optional[str]]:
+        """Call Tavily for one batch and map results back to each URL."""
+        contents: dict[str, Optional[str]] = dict.fromkeys(urls)
+        
+        try:
+            logger.debug(f"Sending {len(urls)} URLs to Tavily")
+            with self._lock:
+                self.requests_sent += 1
+            response = self.client.extract(urls=urls)
+        except Exception as e:
+            logger.warning(f"Tavily batch extraction failed for {len(urls)} URLs: {e}")
+            return contents
+        
+        if not response or "results" not in response:
+            logger.warning(f"Tavily returned empty response for {len(urls)} URLs")
+            return contents
+        
+        for result in response["results"]:
+            url = result.get("url")
+            content = result.get("raw_content")
+            if url in contents and content:
+                contents[url] = content
+        
+        for failed in response.get("failed_results") or []:
+            logger.warning(f"Tavily could not extract {failed.get('url')}: {failed.get('error')}")
+        
+        extracted = sum(1 for content in contents.values() if content)
+        logger.info(f"Tavily extracted {extracted}/{len(urls)} articles in one request")
+        return contents
+
+
+class ExtractorEngine(ABC):
+    """Turns a downloaded page into article text.
     
-    Tries Tavily API first if available, falls back to newspaper3k.
+    Subclasses set name (stored with cached text) and implement extract().
+    Register them with register_engine() to make them selectable.
+    """
+    
+    name = ""
+    
+    @abstractmethod
+    def extract(self, url: str, html: str) -> Optional[str]:
+        """Extract article text from a page.
+        
+        Args:
+            url: Article URL
+            html: Page HTML
+            
+        Returns:
+            Extracted text, or None if the page has none
+        """
+
+
+class NewspaperEngine(ExtractorEngine):
+    """Full newspaper3k extraction (slow, but the most thorough)."""
+    
+    name = "newspaper"
+    
+    def extract(self, url: str, html: str) -> Optional[str]:
+        article = get_backend("newspaper")(url)
+        article.download(input_html=html)
+        article.parse()
+        return article.text or None
+
+
+class ReadabilityEngine(ExtractorEngine):
+    """Lean lxml readability-style extraction (see readability.py)."""
+    
+    name = "readability"
+    
+    def extract(self, url: str, html: str) -> Optional[str]:
+        from .readability import extract_readable_text
+        
+        return extract_readable_text(html)
+
+
+# Engines live in the backend registry under their name with this prefix
+_ENGINE_PREFIX = "engine:"
+
+# Engine used when none is given
+_default_engine = NewspaperEngine.name
+
+
+def register_engine(engine_class: type[ExtractorEngine]) -> None:
+    """Make an extractor engine selectable by its name.
+    
+    The engine is built on first use, like the other backends.
+    
+    Args:
+        engine_class: Engine class
+    """
+    registry.register(f"{_ENGINE_PREFIX}{engine_class.name}", engine_class)
+
+
+def get_engine(name: Optional[str] = None) -> ExtractorEngine:
+    """Get an extractor engine.
+    
+    Args:
+        name: Engine name (defaults to the configured default engine)
+        
+    Returns:
+        The engine
+        
+    Raises:
+        ValueError: If no engine of that name is registered
+    """
+    name = name or _default_engine
+    try:
+        return registry.get(f"{_ENGINE_PREFIX}{name}")
+    except KeyError:
+        raise ValueError(
+            f"Unknown extractor engine {name!r}, choose from {', '.join(engine_names())}"
+        )
+
+
+def set_default_engine(name: str) -> None:
+    """Choose the engine used for pages Tavily does not extract.
+    
+    Args:
+        name: Engine name
+        
+    Raises:
+        ValueError: If no engine of that name is registered
+    """
+    global _default_engine
+    
+    get_engine(name)
+    _default_engine = name
+
+
+def engine_names() -> list[str]:
+    """Get the names of all registered engines."""
+    return [
+        name[len(_ENGINE_PREFIX):]
+        for name in registry.names()
+        if name.startswith(_ENGINE_PREFIX)
+    ]
+
+
+register_engine(NewspaperEngine)
+register_engine(ReadabilityEngine)
+
+
+def extract_with_engine(url: str, engine: Optional[ExtractorEngine] = None) -> Optional[str]:
+    """Download a page and extract its article text with an engine.
+    
+    The page is downloaded through the shared HTTP pool (keep-alive,
+    per-host rate limits, timeouts) and only parsed by the engine.
     
     Args:
         url: Article URL
+        engine: Engine to use (defaults to the default engine)
         
     Returns:
         Extracted article text, or None if extraction fails
     """
-    # Try Tavily first if available
-    if tavily_client:
-        content = extract_with_tavily(url)
-        if content:
-            return content
-        logger.info(f"Tavily extraction failed, falling back to newspaper3k: {url}")
-    
-    # Fall back to newspaper3k
+    engine = engine or get_engine()
     try:
-        article = Article(url)
-        article.download()
-        article.parse()
+        html = fetch_html(url)
+        text = engine.extract(url, html)
         
-        if article.text:
-            logger.info(f"Extracted {len(article.text)} characters with newspaper3k: {url}")
-            return article.text
+        if text:
+            logger.info(f"Extracted {len(text)} characters with {engine.name}: {url}")
+            return text
         else:
             logger.warning(f"No text extracted from {url}")
             return None
@@ -111,3 +353,146 @@ def extract_article_text(url: str) -> Optional[str]:
     except Exception as e:
         logger.warning(f"Failed to extract article from {url}: {e}")
         return None
+
+
+def extract_with_newspaper(url: str) -> Optional[str]:
+    """Extract article text using newspaper3k.
+    
+    Args:
+        url: Article URL
+        
+    Returns:
+        Extracted article text, or None if extraction fails
+    """
+    return extract_with_engine(url, get_engine(NewspaperEngine.name))
+
+
+def extract_with_parse_pool(urls: list[str], pool: ParsePool) -> dict[str, Optional[str]]:
+    """Extract article text by parsing pages in worker processes.
+    
+    Pages are downloaded here through the shared HTTP pool; only the
+    CPU-heavy parsing runs in the pool, under its per-page deadline.
+    
+    Args:
+        urls: Article URLs
+        pool: Parse pool to use
+        
+    Returns:
+        Mapping of URL to extracted text, or None if extraction failed
+    """
+    pages = {}
+    for url in urls:
+        try:
+            pages[url] = fetch_html(url)
+        except Exception as e:
+            logger.warning(f"Failed to download {url}: {e}")
+    
+    contents: dict[str, Optional[str]] = dict.fromkeys(urls)
+    contents.update(pool.parse_many(pages))
+    
+    extracted = sum(1 for content in contents.values() if content)
+    logger.info(f"Extracted {extracted}/{len(urls)} articles with {pool.engine} worker processes")
+    return contents
+
+
+def extract_article_text(url: str) -> Optional[str]:
+    """Extract full article text from web page.
+    
+    Returns cached text when the URL was extracted before. Otherwise tries
+    Tavily API first if available, falls back to the default engine.
+    
+    Args:
+        url: Article URL
+        
+    Returns:
+        Extracted article text, or None if extraction fails
+    """
+    cache = get_extraction_cache()
+    content = cache.get(url)
+    if content:
+        logger.debug(f"Extraction cache hit: {url}")
+        return content
+    
+    engine = get_engine()
+    
+    # Try Tavily first if available
+    if get_tavily_client():
+        content = extract_with_tavily(url)
+        if content:
+            cache.put(url, content, "tavily")
+            return content
+        logger.info(f"Tavily extraction failed, falling back to {engine.name}: {url}")
+    
+    # Fall back to the local extractor engine
+    content = extract_with_engine(url, engine)
+    if content:
+        cache.put(url, content, engine.name)
+    return content
+
+
+def extract_articles(
+    urls: list[str],
+    tavily: Optional[TavilyBatchExtractor] = None,
+    cache: Optional[ExtractionCache] = None,
+    parse_pool: Optional[ParsePool] = None,
+    engine: Optional[ExtractorEngine] = None
+) -> dict[str, Optional[str]]:
+    """Extract full text for several articles at once.
+    
+    URLs found in the extraction cache are not extracted again. When Tavily
+    is available the remaining URLs go to its batcher, which combines
+    them with other callers' URLs; only the URLs Tavily could not extract
+    fall back to a local extractor engine. When a parse pool is configured,
+    that engine runs in the pool's worker processes instead.
+    
+    Args:
+        urls: Article URLs
+        tavily: Tavily batcher to use (defaults to the shared batcher, if
+            Tavily is available)
+        cache: Extraction cache to use (defaults to the shared cache)
+        parse_pool: Process pool for parsing (defaults to the shared pool,
+            if one is configured; otherwise pages are parsed in-process)
+        engine: Engine for in-process parsing (defaults to the default engine)
+        
+    Returns:
+        Mapping of URL to extracted text, or None if extraction failed
+    """
+    tavily = tavily or get_tavily_batcher()
+    cache = cache or get_extraction_cache()
+    contents: dict[str, Optional[str]] = dict.fromkeys(urls)
+    
+    contents.update(cache.get_many(urls))
+    pending = [url for url in urls if not contents[url]]
+    if len(pending) < len(urls):
+        logger.debug(f"Extraction cache hits: {len(urls) - len(pending)}/{len(urls)}")
+    
+    extracted = []
+    if tavily and pending:
+        for url, content in tavily.extract(pending).items():
+            if content:
+                contents[url] = content
+                extracted.append((url, content, "tavily"))
+    
+    failed = [url for url in pending if not contents[url]]
+    parse_pool = parse_pool or get_parse_pool()
+    if parse_pool:
+        engine_name = parse_pool.engine
+    else:
+        engine = engine or get_engine()
+        engine_name = engine.name
+    if tavily and failed:
+        logger.info(f"Tavily failed to extract {len(failed)} URLs, falling back to {engine_name}")
+    
+    if parse_pool:
+        if failed:
+            contents.update(extract_with_parse_pool(failed, parse_pool))
+    else:
+        for url in failed:
+            contents[url] = extract_with_engine(url, engine)
+    
+    for url in failed:
+        if contents[url]:
+            extracted.append((url, contents[url], engine_name))
+    
+    cache.put_many(extracted)
+    return contents
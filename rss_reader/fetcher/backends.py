@@ -0,0 +1,128 @@
+"""Registry of article extraction backends, built on first use.
+
+Importing newspaper3k takes a noticeable fraction of a second and creating
+a Tavily client reads the environment and imports its SDK. Backends are
+therefore registered as factories and only built the first time an
+extraction actually needs them, so importing rss_reader.fetcher (and the
+TUI, which imports it at startup) stays cheap. Extractor engines (see
+article_extractor) are registered here the same way.
+"""
+
+import logging
+import os
+import threading
+from typing import Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Builds a backend, or returns None if it is unavailable (missing package or key)
+BackendFactory = Callable[[], Optional[object]]
+
+
+class BackendRegistry:
+    """Named extraction backends, each built at most once."""
+    
+    def __init__(self):
+        self._factories: dict[str, BackendFactory] = {}
+        self._backends: dict[str, Optional[object]] = {}
+        self._lock = threading.Lock()
+    
+    def register(self, name: str, factory: BackendFactory) -> None:
+        """Register a backend factory, replacing any backend of that name.
+        
+        Args:
+            name: Backend name
+            factory: Callable building the backend, or returning None if
+                it is unavailable
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._backends.pop(name, None)
+    
+    def get(self, name: str) -> Optional[object]:
+        """Get a backend, building it on first use.
+        
+        Unavailable backends are remembered too, so a missing package or
+        API key is only looked up once.
+        
+        Args:
+            name: Backend name
+        
+        Returns:
+            The backend, or None if it is unavailable
+        
+        Raises:
+            KeyError: If no backend of that name is registered
+        """
+        with self._lock:
+            if name not in self._backends:
+                factory = self._factories[name]
+                self._backends[name] = factory()
+            return self._backends[name]
+    
+    def is_built(self, name: str) -> bool:
+        """Check whether a backend has been built (or found unavailable)."""
+        with self._lock:
+            return name in self._backends
+    
+    def names(self) -> list[str]:
+        """Get the names of all registered backends, in registration order."""
+        with self._lock:
+            return list(self._factories)
+    
+    def reset(self) -> None:
+        """Forget built backends so they are built again on next use."""
+        with self._lock:
+            self._backends.clear()
+
+
+def create_tavily_client():
+    """Create a Tavily client if an API key is configured.
+    
+    Returns:
+        TavilyClient instance, or None if Tavily is unavailable
+    """
+    api_key = os.getenv("TAVILY_API_KEY")
+    if not api_key:
+        logger.info("TAVILY_API_KEY not set, using newspaper3k only for article extraction")
+        return None
+    
+    try:
+        from tavily import TavilyClient
+        client = TavilyClient(api_key=api_key)
+        logger.info("Tavily client initialized successfully for article extraction")
+        return client
+    except ImportError:
+        logger.warning("tavily-python not installed. Install with: pip install -e '.[tavily]'")
+    except Exception as e:
+        logger.error(f"Failed to initialize Tavily client: {e}")
+    return None
+
+
+def load_newspaper_article():
+    """Import newspaper3k's Article class.
+    
+    Returns:
+        newspaper.Article
+    """
+    from newspaper import Article
+    return Article
+
+
+registry = BackendRegistry()
+registry.register("tavily", create_tavily_client)
+registry.register("newspaper", load_newspaper_article)
+
+
+def get_backend(name: str) -> Optional[object]:
+    """Get a backend from the shared registry, building it on first use.
+    
+    Args:
+        name: Backend name ("tavily", "newspaper", or an extractor engine
+            registered by article_extractor.register_engine)
+    
+    Returns:
+        The backend, or None if it is unavailable
+    """
+    return registry.get(name)
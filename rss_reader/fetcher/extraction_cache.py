@@ -0,0 +1,211 @@
+"""Persistent cache of extracted article text."""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+from ..db import get_connection, transaction
+from ..db.bodies import compress_body, decompress_body
+from ..urls import normalize_url
+
+
+logger = logging.getLogger(__name__)
+
+# Total size of cached text, compressed, kept before the least recently used
+# entries are evicted
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Seconds a cached extraction stays valid
+DEFAULT_TTL_SECONDS = 30 * 24 * 60 * 60
+
+# Number of stored entries between eviction passes
+EVICT_INTERVAL = 200
+
+
+class ExtractionCache:
+    """SQLite-backed cache of extracted article text.
+    
+    Entries are keyed by normalized URL, so the same article reached through
+    different feeds or tracking parameters is only extracted once. Text is
+    stored compressed like article bodies (see rss_reader.db.bodies).
+    Entries expire after ttl_seconds, and the least recently used entries
+    are evicted once the compressed text exceeds max_bytes.
+    """
+    
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock=time.time
+    ):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._writes_since_evict = 0
+    
+    def get_many(self, urls: list[str]) -> dict[str, str]:
+        """Look up cached text for several URLs.
+        
+        Args:
+            urls: Article URLs
+        
+        Returns:
+            Mapping of URL to cached text for every URL with a fresh entry
+        """
+        if not urls:
+            return {}
+        
+        keys = {url: normalize_url(url) for url in urls}
+        now = self._clock()
+        conn = get_connection()
+        
+        # URLs differing only in tracking parameters share a key
+        unique_keys = list(set(keys.values()))
+        placeholders = ",".join("?" * len(unique_keys))
+        cursor = conn.execute(
+            f"""
+            SELECT url_key, content FROM extraction_cache
+            WHERE url_key IN ({placeholders}) AND created_at >= ?
+            """,
+            (*unique_keys, now - self.ttl_seconds)
+        )
+        cached = {row[0]: decompress_body(row[1]) for row in cursor}
+        
+        if cached:
+            with transaction():
+                conn.executemany(
+                    "UPDATE extraction_cache SET last_access = ? WHERE url_key = ?",
+                    [(now, key) for key in cached]
+                )
+        
+        found = {url: cached[key] for url, key in keys.items() if key in cached}
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(urls) - len(found)
+        return found
+    
+    def get(self, url: str) -> Optional[str]:
+        """Look up cached text for a URL.
+        
+        Args:
+            url: Article URL
+        
+        Returns:
+            Cached text, or None on a miss
+        """
+        return self.get_many([url]).get(url)
+    
+    def put_many(self, entries: list[tuple[str, str, str]]) -> None:
+        """Store extracted text for several URLs.
+        
+        Args:
+            entries: Tuples of (url, content, extractor name)
+        """
+        if not entries:
+            return
+        
+        now = self._clock()
+        # Compress before taking the write lock
+        rows = []
+        for url, content, extractor in entries:
+            blob = compress_body(content)
+            rows.append((normalize_url(url), blob, extractor, len(blob), now, now))
+        with transaction() as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO extraction_cache
+                    (url_key, content, extractor, size, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+        
+        with self._lock:
+            self._writes_since_evict += len(entries)
+            due = self._writes_since_evict >= EVICT_INTERVAL
+            if due:
+                self._writes_since_evict = 0
+        if due:
+            self.evict()
+    
+    def put(self, url: str, content: str, extractor: str) -> None:
+        """Store extracted text for a URL.
+        
+        Args:
+            url: Article URL
+            content: Extracted text
+            extractor: Name of the extractor that produced the text
+        """
+        self.put_many([(url, content, extractor)])
+    
+    def evict(self) -> int:
+        """Remove expired entries and trim the cache to max_bytes.
+        
+        Returns:
+            Number of entries removed
+        """
+        with transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM extraction_cache WHERE created_at < ?",
+                (self._clock() - self.ttl_seconds,)
+            )
+            removed = cursor.rowcount
+        
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM extraction_cache").fetchone()[0]
+            if total > self.max_bytes:
+                # Walk entries oldest-access first until enough bytes are freed
+                excess = total - self.max_bytes
+                doomed = []
+                for url_key, size in conn.execute(
+                    "SELECT url_key, size FROM extraction_cache ORDER BY last_access"
+                ):
+                    if excess <= 0:
+                        break
+                    doomed.append((url_key,))
+                    excess -= size
+                conn.executemany("DELETE FROM extraction_cache WHERE url_key = ?", doomed)
+                removed += len(doomed)
+        
+        if removed:
+            logger.info(f"Evicted {removed} entries from extraction cache")
+        return removed
+    
+    def stats(self) -> dict:
+        """Get cache counters and size.
+        
+        Returns:
+            Dictionary with hits, misses, entries and bytes
+        """
+        conn = get_connection()
+        entries, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extraction_cache"
+        ).fetchone()
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': entries,
+                'bytes': size,
+            }
+
+
+_cache: Optional[ExtractionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """Get the process-wide extraction cache, creating it on first use.
+    
+    Returns:
+        Shared ExtractionCache instance
+    """
+    global _cache
+    
+    with _cache_lock:
+        if _cache is None:
+            _cache = ExtractionCache()
+        return _cache
@@ -1,12 +1,18 @@
 """RSS feed fetching and parsing."""
 
+import hashlib
 import logging
+from dataclasses import dataclass, field
 from typing import Optional
 from datetime import datetime
 
 import feedparser
+import requests
 from feedparser import FeedParserDict
 
+from .http_pool import get_http_pool
+from ..urls import canonical_link
+
 
 logger = logging.getLogger(__name__)
 
@@ -16,50 +22,288 @@ class FeedFetchError(Exception):
     pass
 
 
-def fetch_feed(url: str) -> FeedParserDict:
-    """Fetch and parse RSS/Atom feed.
+# HTTP status returned when a conditional GET finds the feed unchanged
+HTTP_NOT_MODIFIED = 304
+
+# Accept header sent with feed requests
+FEED_ACCEPT = (
+    "application/rss+xml, application/atom+xml, application/rdf+xml, "
+    "application/xml;q=0.9, text/xml;q=0.9, */*;q=0.1"
+)
+
+# Number of newest entry keys remembered per feed as its high-water mark
+HIGH_WATER_MARK_SIZE = 20
+
+# Consecutive already-seen entries after which incremental parsing stops
+STOP_AFTER_KNOWN = 3
+
+
+@dataclass
+class FeedPayload:
+    """Raw response to a feed request, before any parsing.
+    
+    Attributes:
+        url: Final URL of the feed, after redirects
+        status: HTTP status code
+        body: Raw response body (empty for 304 Not Modified)
+        etag: ETag header, if the server sent one
+        modified: Last-Modified header, if the server sent one
+        headers: Response headers with lowercased names
+    """
+    url: str
+    status: int
+    body: bytes = b""
+    etag: Optional[str] = None
+    modified: Optional[str] = None
+    headers: dict[str, str] = field(default_factory=dict)
+    
+    @property
+    def content_hash(self) -> str:
+        """Hex digest identifying the exact bytes of the body."""
+        return hashlib.sha256(self.body).hexdigest()
+
+
+def download_feed(
+    url: str,
+    etag: Optional[str] = None,
+    modified: Optional[str] = None
+) -> FeedPayload:
+    """Download a feed through the shared HTTP pool without parsing it.
+    
+    When cache validators from a previous poll are given, the request is
+    sent as a conditional GET and an unchanged feed comes back with status
+    304 and an empty body.
     
     Args:
         url: RSS feed URL
+        etag: ETag returned by the previous poll
+        modified: Last-Modified value returned by the previous poll
+        
+    Returns:
+        Raw feed response
+        
+    Raises:
+        FeedFetchError: If the feed cannot be downloaded
+    """
+    headers = {"Accept": FEED_ACCEPT}
+    if etag:
+        headers["If-None-Match"] = etag
+    if modified:
+        headers["If-Modified-Since"] = modified
+    
+    try:
+        response = get_http_pool().get(url, headers=headers)
+    except requests.RequestException as e:
+        raise FeedFetchError(f"Error fetching feed {url}: {e}")
+    
+    if response.status_code >= 400:
+        raise FeedFetchError(f"HTTP {response.status_code} error fetching feed: {url}")
+    
+    return FeedPayload(
+        url=response.url or url,
+        status=response.status_code,
+        body=b"" if response.status_code == HTTP_NOT_MODIFIED else response.content,
+        etag=response.headers.get("ETag"),
+        modified=response.headers.get("Last-Modified"),
+        headers={name.lower(): value for name, value in response.headers.items()},
+    )
+
+
+def parse_payload(payload: FeedPayload) -> FeedParserDict:
+    """Parse a downloaded feed body with feedparser.
+    
+    Args:
+        payload: Feed response from download_feed
         
     Returns:
         Parsed feed data
         
     Raises:
-        FeedFetchError: If feed cannot be fetched or parsed
+        FeedFetchError: If the body is not a valid feed
     """
+    # feedparser resolves relative links against content-location
+    headers = {**payload.headers, "content-location": payload.url}
     try:
-        feed = feedparser.parse(url)
+        feed = feedparser.parse(payload.body, response_headers=headers)
+    except Exception as e:
+        raise FeedFetchError(f"Error parsing feed {payload.url}: {e}")
+    
+    if feed.bozo and not feed.entries:
+        error = getattr(feed, 'bozo_exception', 'Unknown error')
+        raise FeedFetchError(f"Invalid feed format: {error}")
+    
+    return feed
+
+
+def fetch_feed(
+    url: str,
+    etag: Optional[str] = None,
+    modified: Optional[str] = None
+) -> FeedParserDict:
+    """Fetch and parse RSS/Atom feed.
+    
+    When cache validators from a previous poll are given, the request is
+    sent as a conditional GET. An unchanged feed then comes back with
+    status 304 and no entries (see is_not_modified).
+    
+    Args:
+        url: RSS feed URL
+        etag: ETag returned by the previous poll
+        modified: Last-Modified value returned by the previous poll
         
-        # Check for HTTP errors
-        if hasattr(feed, 'status') and feed.status >= 400:
-            raise FeedFetchError(f"HTTP {feed.status} error fetching feed: {url}")
+    Returns:
+        Parsed feed data, with the response's status, etag and modified
         
-        # Check if feed is valid
-        if feed.bozo and not feed.entries:
-            error = getattr(feed, 'bozo_exception', 'Unknown error')
-            raise FeedFetchError(f"Invalid feed format: {error}")
+    Raises:
+        FeedFetchError: If feed cannot be fetched or parsed
+    """
+    payload = download_feed(url, etag=etag, modified=modified)
+    
+    if is_not_modified(payload):
+        feed = FeedParserDict(entries=[], bozo=False)
+    else:
+        feed = parse_payload(payload)
+    
+    feed['href'] = payload.url
+    feed['status'] = payload.status
+    feed['etag'] = payload.etag
+    feed['modified'] = payload.modified
+    return feed
+
+
+def is_not_modified(feed: FeedParserDict | FeedPayload) -> bool:
+    """Check whether a conditional GET reported the feed as unchanged.
+    
+    Args:
+        feed: Parsed feed data from fetch_feed, or a FeedPayload
         
-        return feed
+    Returns:
+        True if the server answered 304 Not Modified
+    """
+    return getattr(feed, 'status', None) == HTTP_NOT_MODIFIED
+
+
+def get_cache_validators(
+    feed: FeedParserDict | FeedPayload
+) -> tuple[Optional[str], Optional[str], Optional[int]]:
+    """Get the HTTP cache validators and status from a fetched feed.
+    
+    Args:
+        feed: Parsed feed data from fetch_feed, or a FeedPayload
         
-    except Exception as e:
-        if isinstance(e, FeedFetchError):
-            raise
-        raise FeedFetchError(f"Error fetching feed {url}: {e}")
+    Returns:
+        Tuple of (etag, modified, status); missing values are None
+    """
+    etag = getattr(feed, 'etag', None)
+    modified = getattr(feed, 'modified', None)
+    status = getattr(feed, 'status', None)
+    
+    return (
+        etag if isinstance(etag, str) else None,
+        modified if isinstance(modified, str) else None,
+        status if isinstance(status, int) else None,
+    )
+
+
+def entry_key(entry) -> Optional[str]:
+    """Get the identifier used to recognise an entry across polls.
+    
+    Args:
+        entry: Feed entry from feedparser
+        
+    Returns:
+        The entry's GUID, falling back to its link, or None if it has neither
+    """
+    for attr in ('id', 'link'):
+        value = getattr(entry, attr, None)
+        if isinstance(value, str) and value:
+            return value
+    return None
+
 
+def _is_oldest_first(feed: FeedParserDict) -> bool:
+    """Check whether a feed lists its entries oldest first.
+    
+    Feeds almost always list their newest entry first. Feeds listing
+    oldest first are detected from the dates of the first and last entry,
+    without looking at every entry.
+    """
+    entries = feed.entries
+    if len(entries) < 2:
+        return False
+    
+    first = getattr(entries[0], 'published_parsed', None)
+    last = getattr(entries[-1], 'published_parsed', None)
+    return isinstance(first, tuple) and isinstance(last, tuple) and tuple(first) < tuple(last)
 
-def parse_feed(feed: FeedParserDict) -> list[dict]:
+
+def _entries_newest_first(feed: FeedParserDict) -> list:
+    """Get feed entries ordered newest first."""
+    entries = list(feed.entries)
+    if _is_oldest_first(feed):
+        entries.reverse()
+    return entries
+
+
+def newest_entry_keys(feed: FeedParserDict, count: int = HIGH_WATER_MARK_SIZE) -> list[str]:
+    """Get the keys of a feed's newest entries, to store as its high-water mark.
+    
+    Args:
+        feed: Parsed feed data from feedparser
+        count: Maximum number of keys to return
+        
+    Returns:
+        Entry keys, newest first
+    """
+    keys = []
+    for entry in _entries_newest_first(feed):
+        key = entry_key(entry)
+        if key:
+            keys.append(key)
+            if len(keys) == count:
+                break
+    return keys
+
+
+def parse_feed(
+    feed: FeedParserDict,
+    known_keys: Optional[set[str]] = None,
+    stop_after: int = STOP_AFTER_KNOWN
+) -> list[dict]:
     """Extract article data from parsed feed.
     
+    Entries are walked newest first. When known_keys (the feed's high-water
+    mark from the previous poll) is given, parsing stops at the first run of
+    stop_after consecutive known entries, since everything older was seen
+    before.
+    
     Args:
         feed: Parsed feed data from feedparser
+        known_keys: Keys of entries seen on the previous poll
+        stop_after: Number of consecutive known entries that ends parsing
         
     Returns:
-        List of article dictionaries with keys: title, link, summary, published_date
+        List of article dictionaries with keys: title, link, canonical_link,
+        summary, published_date, in the order the feed lists them
     """
     articles = []
+    entries = _entries_newest_first(feed)
+    # A short mark (e.g. a feed with few entries) must still be able to stop us
+    run_needed = min(stop_after, len(known_keys)) if known_keys else 0
+    known_run = 0
+    walked = 0
     
-    for entry in feed.entries:
+    for entry in entries:
+        walked += 1
+        
+        if run_needed:
+            if entry_key(entry) in known_keys:
+                known_run += 1
+                if known_run >= run_needed:
+                    break
+                continue
+            known_run = 0
+        
         # Skip entries missing required fields
         if not hasattr(entry, 'title') or not hasattr(entry, 'link'):
             logger.warning(f"Skipping entry missing title or link: {entry.get('id', 'unknown')}")
@@ -76,11 +320,22 @@ def parse_feed(feed: FeedParserDict) -> list[dict]:
         article = {
             'title': entry.title,
             'link': entry.link,
+            'canonical_link': canonical_link(entry.link),
             'summary': getattr(entry, 'summary', None),
             'published_date': published_date,
         }
         
         articles.append(article)
     
-    logger.info(f"Parsed {len(articles)} articles from feed")
+    if walked < len(entries):
+        logger.info(
+            f"Parsed {len(articles)} articles from feed, "
+            f"stopped at high-water mark after {walked}/{len(entries)} entries"
+        )
+    else:
+        logger.info(f"Parsed {len(articles)} articles from feed")
+    
+    # Hand articles back in the order the feed lists them
+    if _is_oldest_first(feed):
+        articles.reverse()
     return articles
@@ -0,0 +1,255 @@
+"""Shared HTTP connection pool with per-host rate limiting."""
+
+import logging
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a TCP/TLS connection to be established
+DEFAULT_CONNECT_TIMEOUT = 5.0
+
+# Seconds to wait between bytes once connected
+DEFAULT_READ_TIMEOUT = 20.0
+
+# Maximum keep-alive connections kept open per host
+DEFAULT_POOL_SIZE = 10
+
+# Hosts whose connection pools are kept; a refresh touching more hosts
+# than this evicts pools and reopens their connections
+DEFAULT_POOL_HOSTS = 256
+
+# Maximum requests in flight across all hosts
+DEFAULT_MAX_CONNECTIONS = 32
+
+# Sustained requests per second allowed against a single host
+DEFAULT_HOST_RATE = 2.0
+
+# Requests a host may receive in a burst before the rate applies
+DEFAULT_HOST_BURST = 4
+
+# Pause applied to a host answering 429 without a usable Retry-After
+DEFAULT_RETRY_AFTER = 30.0
+
+USER_AGENT = "Mozilla/5.0 (compatible; rss-reader/0.1; +https://github.com/timlawrenz/didactic-broccoli)"
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting the rate of requests."""
+    
+    def __init__(self, rate: float, capacity: int, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """Take one token, waiting until one is available.
+        
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                else:
+                    delay = (1 - self._tokens) / self.rate
+            
+            self._sleep(delay)
+            waited += delay
+    
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for a while (e.g. after HTTP 429).
+        
+        Args:
+            seconds: How long to pause
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+            self._tokens = 0.0
+
+
+class HostRateLimiter:
+    """Keeps one token bucket per host."""
+    
+    def __init__(self, rate: float = DEFAULT_HOST_RATE, burst: int = DEFAULT_HOST_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+    
+    def bucket_for(self, url: str) -> TokenBucket:
+        """Get the token bucket for the host of a URL.
+        
+        Args:
+            url: Request URL
+        
+        Returns:
+            Token bucket shared by all URLs on the same host
+        """
+        host = (urlsplit(url).hostname or "").lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+
+def _retry_after_seconds(response: requests.Response) -> float:
+    """Read a Retry-After header given in seconds."""
+    value = response.headers.get("Retry-After", "")
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return DEFAULT_RETRY_AFTER
+
+
+class HttpPool:
+    """Keep-alive HTTP session shared by all threads.
+    
+    The underlying urllib3 pools are thread-safe and block once pool_size
+    connections to a host are in use; max_connections caps the number of
+    requests in flight across all hosts. Pools of the pool_hosts most
+    recently used hosts are kept, with their idle connections.
+    """
+    
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        pool_hosts: int = DEFAULT_POOL_HOSTS,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        host_rate: float = DEFAULT_HOST_RATE,
+        host_burst: int = DEFAULT_HOST_BURST,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        self.limiter = HostRateLimiter(host_rate, host_burst)
+        self._slots = threading.BoundedSemaphore(max_connections)
+        
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
+    def get(self, url: str, headers: Optional[dict] = None) -> requests.Response:
+        """Send a rate-limited GET request over a pooled connection.
+        
+        Args:
+            url: Request URL
+            headers: Extra request headers
+        
+        Returns:
+            HTTP response
+        
+        Raises:
+            requests.RequestException: On connection errors or timeouts
+        """
+        bucket = self.limiter.bucket_for(url)
+        waited = bucket.acquire()
+        if waited:
+            logger.debug(f"Rate limited {waited:.2f}s before fetching {url}")
+        
+        with self._slots:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        
+        if response.status_code == 429:
+            delay = _retry_after_seconds(response)
+            logger.warning(f"HTTP 429 from {url}, pausing host for {delay:.0f}s")
+            bucket.pause(delay)
+        
+        return response
+    
+    def fetch_text(self, url: str) -> str:
+        """Download a page and return its decoded body.
+        
+        Args:
+            url: Page URL
+        
+        Returns:
+            Response body as text
+        
+        Raises:
+            requests.RequestException: On connection errors, timeouts or HTTP errors
+        """
+        response = self.get(url)
+        response.raise_for_status()
+        return response.text
+    
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+
+_pool: Optional[HttpPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_http_pool() -> HttpPool:
+    """Get the process-wide HTTP pool, creating it on first use.
+    
+    Returns:
+        Shared HttpPool instance
+    """
+    global _pool
+    
+    with _pool_lock:
+        if _pool is None:
+            _pool = HttpPool()
+        return _pool
+
+
+def configure_http_pool(**kwargs) -> HttpPool:
+    """Replace the process-wide HTTP pool with one using new settings.
+    
+    Args:
+        **kwargs: Keyword arguments accepted by HttpPool
+    
+    Returns:
+        The new shared HttpPool instance
+    """
+    global _pool
+    
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = HttpPool(**kwargs)
+        return _pool
+
+
+def fetch_html(url: str) -> str:
+    """Download a web page through the shared HTTP pool.
+    
+    Args:
+        url: Page URL
+    
+    Returns:
+        Page HTML
+    
+    Raises:
+        requests.RequestException: On connection errors, timeouts or HTTP errors
+    """
+    return get_http_pool().fetch_text(url)
@@ -0,0 +1,133 @@
+"""MinHash signatures for recognising near-duplicate article text.
+
+Syndicated stories are republished under different URLs with small
+edits (bylines, boilerplate, a changed sentence). Each text is reduced to
+its set of overlapping word shingles; the fraction of equal slots in two
+MinHash signatures estimates the Jaccard similarity of those sets.
+
+For lookup, a signature is cut into BANDS bands of ROWS slots and each
+band is hashed to one integer (locality-sensitive hashing). Texts that
+are near duplicates almost certainly agree on at least one whole band,
+while unrelated texts almost never do, so candidates are found with
+indexed equality lookups instead of comparing against every article.
+"""
+
+import functools
+import hashlib
+import re
+from typing import Optional
+
+from ..db import models
+
+
+# Slots in a signature
+NUM_PERMUTATIONS = 64
+
+# Bands a signature is indexed under; BANDS * ROWS == NUM_PERMUTATIONS.
+# Texts with Jaccard similarity s share a band with probability
+# 1 - (1 - s**ROWS)**BANDS: 0.99 at s=0.9, 0.03 at s=0.5.
+BANDS = 8
+ROWS = NUM_PERMUTATIONS // BANDS
+
+# Estimated Jaccard similarity from which two texts count as duplicates
+MIN_SIMILARITY = 0.8
+
+# Words per shingle (overlapping word n-grams are the compared features)
+SHINGLE_SIZE = 3
+
+# Texts with fewer words are too short to compare reliably
+MIN_WORDS = 50
+
+_WORD = re.compile(r"\w+")
+
+# Fixed seeds so signatures stay comparable across runs and processes
+_SEED = b"rss-reader-minhash"
+
+
+def _shingle_hashes(words: list[str]) -> list[int]:
+    """Hash every distinct word shingle to a 64-bit integer."""
+    shingles = {
+        " ".join(words[i:i + SHINGLE_SIZE])
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+    return [
+        int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+        for shingle in shingles
+    ]
+
+
+@functools.lru_cache(maxsize=1)
+def _permutations():
+    """Multipliers (odd) and offsets of the multiply-add-shift hash family."""
+    import numpy as np
+    
+    seeds = hashlib.shake_128(_SEED).digest(16 * NUM_PERMUTATIONS)
+    values = np.frombuffer(seeds, dtype="<u8").reshape(NUM_PERMUTATIONS, 2)
+    return values[:, 0] | np.uint64(1), values[:, 1]
+
+
+def minhash(text: Optional[str]) -> Optional[bytes]:
+    """Compute the MinHash signature of a text.
+    
+    Args:
+        text: Article text
+    
+    Returns:
+        Signature of NUM_PERMUTATIONS 32-bit slots, or None if the text is
+        too short
+    """
+    words = _WORD.findall(text.lower()) if text else []
+    if len(words) < MIN_WORDS:
+        return None
+    
+    import numpy as np
+    
+    multipliers, offsets = _permutations()
+    hashes = np.array(_shingle_hashes(words), dtype=np.uint64)
+    # (a * x + b) mod 2**64, keeping the high 32 bits (wrap-around is intended)
+    with np.errstate(over="ignore"):
+        permuted = (multipliers[:, None] * hashes[None, :] + offsets[:, None]) >> np.uint64(32)
+    return permuted.min(axis=1).astype("<u4").tobytes()
+
+
+def _slots(signature: bytes) -> list[int]:
+    """Split a signature into its 32-bit slots."""
+    return [int.from_bytes(signature[i:i + 4], "little") for i in range(0, len(signature), 4)]
+
+
+def similarity(a: bytes, b: bytes) -> float:
+    """Estimate the Jaccard similarity of two texts from their signatures."""
+    slots_a, slots_b = _slots(a), _slots(b)
+    return sum(x == y for x, y in zip(slots_a, slots_b)) / len(slots_a)
+
+
+def band_keys(signature: bytes) -> list[int]:
+    """Hash each band of a signature to a non-negative 63-bit integer."""
+    width = ROWS * 4
+    return [
+        int.from_bytes(
+            hashlib.blake2b(signature[i:i + width], digest_size=8).digest(), "little"
+        ) >> 1
+        for i in range(0, len(signature), width)
+    ]
+
+
+def find_near_duplicate(signature: bytes) -> Optional[int]:
+    """Find a stored canonical article whose text is nearly the same.
+    
+    Only articles sharing a band with the signature are compared, so the
+    lookup goes through the band index instead of scanning every article.
+    
+    Args:
+        signature: Signature from minhash()
+    
+    Returns:
+        article_id of the most similar article at or above MIN_SIMILARITY,
+        or None if there is none
+    """
+    best = None
+    for article_id, candidate in models.get_minhash_candidates(band_keys(signature)):
+        score = similarity(signature, candidate)
+        if score >= MIN_SIMILARITY and (best is None or score > best[0]):
+            best = (score, article_id)
+    return best[1] if best else None
@@ -0,0 +1,237 @@
+"""OPML import and export of feed subscriptions.
+
+Imports stream the OPML file, so large exports are never held in memory
+as a whole tree, and check every new feed concurrently in a bounded pool
+of fetch threads before any of them is added.
+"""
+
+import logging
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Union
+
+from ..db import models
+from .feed_parser import FeedFetchError, fetch_feed
+from .refresh import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_PER_HOST_LIMIT,
+    HostLimiter,
+    RefreshSummary,
+    fetch_all_feeds,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Title written to the head of exported OPML files
+EXPORT_TITLE = "rss-reader subscriptions"
+
+# Feeds waiting for validation per fetch thread, bounding queued work
+_PENDING_PER_WORKER = 2
+
+OpmlSource = Union[str, Path, BinaryIO]
+
+
+class OpmlError(Exception):
+    """Error reading an OPML file."""
+    pass
+
+
+@dataclass
+class OpmlFeed:
+    """A feed subscription listed in an OPML file.
+    
+    Attributes:
+        url: Feed URL (the outline's xmlUrl)
+        title: Outline title, or None if it has none
+    """
+    url: str
+    title: Optional[str] = None
+
+
+@dataclass
+class ImportResult:
+    """Outcome of importing an OPML file.
+    
+    Attributes:
+        added: Mapping of URL to feed_id for newly added feeds
+        existing: URLs that were already subscribed
+        invalid: Mapping of URL to the reason it was not added
+        refresh: Outcome of the first fetch, if one was requested
+    """
+    added: dict[str, int] = field(default_factory=dict)
+    existing: list[str] = field(default_factory=list)
+    invalid: dict[str, str] = field(default_factory=dict)
+    refresh: Optional[RefreshSummary] = None
+
+
+def iter_opml(source: OpmlSource) -> Iterator[OpmlFeed]:
+    """Stream the feed subscriptions listed in an OPML file.
+    
+    Outlines are yielded as soon as they are parsed and discarded
+    afterwards. Category outlines (those without an xmlUrl) are walked
+    into; a URL listed more than once is yielded once.
+    
+    Args:
+        source: Path or binary file object of the OPML document
+    
+    Yields:
+        OpmlFeed for every outline with an xmlUrl
+    
+    Raises:
+        OpmlError: If the file is not well-formed XML
+    """
+    seen = set()
+    try:
+        for event, element in ET.iterparse(source, events=("start", "end")):
+            if element.tag != "outline":
+                continue
+            if event == "end":
+                # Attributes were read on "start"; free the element's subtree
+                element.clear()
+                continue
+            
+            url = (element.get("xmlUrl") or "").strip()
+            if not url or url in seen:
+                continue
+            seen.add(url)
+            title = (element.get("title") or element.get("text") or "").strip()
+            yield OpmlFeed(url=url, title=title or None)
+    except ET.ParseError as e:
+        raise OpmlError(f"Invalid OPML: {e}")
+
+
+def validate_feed(feed: OpmlFeed, limiter: HostLimiter) -> str:
+    """Fetch a feed to check it is reachable and parses.
+    
+    Args:
+        feed: Feed listed in the OPML file
+        limiter: Limits concurrent fetches per host
+    
+    Returns:
+        Display name for the feed: the outline title, else the feed's own
+        title, else its URL
+    
+    Raises:
+        FeedFetchError: If the feed cannot be fetched or parsed
+    """
+    with limiter.semaphore_for(feed.url):
+        data = fetch_feed(feed.url)
+    
+    if feed.title:
+        return feed.title
+    title = data.feed.get('title') if hasattr(data, 'feed') else None
+    return title.strip() if isinstance(title, str) and title.strip() else feed.url
+
+
+def import_opml(
+    source: OpmlSource,
+    validate: bool = True,
+    fetch: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+    generate_embeddings: bool = True,
+) -> ImportResult:
+    """Subscribe to the feeds listed in an OPML file.
+    
+    Feeds are validated while the file is still being read, at most
+    max_workers at a time, and all valid feeds are then added in a single
+    transaction. Feeds that are already subscribed are left untouched.
+    
+    Args:
+        source: Path or binary file object of the OPML document
+        validate: Fetch each new feed and only add those that work
+        fetch: Run the first fetch of all added feeds concurrently
+        max_workers: Maximum number of feeds fetched at once
+        per_host_limit: Maximum number of feeds fetched at once per host
+        generate_embeddings: Whether the first fetch generates ML embeddings
+    
+    Returns:
+        ImportResult listing added, existing and invalid feeds
+    
+    Raises:
+        OpmlError: If the file is not well-formed XML
+    """
+    result = ImportResult()
+    subscribed = {feed['url'] for feed in models.get_all_feeds()}
+    limiter = HostLimiter(per_host_limit)
+    workers = max(1, max_workers)
+    # Stop reading the file while the pool is backed up
+    pending = threading.BoundedSemaphore(workers * _PENDING_PER_WORKER)
+    checks: list[tuple[OpmlFeed, Optional[Future]]] = []
+    
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="opml-validate") as executor:
+        for feed in iter_opml(source):
+            if feed.url in subscribed:
+                result.existing.append(feed.url)
+                continue
+            if not validate:
+                checks.append((feed, None))
+                continue
+            
+            pending.acquire()
+            future = executor.submit(validate_feed, feed, limiter)
+            future.add_done_callback(lambda _: pending.release())
+            checks.append((feed, future))
+    
+    valid = []
+    for feed, future in checks:
+        if future is None:
+            valid.append((feed.url, feed.title or feed.url))
+            continue
+        try:
+            valid.append((feed.url, future.result()))
+        except FeedFetchError as e:
+            result.invalid[feed.url] = str(e)
+            logger.warning(f"Not importing {feed.url}: {e}")
+    
+    result.added = models.add_feeds(valid)
+    logger.info(
+        f"Imported {len(result.added)} feeds ({len(result.existing)} already subscribed, "
+        f"{len(result.invalid)} invalid)"
+    )
+    
+    if fetch and result.added:
+        feeds = [models.get_feed(feed_id) for feed_id in result.added.values()]
+        result.refresh = fetch_all_feeds(
+            feeds,
+            max_workers=max_workers,
+            per_host_limit=per_host_limit,
+            generate_embeddings=generate_embeddings
+        )
+    
+    return result
+
+
+def export_opml(destination: Union[str, Path, BinaryIO], title: str = EXPORT_TITLE) -> int:
+    """Write all subscribed feeds as an OPML 2.0 document.
+    
+    Args:
+        destination: Path or binary file object to write to
+        title: Title of the document
+    
+    Returns:
+        Number of feeds exported
+    """
+    feeds = models.get_all_feeds()
+    
+    opml = ET.Element("opml", version="2.0")
+    head = ET.SubElement(opml, "head")
+    ET.SubElement(head, "title").text = title
+    ET.SubElement(head, "dateCreated").text = format_datetime(datetime.now(timezone.utc))
+    body = ET.SubElement(opml, "body")
+    for feed in feeds:
+        ET.SubElement(
+            body, "outline",
+            type="rss", text=feed['name'], title=feed['name'], xmlUrl=feed['url']
+        )
+    
+    tree = ET.ElementTree(opml)
+    ET.indent(tree)
+    tree.write(destination, encoding="utf-8", xml_declaration=True)
+    return len(feeds)
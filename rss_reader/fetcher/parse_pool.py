@@ -0,0 +1,288 @@
+"""Process pool for parsing article HTML with hard per-page deadlines.
+
+newspaper3k's Article.parse() is pure-Python work that holds the GIL and
+can hang on malformed pages. Parsing in separate processes lets it use
+every core, and a worker that exceeds its deadline or crashes is killed
+and replaced without affecting the pages parsed by other workers.
+"""
+
+import functools
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from multiprocessing.connection import Connection, wait
+from typing import Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Number of worker processes
+DEFAULT_PARSE_WORKERS = 4
+
+# Seconds a single page may take to parse before its worker is killed
+DEFAULT_PARSE_TIMEOUT = 15.0
+
+# Pages a worker parses before it is replaced (bounds leaked memory)
+DEFAULT_MAX_TASKS_PER_WORKER = 200
+
+# Seconds a killed worker is given to exit before it is forcibly killed
+_TERMINATE_GRACE = 1.0
+
+# Seconds between checks that the pool is still open while waiting for a worker
+_IDLE_POLL_INTERVAL = 0.1
+
+# Parses one page: (url, html) -> extracted text or None
+ParseFunction = Callable[[str, str], Optional[str]]
+
+
+def parse_with_engine(engine: str, url: str, html: str) -> Optional[str]:
+    """Extract article text from downloaded HTML with an extractor engine.
+    
+    Args:
+        engine: Extractor engine name
+        url: Article URL
+        html: Page HTML
+    
+    Returns:
+        Extracted text, or None if the engine found none
+    """
+    from .article_extractor import get_engine
+    
+    return get_engine(engine).extract(url, html)
+
+
+def _worker_main(conn: Connection, parse: ParseFunction) -> None:
+    """Worker process loop: parse pages until the pool closes the pipe."""
+    while True:
+        try:
+            url, html = conn.recv()
+        except (EOFError, OSError):
+            return
+        
+        try:
+            conn.send((parse(url, html), None))
+        except Exception as e:
+            conn.send((None, f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    """One worker process and the parent's end of its pipe."""
+    
+    def __init__(self, context, parse: ParseFunction):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, parse), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+    
+    def stop(self) -> None:
+        """Kill the worker process and release its pipe."""
+        self.conn.close()
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(_TERMINATE_GRACE)
+            if self.process.is_alive():
+                self.process.kill()
+        self.process.join()
+
+
+class ParsePool:
+    """Parses pages in worker processes, each page under a hard deadline.
+    
+    Workers are started on first use. A worker that misses its deadline or
+    dies is killed and replaced, and its page yields None. Workers are also
+    replaced after max_tasks_per_worker pages. The pool may be shared by
+    several threads; each parse_many() call uses whichever workers are idle.
+    """
+    
+    def __init__(
+        self,
+        workers: int = DEFAULT_PARSE_WORKERS,
+        timeout: float = DEFAULT_PARSE_TIMEOUT,
+        max_tasks_per_worker: int = DEFAULT_MAX_TASKS_PER_WORKER,
+        engine: str = "newspaper",
+        parse: Optional[ParseFunction] = None
+    ):
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        self.size = workers
+        self.timeout = timeout
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.engine = engine
+        self._parse = parse or functools.partial(parse_with_engine, engine)
+        # Spawned workers do not inherit the parent's threads or locks
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+        self.timeouts = 0
+        self.crashes = 0
+    
+    def _start(self) -> None:
+        """Start the worker processes on first use."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ParsePool is closed")
+            if not self._started:
+                for _ in range(self.size):
+                    self._idle.put(_Worker(self._context, self._parse))
+                self._started = True
+    
+    def _replace(self, worker: _Worker) -> None:
+        """Kill a worker and put a fresh one in its place."""
+        worker.stop()
+        with self._lock:
+            if self._closed:
+                return
+        self._idle.put(_Worker(self._context, self._parse))
+    
+    def _release(self, worker: _Worker) -> None:
+        """Return a worker after a successful task, recycling worn-out ones."""
+        worker.tasks += 1
+        with self._lock:
+            closed = self._closed
+        if closed:
+            worker.stop()
+        elif worker.tasks >= self.max_tasks_per_worker:
+            self._replace(worker)
+        else:
+            self._idle.put(worker)
+    
+    def _parse_in_process(self, url: str, html: str) -> Optional[str]:
+        """Parse a page in this process, without a deadline."""
+        try:
+            return self._parse(url, html)
+        except Exception as e:
+            logger.warning(f"Failed to parse {url}: {type(e).__name__}: {e}")
+            return None
+    
+    def parse_many(self, pages: dict[str, str]) -> dict[str, Optional[str]]:
+        """Parse several pages in parallel.
+        
+        Args:
+            pages: Mapping of URL to downloaded HTML
+        
+        Pages still waiting for a worker when the pool is closed are
+        parsed in this process instead.
+        
+        Returns:
+            Mapping of URL to extracted text, or None if parsing failed,
+            crashed or exceeded the deadline
+        """
+        results: dict[str, Optional[str]] = dict.fromkeys(pages)
+        if not pages:
+            return results
+        self._start()
+        
+        pending = list(pages.items())
+        busy: dict[Connection, tuple[_Worker, str, float]] = {}
+        
+        while pending or busy:
+            # Hand out pages to idle workers; block only if nothing is running
+            while pending:
+                with self._lock:
+                    closed = self._closed
+                if closed:
+                    # Workers are not returned to a closed pool
+                    logger.info(f"Parse pool closed, parsing {len(pending)} pages in-process")
+                    for url, html in pending:
+                        results[url] = self._parse_in_process(url, html)
+                    pending.clear()
+                    break
+                try:
+                    worker = self._idle.get(block=not busy, timeout=_IDLE_POLL_INTERVAL)
+                except queue.Empty:
+                    if busy:
+                        break
+                    continue
+                url, html = pending.pop()
+                worker.conn.send((url, html))
+                busy[worker.conn] = (worker, url, time.monotonic() + self.timeout)
+            
+            if not busy:
+                break
+            next_deadline = min(deadline for _, _, deadline in busy.values())
+            for conn in wait(list(busy), max(0.0, next_deadline - time.monotonic())):
+                worker, url, _ = busy.pop(conn)
+                try:
+                    text, error = conn.recv()
+                except (EOFError, OSError):
+                    with self._lock:
+                        self.crashes += 1
+                    logger.warning(f"Parse worker died while parsing {url}, restarting it")
+                    self._replace(worker)
+                    continue
+                
+                if error:
+                    logger.warning(f"Failed to parse {url}: {error}")
+                results[url] = text
+                self._release(worker)
+            
+            now = time.monotonic()
+            for conn, (worker, url, deadline) in list(busy.items()):
+                if deadline <= now:
+                    del busy[conn]
+                    with self._lock:
+                        self.timeouts += 1
+                    logger.warning(f"Parsing {url} exceeded {self.timeout:.0f}s, killing its worker")
+                    self._replace(worker)
+        
+        return results
+    
+    def parse(self, url: str, html: str) -> Optional[str]:
+        """Parse a single page.
+        
+        Args:
+            url: Article URL
+            html: Page HTML
+        
+        Returns:
+            Extracted text, or None on failure or timeout
+        """
+        return self.parse_many({url: html})[url]
+    
+    def close(self) -> None:
+        """Stop all idle workers; workers still busy are stopped on return."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+
+
+_pool: Optional[ParsePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> Optional[ParsePool]:
+    """Get the process-wide parse pool.
+    
+    Returns:
+        Shared ParsePool, or None if pages are parsed in-process
+    """
+    with _pool_lock:
+        return _pool
+
+
+def configure_parse_pool(workers: int, **kwargs) -> Optional[ParsePool]:
+    """Choose between in-process parsing and a process pool.
+    
+    Args:
+        workers: Number of worker processes (0 parses in-process)
+        **kwargs: Other keyword arguments accepted by ParsePool
+    
+    Returns:
+        The new shared ParsePool, or None for in-process parsing
+    """
+    global _pool
+    
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = ParsePool(workers, **kwargs) if workers > 0 else None
+        return _pool
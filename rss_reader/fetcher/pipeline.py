@@ -1,25 +1,109 @@
 """Pipeline to orchestrate feed fetching and article storage."""
 
 import logging
+import sqlite3
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import ContextManager, Optional
 
-from ..db import models, get_connection
-from .feed_parser import fetch_feed, parse_feed, FeedFetchError
-from .article_extractor import extract_article_text
+from ..db import models, get_connection, transaction
+from .feed_parser import (
+    download_feed,
+    parse_payload,
+    parse_feed,
+    newest_entry_keys,
+    is_not_modified,
+    get_cache_validators,
+    FeedFetchError,
+)
+from .stages import IngestPipeline, StageStats
 
 
 logger = logging.getLogger(__name__)
 
 
-def fetch_and_store_feed(feed_id: int, generate_embeddings: bool = True) -> int:
-    """Fetch RSS feed and store articles in database.
+@dataclass
+class IngestResult:
+    """Outcome of fetching and storing a single feed.
+    
+    Attributes:
+        feed_id: Feed that was fetched
+        new_articles: Number of new articles stored
+        entries_seen: Number of entries parsed from the feed
+        extractions_skipped: Entries whose link was already stored, so
+            full-text extraction was not attempted
+        duplicates: New articles stored as near duplicates of an existing
+            article (linked to it, not embedded)
+        not_modified: True if the server reported the feed unchanged
+        unchanged: True if the server sent the same body as on the last
+            processed poll, so parsing was skipped
+        http_status: HTTP status code of the feed response
+        bytes_received: Size of the feed body
+        download_seconds: Time to resolve, connect and download the feed
+        parse_seconds: Time to parse the feed and pick out new entries
+        total_seconds: Wall time of the whole fetch
+        stage_stats: Throughput counters of the extract, embed and store stages
+    """
+    feed_id: int
+    new_articles: int = 0
+    entries_seen: int = 0
+    extractions_skipped: int = 0
+    duplicates: int = 0
+    not_modified: bool = False
+    unchanged: bool = False
+    http_status: Optional[int] = None
+    bytes_received: int = 0
+    download_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    total_seconds: float = 0.0
+    stage_stats: dict[str, StageStats] = field(default_factory=dict)
+
+
+def _select_new_articles(articles: list[dict]) -> list[dict]:
+    """Drop entries whose link is already stored or repeated in the feed.
+    
+    Links are compared in canonical form, so an article already stored
+    under another variant of its URL (tracking parameters, http/https,
+    trailing slash) is not extracted again.
+    
+    Args:
+        articles: Article dictionaries from parse_feed
+    
+    Returns:
+        Articles that still need extraction, in feed order
+    """
+    existing = models.get_existing_canonical_links([a['canonical_link'] for a in articles])
+    
+    new_articles = []
+    for article_data in articles:
+        if article_data['canonical_link'] in existing:
+            continue
+        existing.add(article_data['canonical_link'])
+        new_articles.append(article_data)
+    
+    return new_articles
+
+
+def ingest_feed(
+    feed_id: int,
+    generate_embeddings: bool = True,
+    download_slot: Optional[ContextManager] = None
+) -> IngestResult:
+    """Fetch RSS feed, store new articles and report what was done.
+    
+    Every attempt, failed or not, is recorded in the feed fetch log with
+    its per-step timings (see telemetry).
     
     Args:
         feed_id: Feed ID to fetch
         generate_embeddings: Whether to generate ML embeddings (default True)
-        
+        download_slot: Held while the feed itself is downloaded, such as
+            a per-host semaphore; extraction and storage run without it
+    
     Returns:
-        Number of new articles added
-        
+        IngestResult describing the fetch
+    
     Raises:
         FeedFetchError: If feed cannot be fetched
     """
@@ -28,63 +112,143 @@ def fetch_and_store_feed(feed_id: int, generate_embeddings: bool = True) -> int:
     if not feed:
         raise ValueError(f"Feed {feed_id} not found")
     
+    result = IngestResult(feed_id=feed_id)
+    started = time.perf_counter()
+    try:
+        _ingest(feed, result, generate_embeddings, download_slot or nullcontext())
+    except Exception as e:
+        result.total_seconds = time.perf_counter() - started
+        _log_fetch(result, error=str(e))
+        raise
+    result.total_seconds = time.perf_counter() - started
+    _log_fetch(result)
+    return result
+
+
+def _ingest(feed, result: IngestResult, generate_embeddings: bool, download_slot: ContextManager) -> None:
+    """Run one fetch of a feed, filling in result as each step completes."""
+    feed_id = feed['feed_id']
     url = feed['url']
     logger.info(f"Fetching feed: {url}")
     
-    # Fetch and parse feed
+    # Download feed, sending validators from the previous poll
+    started = time.perf_counter()
     try:
-        feed_data = fetch_feed(url)
-        articles = parse_feed(feed_data)
+        with download_slot:
+            payload = download_feed(url, etag=feed['etag'], modified=feed['modified'])
     except FeedFetchError as e:
         logger.error(f"Failed to fetch feed {url}: {e}")
         raise
+    finally:
+        result.download_seconds = time.perf_counter() - started
     
-    # Process articles
-    new_count = 0
-    for article_data in articles:
-        # Extract full text (graceful degradation if it fails)
-        full_text = extract_article_text(article_data['link'])
-        
-        # Store article
-        article_id = models.add_article(
-            feed_id=feed_id,
-            title=article_data['title'],
-            link=article_data['link'],
-            summary=article_data['summary'],
-            full_text=full_text,
-            published_date=article_data['published_date']
+    etag, modified, status = get_cache_validators(payload)
+    result.http_status = status
+    result.bytes_received = len(payload.body)
+    
+    # Many servers ignore conditional GET but resend a byte-identical body
+    content_hash = payload.content_hash
+    result.not_modified = is_not_modified(payload)
+    result.unchanged = not result.not_modified and content_hash == feed['content_hash']
+    if result.not_modified or result.unchanged:
+        # Servers may omit validators on 304; keep the ones we sent
+        with transaction():
+            models.update_feed_http_cache(
+                feed_id, etag or feed['etag'], modified or feed['modified'], status
+            )
+            models.update_feed_timestamp(feed_id)
+        reason = "not modified" if result.not_modified else "body unchanged"
+        logger.info(f"Feed {reason} since last poll: {url}")
+        return
+    
+    started = time.perf_counter()
+    try:
+        feed_data = parse_payload(payload)
+    except FeedFetchError as e:
+        result.parse_seconds = time.perf_counter() - started
+        logger.error(f"Failed to parse feed {url}: {e}")
+        raise
+    
+    # Parse only entries newer than the previous poll's high-water mark
+    known_keys = models.get_feed_high_water_mark(feed_id)
+    articles = parse_feed(feed_data, known_keys=known_keys)
+    
+    # Only extract entries that are not stored yet
+    result.entries_seen = len(articles)
+    articles = _select_new_articles(articles)
+    result.extractions_skipped = result.entries_seen - len(articles)
+    result.parse_seconds = time.perf_counter() - started
+    
+    # Extract, embed and store in overlapping stages
+    stages = IngestPipeline(generate_embeddings=generate_embeddings)
+    result.stage_stats = stages.stats
+    result.new_articles = stages.run(feed_id, articles)
+    result.duplicates = stages.duplicates
+    
+    # Remember validators and the newest entries only once they are stored,
+    # all at once, so a failed poll is retried in full
+    with transaction():
+        models.update_feed_http_cache(feed_id, etag, modified, status)
+        models.update_feed_high_water_mark(feed_id, newest_entry_keys(feed_data))
+        models.update_feed_content_hash(feed_id, content_hash)
+        models.update_feed_timestamp(feed_id)
+    
+    logger.info(
+        f"Added {result.new_articles} new articles from {url} "
+        f"({result.duplicates} near duplicates, "
+        f"{result.extractions_skipped} already stored, extraction skipped)"
+    )
+
+
+def _log_fetch(result: IngestResult, error: Optional[str] = None) -> None:
+    """Record a fetch in the feed fetch log; telemetry never fails a fetch."""
+    if error is not None:
+        outcome = "error"
+    elif result.not_modified:
+        outcome = "not_modified"
+    elif result.unchanged:
+        outcome = "unchanged"
+    else:
+        outcome = "new"
+    busy = {name: stage.busy_seconds for name, stage in result.stage_stats.items()}
+    
+    try:
+        models.add_feed_fetch_log(
+            result.feed_id,
+            outcome,
+            result.total_seconds,
+            http_status=result.http_status,
+            bytes_received=result.bytes_received,
+            entries_seen=result.entries_seen,
+            new_articles=result.new_articles,
+            download_seconds=result.download_seconds,
+            parse_seconds=result.parse_seconds,
+            extract_seconds=busy.get('extract', 0.0),
+            embed_seconds=busy.get('embed', 0.0),
+            store_seconds=busy.get('store', 0.0),
+            error=error
         )
-        
-        if article_id:
-            new_count += 1
-            logger.debug(f"Added article: {article_data['title']}")
-            
-            # Generate and store embedding for new article
-            if generate_embeddings:
-                try:
-                    from ..ml import generate_article_embedding, store_embedding
-                    
-                    article = {
-                        'title': article_data['title'],
-                        'summary': article_data['summary'],
-                        'full_text': full_text
-                    }
-                    
-                    embedding = generate_article_embedding(article)
-                    if embedding is not None:
-                        store_embedding(article_id, embedding)
-                        logger.debug(f"Generated embedding for article {article_id}")
-                    else:
-                        logger.warning(f"Failed to generate embedding for article {article_id}")
-                        
-                except Exception as e:
-                    logger.warning(f"Error generating embedding for article {article_id}: {e}")
-                    # Continue processing other articles
-        else:
-            logger.debug(f"Skipped duplicate article: {article_data['title']}")
-    
-    # Update feed timestamp
-    models.update_feed_timestamp(feed_id)
-    
-    logger.info(f"Added {new_count} new articles from {url}")
-    return new_count
+    except sqlite3.Error as e:
+        logger.warning(f"Could not record fetch of feed {result.feed_id}: {e}")
+
+
+def fetch_and_store_feed(
+    feed_id: int,
+    generate_embeddings: bool = True,
+    download_slot: Optional[ContextManager] = None
+) -> int:
+    """Fetch RSS feed and store articles in database.
+    
+    Args:
+        feed_id: Feed ID to fetch
+        generate_embeddings: Whether to generate ML embeddings (default True)
+        download_slot: Held while the feed itself is downloaded (see
+            ingest_feed)
+    
+    Returns:
+        Number of new articles added
+    
+    Raises:
+        FeedFetchError: If feed cannot be fetched
+    """
+    return ingest_feed(feed_id, generate_embeddings, download_slot).new_articles
@@ -0,0 +1,163 @@
+"""Lean readability-style article text extraction with lxml.
+
+Finds the element holding the article body by scoring the paragraphs
+below it, in the spirit of Arc90's Readability, and returns its text.
+Unlike newspaper3k it does no image, NLP or language processing, so it is
+much cheaper per page.
+"""
+
+import re
+from typing import Optional
+
+import lxml.html
+from lxml import etree
+
+
+# Elements that never hold article text
+REMOVE_TAGS = (
+    "script", "style", "noscript", "template", "iframe", "object", "embed",
+    "svg", "canvas", "form", "button", "input", "select", "textarea",
+    "nav", "aside", "footer", "header", "menu",
+)
+
+# class/id fragments of page chrome around the article
+NEGATIVE_PATTERN = re.compile(
+    r"comment|sidebar|footer|footnote|masthead|menu|nav|share|social|related|"
+    r"promo|sponsor|advert|\bads?\b|cookie|banner|popup|modal|subscribe|newsletter|"
+    r"breadcrumb|pagination|widget|byline|author-bio",
+    re.IGNORECASE
+)
+
+# class/id fragments of elements likely to hold the article
+POSITIVE_PATTERN = re.compile(
+    r"article|body|content|entry|main|page|post|story|text|blog",
+    re.IGNORECASE
+)
+
+# Elements whose text makes up the extracted article
+TEXT_TAGS = ("p", "h2", "h3", "h4", "li", "blockquote", "pre")
+
+# Paragraphs shorter than this (in characters) are ignored when scoring
+MIN_PARAGRAPH_LENGTH = 25
+
+# Pages yielding less text than this are treated as having no article
+MIN_ARTICLE_LENGTH = 200
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _text(element) -> str:
+    """Get an element's text with whitespace collapsed."""
+    return _WHITESPACE.sub(" ", element.text_content()).strip()
+
+
+def _class_weight(element) -> int:
+    """Score an element by its class and id attributes."""
+    weight = 0
+    for attr in ("class", "id"):
+        value = element.get(attr)
+        if not value:
+            continue
+        if NEGATIVE_PATTERN.search(value):
+            weight -= 25
+        if POSITIVE_PATTERN.search(value):
+            weight += 25
+    return weight
+
+
+def _link_density(element, text_length: int) -> float:
+    """Fraction of an element's text that sits inside links."""
+    if not text_length:
+        return 0.0
+    link_length = sum(len(_text(link)) for link in element.iter("a"))
+    return min(1.0, link_length / text_length)
+
+
+def _clean(root) -> None:
+    """Drop elements that never hold article text."""
+    etree.strip_elements(root, etree.Comment, with_tail=False)
+    for element in list(root.iter(*REMOVE_TAGS)):
+        element.drop_tree()
+    
+    for element in list(root.iter("div", "section", "ul", "ol", "table", "p")):
+        if element.getparent() is not None and _class_weight(element) < 0:
+            element.drop_tree()
+
+
+def _best_candidate(root):
+    """Find the element whose paragraphs score highest."""
+    scores: dict = {}
+    
+    for paragraph in root.iter("p", "pre", "td"):
+        text = _text(paragraph)
+        if len(text) < MIN_PARAGRAPH_LENGTH:
+            continue
+        
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        parent = paragraph.getparent()
+        grandparent = parent.getparent() if parent is not None else None
+        
+        for ancestor, share in ((parent, 1.0), (grandparent, 0.5)):
+            if ancestor is None:
+                continue
+            if ancestor not in scores:
+                base = 5 if ancestor.tag in ("div", "article", "section", "main") else 0
+                scores[ancestor] = base + _class_weight(ancestor)
+            scores[ancestor] += score * share
+    
+    best, best_score = None, 0.0
+    for element, score in scores.items():
+        score *= 1 - _link_density(element, len(_text(element)))
+        if score > best_score:
+            best, best_score = element, score
+    return best
+
+
+def _inside_text_block(element, container) -> bool:
+    """Check whether an element is nested in another text block of container."""
+    for ancestor in element.iterancestors():
+        if ancestor is container:
+            return False
+        if ancestor.tag in TEXT_TAGS:
+            return True
+    return False
+
+
+def extract_readable_text(html: str) -> Optional[str]:
+    """Extract the main article text from a web page.
+    
+    Args:
+        html: Page HTML
+    
+    Returns:
+        Article text with one paragraph per line, or None if no article
+        was found
+    """
+    if not html or not html.strip():
+        return None
+    
+    try:
+        root = lxml.html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return None
+    
+    _clean(root)
+    
+    # A single substantial <article> element is taken as is; otherwise
+    # score the page's paragraphs to find the body
+    articles = [a for a in root.iter("article") if len(_text(a)) >= MIN_ARTICLE_LENGTH]
+    candidate = articles[0] if len(articles) == 1 else _best_candidate(root)
+    if candidate is None:
+        return None
+    
+    paragraphs = []
+    for element in candidate.iter(*TEXT_TAGS):
+        # Text of nested blocks (e.g. <p> inside <li>) is taken once, at the outer block
+        if _inside_text_block(element, candidate):
+            continue
+        text = _text(element)
+        if text and _link_density(element, len(text)) < 0.5:
+            paragraphs.append(text)
+    
+    content = "\n\n".join(paragraphs)
+    return content if len(content) >= MIN_ARTICLE_LENGTH else None
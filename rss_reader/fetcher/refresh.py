@@ -0,0 +1,225 @@
+"""Concurrent refresh of all subscribed feeds."""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+
+from ..db import models
+from ..db.connection import close_connection
+from .pipeline import fetch_and_store_feed
+
+
+logger = logging.getLogger(__name__)
+
+# Default number of feeds refreshed at the same time
+DEFAULT_MAX_WORKERS = 8
+
+# Default number of simultaneous requests against a single host
+DEFAULT_PER_HOST_LIMIT = 2
+
+# Consecutive failures after which a feed's circuit breaker opens
+BREAKER_THRESHOLD = 2
+
+# Delay before retrying a feed whose breaker just opened, in seconds
+BREAKER_BASE_DELAY = 5 * 60
+
+# Longest delay between retries of a failing feed, in seconds
+BREAKER_MAX_DELAY = 24 * 60 * 60
+
+# Days the per-feed fetch log is kept (see telemetry)
+FETCH_LOG_RETENTION_DAYS = 30
+
+
+def utc_now() -> datetime:
+    """Get the current UTC time as a naive datetime, as stored in SQLite."""
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+def breaker_delay(failures: int) -> Optional[int]:
+    """Get how long a failing feed is skipped before it is retried.
+    
+    A single failure may be a blip, so the feed stays eligible. From
+    BREAKER_THRESHOLD consecutive failures on, the delay doubles with
+    every further failure up to BREAKER_MAX_DELAY.
+    
+    Args:
+        failures: Consecutive failed fetches, including the latest one
+    
+    Returns:
+        Delay in seconds, or None if the breaker stays closed
+    """
+    if failures < BREAKER_THRESHOLD:
+        return None
+    doublings = min(failures - BREAKER_THRESHOLD, 16)
+    return min(BREAKER_MAX_DELAY, BREAKER_BASE_DELAY * 2 ** doublings)
+
+
+def is_breaker_open(feed, now: datetime) -> bool:
+    """Check whether a feed is being skipped after repeated failures.
+    
+    Args:
+        feed: Feed row
+        now: Current UTC time
+    
+    Returns:
+        True if the feed must not be fetched before its retry time
+    """
+    retry_at = feed['retry_at']
+    return retry_at is not None and datetime.fromisoformat(retry_at) > now
+
+
+@dataclass
+class RefreshSummary:
+    """Outcome of refreshing a set of feeds.
+    
+    Attributes:
+        new_counts: Mapping of feed_id to number of new articles added
+        errors: Names of feeds that failed to refresh
+        failures: Mapping of failed feed_id to error message
+        skipped: Names of feeds not attempted because their breaker is open
+    """
+    new_counts: dict[int, int] = field(default_factory=dict)
+    errors: list[str] = field(default_factory=list)
+    failures: dict[int, str] = field(default_factory=dict)
+    skipped: list[str] = field(default_factory=list)
+    
+    @property
+    def total_new(self) -> int:
+        """Total number of new articles across all feeds."""
+        return sum(self.new_counts.values())
+    
+    @property
+    def total_feeds(self) -> int:
+        """Number of feeds that were attempted."""
+        return len(self.new_counts) + len(self.errors)
+
+
+class HostLimiter:
+    """Caps the number of concurrent operations against each host."""
+    
+    def __init__(self, per_host: int = DEFAULT_PER_HOST_LIMIT):
+        if per_host < 1:
+            raise ValueError(f"per_host must be at least 1, got {per_host}")
+        self.per_host = per_host
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+    
+    def semaphore_for(self, url: str) -> threading.BoundedSemaphore:
+        """Get the semaphore guarding the host of a URL.
+        
+        Args:
+            url: URL whose host should be limited
+        
+        Returns:
+            Semaphore shared by all URLs on the same host
+        """
+        host = (urlsplit(url).hostname or "").lower()
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host)
+                self._semaphores[host] = semaphore
+            return semaphore
+
+
+def _refresh_one(feed, limiter: HostLimiter, generate_embeddings: bool) -> int:
+    """Refresh a single feed, holding its host slot only for the download."""
+    try:
+        return fetch_and_store_feed(
+            feed['feed_id'],
+            generate_embeddings=generate_embeddings,
+            download_slot=limiter.semaphore_for(feed['url'])
+        )
+    finally:
+        # Worker threads are pooled; release their SQLite connection per task
+        close_connection()
+
+
+def _record_failure(feed, error: str, now: datetime) -> None:
+    """Count a failed fetch and open the feed's breaker if it keeps failing."""
+    failures = feed['consecutive_failures'] + 1
+    delay = breaker_delay(failures)
+    retry_at = now + timedelta(seconds=delay) if delay is not None else None
+    models.record_feed_failure(feed['feed_id'], error, retry_at)
+    if retry_at is not None:
+        logger.warning(f"{feed['name']} failed {failures} times in a row, retrying after {retry_at} UTC")
+
+
+def fetch_all_feeds(
+    feeds: Optional[Iterable] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+    generate_embeddings: bool = True,
+    ignore_breaker: bool = False,
+    now: Optional[datetime] = None,
+) -> RefreshSummary:
+    """Fetch and store several feeds concurrently.
+    
+    Each feed is refreshed in its own worker thread, so total wall time is
+    bounded by the slowest feed rather than the sum of all feeds. Feeds
+    that keep failing are skipped until their retry time (see
+    breaker_delay), so dead or timing-out feeds do not slow every refresh.
+    
+    Args:
+        feeds: Feed rows to refresh (defaults to all feeds)
+        max_workers: Maximum number of feeds refreshed at once
+        per_host_limit: Maximum number of feeds downloaded at once per host
+        generate_embeddings: Whether to generate ML embeddings (default True)
+        ignore_breaker: Fetch feeds even if their breaker is open
+        now: Current UTC time (defaults to the wall clock)
+    
+    Returns:
+        RefreshSummary with per-feed new article counts and failed feed names
+    """
+    if feeds is None:
+        feeds = models.get_all_feeds()
+    
+    summary = RefreshSummary()
+    now = now or utc_now()
+    eligible = []
+    for feed in feeds:
+        if not ignore_breaker and is_breaker_open(feed, now):
+            summary.skipped.append(feed['name'])
+        else:
+            eligible.append(feed)
+    feeds = eligible
+    
+    if summary.skipped:
+        logger.info(f"Skipping {len(summary.skipped)} failing feeds until their retry time")
+    if not feeds:
+        return summary
+    
+    limiter = HostLimiter(per_host_limit)
+    workers = max(1, min(max_workers, len(feeds)))
+    
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed-refresh") as executor:
+        futures = {
+            executor.submit(_refresh_one, feed, limiter, generate_embeddings): feed
+            for feed in feeds
+        }
+        
+        for future in as_completed(futures):
+            feed = futures[future]
+            try:
+                new_count = future.result()
+                summary.new_counts[feed['feed_id']] = new_count
+                logger.info(f"Updated {feed['name']}: {new_count} new articles")
+                if feed['consecutive_failures']:
+                    models.record_feed_success(feed['feed_id'])
+            except Exception as e:
+                logger.error(f"Failed to update {feed['name']}: {e}")
+                summary.errors.append(feed['name'])
+                summary.failures[feed['feed_id']] = str(e)
+                _record_failure(feed, str(e), now)
+    
+    models.prune_feed_fetch_log(now - timedelta(days=FETCH_LOG_RETENTION_DAYS))
+    
+    logger.info(
+        f"Refreshed {summary.total_feeds} feeds: {summary.total_new} new articles, "
+        f"{len(summary.errors)} failed"
+    )
+    return summary
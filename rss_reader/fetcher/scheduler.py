@@ -0,0 +1,200 @@
+"""Adaptive per-feed polling schedule."""
+
+import logging
+import statistics
+from datetime import datetime, timedelta
+from typing import Optional
+
+from ..db import models
+from .refresh import fetch_all_feeds, utc_now, RefreshSummary, DEFAULT_MAX_WORKERS
+
+
+logger = logging.getLogger(__name__)
+
+# Bounds on the time between two polls of the same feed, in seconds
+MIN_POLL_INTERVAL = 15 * 60
+MAX_POLL_INTERVAL = 24 * 60 * 60
+
+# Interval used until a feed has enough history to learn from
+DEFAULT_POLL_INTERVAL = 60 * 60
+
+# Number of recent publication dates used to learn a feed's rhythm
+HISTORY_SIZE = 20
+
+# Poll this many times per expected publication
+POLLS_PER_ARTICLE = 2
+
+# Growth factor applied when a poll finds nothing new
+QUIET_BACKOFF = 1.5
+
+# Cap on the exponent of the failure backoff
+MAX_FAILURE_DOUBLINGS = 6
+
+
+def _clamp(seconds: float) -> int:
+    """Clamp an interval to the allowed polling range."""
+    return int(min(MAX_POLL_INTERVAL, max(MIN_POLL_INTERVAL, seconds)))
+
+
+def estimate_poll_interval(published_dates: list[datetime], now: datetime) -> int:
+    """Learn a polling interval from a feed's publication history.
+    
+    The typical gap between publications is the median of the gaps between
+    consecutive articles. Feeds are polled POLLS_PER_ARTICLE times per gap;
+    feeds that have been silent for longer than usual are polled less often
+    in proportion to their silence.
+    
+    Args:
+        published_dates: Recent publication dates, in any order
+        now: Current UTC time
+    
+    Returns:
+        Polling interval in seconds
+    """
+    dates = sorted(published_dates, reverse=True)
+    if len(dates) < 2:
+        return DEFAULT_POLL_INTERVAL
+    
+    gaps = [
+        (newer - older).total_seconds()
+        for newer, older in zip(dates, dates[1:])
+        if newer > older
+    ]
+    if not gaps:
+        return DEFAULT_POLL_INTERVAL
+    
+    typical_gap = statistics.median(gaps)
+    interval = typical_gap / POLLS_PER_ARTICLE
+    
+    # A dormant feed is unlikely to wake up soon
+    silence = (now - dates[0]).total_seconds()
+    if silence > typical_gap:
+        interval = max(interval, silence / (2 * POLLS_PER_ARTICLE))
+    
+    return _clamp(interval)
+
+
+def next_poll_interval(
+    learned_interval: int,
+    previous_interval: Optional[int],
+    new_articles: int,
+    failures: int
+) -> int:
+    """Combine the learned interval with backoff for quiet or failing feeds.
+    
+    Args:
+        learned_interval: Interval learned from publication history
+        previous_interval: Interval used for the poll that just finished
+        new_articles: Number of new articles that poll found
+        failures: Consecutive failed polls (0 if the last poll succeeded)
+    
+    Returns:
+        Polling interval in seconds
+    """
+    interval = learned_interval
+    
+    if failures:
+        interval = learned_interval * 2 ** min(failures, MAX_FAILURE_DOUBLINGS)
+    elif new_articles == 0 and previous_interval:
+        interval = max(learned_interval, previous_interval * QUIET_BACKOFF)
+    
+    return _clamp(interval)
+
+
+class FeedScheduler:
+    """Polls each feed when it is due and learns when to poll it next."""
+    
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, generate_embeddings: bool = True):
+        self.max_workers = max_workers
+        self.generate_embeddings = generate_embeddings
+    
+    def run_once(self, now: Optional[datetime] = None) -> RefreshSummary:
+        """Poll every due feed once and reschedule it.
+        
+        Args:
+            now: Current UTC time (defaults to the wall clock)
+        
+        Returns:
+            RefreshSummary for the feeds that were polled
+        """
+        now = now or utc_now()
+        self._schedule_from_last_update(now)
+        
+        due = models.get_due_feeds(now)
+        if not due:
+            return RefreshSummary()
+        
+        logger.info(f"Polling {len(due)} due feeds")
+        summary = fetch_all_feeds(
+            due,
+            max_workers=self.max_workers,
+            generate_embeddings=self.generate_embeddings,
+            now=now
+        )
+        
+        for feed in due:
+            self._reschedule(feed, summary, now)
+        
+        return summary
+    
+    def _schedule_from_last_update(self, now: datetime) -> None:
+        """Give feeds polled before the scheduler existed a first poll time.
+        
+        Feeds that were refreshed manually (last_updated set) but never
+        scheduled are due one learned interval after that refresh, rather
+        than all at once on daemon start.
+        """
+        for feed in models.get_due_feeds(now):
+            if feed['next_poll_at'] is not None or feed['last_updated'] is None:
+                continue
+            
+            interval = estimate_poll_interval(
+                models.get_recent_publish_dates(feed['feed_id'], HISTORY_SIZE), now
+            )
+            last_updated = datetime.fromisoformat(feed['last_updated'])
+            models.update_feed_schedule(
+                feed['feed_id'], interval, last_updated + timedelta(seconds=interval)
+            )
+    
+    def _reschedule(self, feed, summary: RefreshSummary, now: datetime) -> None:
+        """Schedule a feed's next poll after it was polled."""
+        feed_id = feed['feed_id']
+        # Re-read the failure count and retry time recorded by this poll
+        feed = models.get_feed(feed_id)
+        
+        learned = estimate_poll_interval(
+            models.get_recent_publish_dates(feed_id, HISTORY_SIZE), now
+        )
+        interval = next_poll_interval(
+            learned,
+            feed['poll_interval'],
+            summary.new_counts.get(feed_id, 0),
+            feed['consecutive_failures']
+        )
+        
+        next_poll_at = now + timedelta(seconds=interval)
+        # Never poll before an open circuit breaker allows it
+        if feed['retry_at'] is not None:
+            next_poll_at = max(next_poll_at, datetime.fromisoformat(feed['retry_at']))
+        
+        models.update_feed_schedule(feed_id, interval, next_poll_at)
+        logger.debug(f"Next poll of {feed['name']} at {next_poll_at} UTC")
+    
+    def seconds_until_next(self, now: Optional[datetime] = None) -> Optional[float]:
+        """Get the time until the next feed is due.
+        
+        Args:
+            now: Current UTC time (defaults to the wall clock)
+        
+        Returns:
+            Seconds until the earliest scheduled poll (0 if overdue), or
+            None if there are no feeds
+        """
+        now = now or utc_now()
+        if models.get_due_feeds(now):
+            return 0.0
+        
+        next_poll = models.get_next_poll_time()
+        if next_poll is None:
+            return None
+        return max(0.0, (next_poll - now).total_seconds())
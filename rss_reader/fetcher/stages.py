@@ -0,0 +1,393 @@
+"""Staged ingestion of new articles: extract, embed, store.
+
+Network-bound extraction, CPU-bound embedding and database writes run in
+separate stages connected by bounded queues, so each stage works while the
+others wait. A full queue blocks the stage feeding it, which keeps memory
+bounded when a downstream stage falls behind.
+
+The embedding stage also fingerprints each article's text (see minhash).
+Near duplicates of stored articles are not embedded; the writer links
+them to their canonical article instead of storing their text again.
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from ..db import models
+from ..db.connection import close_connection
+from .article_extractor import extract_articles, DEFAULT_TAVILY_BATCH_SIZE
+from .minhash import MIN_SIMILARITY, band_keys, find_near_duplicate, minhash, similarity
+
+
+logger = logging.getLogger(__name__)
+
+# Number of threads extracting article text
+DEFAULT_EXTRACT_WORKERS = 4
+
+# Articles handed to one extraction call (matches the Tavily batch size)
+DEFAULT_EXTRACT_CHUNK = DEFAULT_TAVILY_BATCH_SIZE
+
+# Maximum articles encoded in one model call
+DEFAULT_EMBED_BATCH_SIZE = 32
+
+# Maximum articles written in one transaction
+DEFAULT_STORE_BATCH_SIZE = 256
+
+# Capacity of each queue between stages
+DEFAULT_QUEUE_SIZE = 64
+
+# Seconds a blocked stage waits before checking whether the pipeline was aborted
+_POLL_SECONDS = 0.1
+
+# Marks the end of a stage's input
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    """Throughput counters for one pipeline stage.
+    
+    Attributes:
+        name: Stage name
+        items: Number of articles the stage finished
+        errors: Number of failures the stage recovered from
+        busy_seconds: Time spent working, excluding waits on queues
+    """
+    name: str
+    items: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    
+    @property
+    def throughput(self) -> float:
+        """Articles processed per busy second."""
+        return self.items / self.busy_seconds if self.busy_seconds else 0.0
+
+
+class PipelineAborted(Exception):
+    """Raised when a stage stops because another stage has failed."""
+
+
+class IngestPipeline:
+    """Extracts, embeds and stores a feed's new articles in stages.
+    
+    Extraction runs on a pool of threads, each taking a chunk of articles
+    so Tavily batching and the extraction cache still apply. A single
+    embedding thread encodes whatever has queued up, up to
+    embed_batch_size articles per model call, skipping near duplicates of
+    stored articles. Articles are stored by the calling thread, so all
+    writes go through its database connection, up to store_batch_size
+    articles and their embeddings per transaction; it makes the final
+    near-duplicate decision, which also catches copies within one run.
+    """
+    
+    def __init__(
+        self,
+        generate_embeddings: bool = True,
+        extract_workers: int = DEFAULT_EXTRACT_WORKERS,
+        extract_chunk: int = DEFAULT_EXTRACT_CHUNK,
+        embed_batch_size: int = DEFAULT_EMBED_BATCH_SIZE,
+        store_batch_size: int = DEFAULT_STORE_BATCH_SIZE,
+        queue_size: int = DEFAULT_QUEUE_SIZE
+    ):
+        if extract_workers < 1:
+            raise ValueError(f"extract_workers must be at least 1, got {extract_workers}")
+        self.generate_embeddings = generate_embeddings
+        self.extract_workers = extract_workers
+        self.extract_chunk = max(1, extract_chunk)
+        self.embed_batch_size = max(1, embed_batch_size)
+        self.store_batch_size = max(1, store_batch_size)
+        self.queue_size = queue_size
+        self.stats = {
+            name: StageStats(name)
+            for name in ('extract', 'embed', 'store')
+        }
+        self.duplicates = 0
+        self._stats_lock = threading.Lock()
+        self._abort = threading.Event()
+    
+    def run(self, feed_id: int, articles: list[dict]) -> int:
+        """Process articles through all stages.
+        
+        Args:
+            feed_id: Feed the articles belong to
+            articles: Article dictionaries from parse_feed
+        
+        Returns:
+            Number of new articles stored
+        """
+        if not articles:
+            return 0
+        
+        chunks: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        extracted: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        embedded: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        
+        workers = self.extract_workers
+        stages = [(self._feed, articles, chunks, workers), (self._embed, extracted, embedded, workers)]
+        stages += [(self._extract, chunks, extracted)] * workers
+        threads = [
+            threading.Thread(target=self._run_stage, args=stage, daemon=True)
+            for stage in stages
+        ]
+        for thread in threads:
+            thread.start()
+        
+        try:
+            return self._store(feed_id, embedded)
+        except BaseException:
+            self._abort.set()
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
+            self._log_stats()
+    
+    def _run_stage(self, stage, *args) -> None:
+        """Run a stage in a worker thread, aborting the pipeline if it crashes."""
+        try:
+            stage(*args)
+        except PipelineAborted:
+            pass
+        except Exception:
+            logger.exception(f"Ingest stage {stage.__name__} failed")
+            self._abort.set()
+        finally:
+            # The extraction cache opens a connection on worker threads
+            close_connection()
+    
+    def _put(self, target: queue.Queue, item) -> None:
+        """Put an item on a queue, blocking while it is full."""
+        while True:
+            if self._abort.is_set():
+                raise PipelineAborted("Ingest pipeline aborted after a stage failed")
+            try:
+                target.put(item, timeout=_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+    
+    def _get(self, source: queue.Queue):
+        """Take an item from a queue, blocking while it is empty."""
+        while True:
+            if self._abort.is_set():
+                raise PipelineAborted("Ingest pipeline aborted after a stage failed")
+            try:
+                return source.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+    
+    def _record(self, stage: str, items: int, started: float, errors: int = 0) -> None:
+        """Add finished work to a stage's counters."""
+        with self._stats_lock:
+            stats = self.stats[stage]
+            stats.items += items
+            stats.errors += errors
+            stats.busy_seconds += time.perf_counter() - started
+    
+    def _feed(self, articles: list[dict], chunks: queue.Queue, workers: int) -> None:
+        """Split articles into extraction chunks, then tell every worker to stop."""
+        for start in range(0, len(articles), self.extract_chunk):
+            self._put(chunks, articles[start:start + self.extract_chunk])
+        for _ in range(workers):
+            self._put(chunks, _DONE)
+    
+    def _extract(self, chunks: queue.Queue, extracted: queue.Queue) -> None:
+        """Network stage: extract full text for chunks of articles."""
+        while True:
+            chunk = self._get(chunks)
+            if chunk is _DONE:
+                break
+            
+            started = time.perf_counter()
+            try:
+                full_texts = extract_articles([a['link'] for a in chunk])
+                errors = 0
+            except Exception as e:
+                # Store the articles without text rather than lose them
+                logger.warning(f"Extraction failed for {len(chunk)} articles: {e}")
+                full_texts = {}
+                errors = 1
+            self._record('extract', len(chunk), started, errors)
+            
+            for article_data in chunk:
+                self._put(extracted, (article_data, full_texts.get(article_data['link'])))
+        
+        self._put(extracted, _DONE)
+    
+    def _embed(self, extracted: queue.Queue, embedded: queue.Queue, producers: int) -> None:
+        """CPU stage: encode queued articles in batches."""
+        remaining = producers
+        while remaining:
+            batch = []
+            item = self._get(extracted)
+            # Take whatever else is already waiting, without blocking
+            while True:
+                if item is _DONE:
+                    remaining -= 1
+                else:
+                    batch.append(item)
+                if len(batch) >= self.embed_batch_size:
+                    break
+                try:
+                    item = extracted.get_nowait()
+                except queue.Empty:
+                    break
+            
+            if not batch:
+                continue
+            
+            started = time.perf_counter()
+            fingerprints = [minhash(full_text) for _, full_text in batch]
+            # Copies of already stored articles are linked, not embedded
+            known = [self._known_duplicate(fingerprint) for fingerprint in fingerprints]
+            to_embed = [item for item, duplicate in zip(batch, known) if duplicate is None]
+            embeddings, errors = self._embed_batch(to_embed)
+            self._record('embed', len(batch), started, errors)
+            
+            encoded = iter(embeddings)
+            for (article_data, full_text), fingerprint, duplicate in zip(batch, fingerprints, known):
+                embedding = next(encoded) if duplicate is None else None
+                self._put(embedded, (article_data, full_text, embedding, fingerprint))
+        
+        self._put(embedded, _DONE)
+    
+    def _known_duplicate(self, fingerprint: Optional[bytes]) -> Optional[int]:
+        """Look up a stored near duplicate, or None (also on lookup errors)."""
+        if fingerprint is None:
+            return None
+        try:
+            return find_near_duplicate(fingerprint)
+        except Exception as e:
+            logger.debug(f"Near-duplicate lookup failed: {e}")
+            return None
+    
+    def _embed_batch(self, batch: list[tuple]) -> tuple[list, int]:
+        """Encode one batch, returning embeddings (or None) and an error count."""
+        if not batch or not self.generate_embeddings:
+            return [None] * len(batch), 0
+        
+        try:
+            from ..ml import generate_article_embeddings
+            
+            embeddings = generate_article_embeddings([
+                {
+                    'title': article_data['title'],
+                    'summary': article_data['summary'],
+                    'full_text': full_text
+                }
+                for article_data, full_text in batch
+            ])
+        except Exception as e:
+            logger.warning(f"Error generating embeddings for {len(batch)} articles: {e}")
+            return [None] * len(batch), 1
+        
+        return embeddings, sum(1 for embedding in embeddings if embedding is None)
+    
+    def _store(self, feed_id: int, embedded: queue.Queue) -> int:
+        """Writer stage: store queued articles and their embeddings in batches."""
+        new_articles = 0
+        done = False
+        
+        while not done:
+            batch = []
+            item = self._get(embedded)
+            # Take whatever else is already waiting, without blocking
+            while True:
+                if item is _DONE:
+                    done = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.store_batch_size:
+                    break
+                try:
+                    item = embedded.get_nowait()
+                except queue.Empty:
+                    break
+            
+            if batch:
+                new_articles += self._store_batch(feed_id, batch)
+        
+        return new_articles
+    
+    def _store_batch(self, feed_id: int, batch: list[tuple]) -> int:
+        """Decide which articles are near duplicates and write them together."""
+        started = time.perf_counter()
+        new_articles = errors = 0
+        rows = []
+        # Signatures of canonical articles in rows, not yet visible to lookups
+        pending = []
+        
+        for article_data, full_text, embedding, fingerprint in batch:
+            if fingerprint is not None and any(
+                similarity(fingerprint, signature) >= MIN_SIMILARITY for signature in pending
+            ):
+                # A copy of an article in this batch: write that one first to link to it
+                stored, failed = self._write(feed_id, rows)
+                new_articles, errors = new_articles + stored, errors + failed
+                rows, pending = [], []
+            
+            duplicate_of = find_near_duplicate(fingerprint) if fingerprint is not None else None
+            # Only canonical articles are indexed; duplicates read their canonical's text
+            canonical = duplicate_of is None
+            if canonical and fingerprint is not None:
+                pending.append(fingerprint)
+            rows.append({
+                'title': article_data['title'],
+                'link': article_data['link'],
+                'canonical_link': article_data.get('canonical_link'),
+                'summary': article_data['summary'],
+                'full_text': full_text if canonical else None,
+                'published_date': article_data['published_date'],
+                'minhash': fingerprint,
+                'minhash_bands': band_keys(fingerprint) if fingerprint is not None and canonical else None,
+                'duplicate_of': duplicate_of,
+                'embedding': embedding if canonical else None,
+            })
+        
+        stored, failed = self._write(feed_id, rows)
+        self._record('store', len(batch), started, errors + failed)
+        return new_articles + stored
+    
+    def _write(self, feed_id: int, rows: list[dict]) -> tuple[int, int]:
+        """Store articles in one transaction, returning stored and failed counts."""
+        if not rows:
+            return 0, 0
+        
+        errors = 0
+        for row in rows:
+            if row['embedding'] is None:
+                continue
+            try:
+                from ..ml.vector_store import serialize_embedding
+                
+                row['embedding'] = serialize_embedding(row['embedding'])
+            except Exception as e:
+                logger.warning(f"Error storing embedding for article {row['link']}: {e}")
+                row['embedding'] = None
+                errors += 1
+        
+        article_ids = models.add_articles(feed_id, rows)
+        
+        for article_id, row in zip(article_ids, rows):
+            if not article_id:
+                logger.debug(f"Skipped duplicate article: {row['title']}")
+            elif row['duplicate_of'] is not None:
+                self.duplicates += 1
+                logger.debug(f"Article {article_id} is a near duplicate of article {row['duplicate_of']}")
+            elif row['embedding'] is None and self.generate_embeddings:
+                logger.warning(f"Failed to generate embedding for article {article_id}")
+        
+        return sum(1 for article_id in article_ids if article_id), errors
+    
+    def _log_stats(self) -> None:
+        """Log per-stage throughput."""
+        for stats in self.stats.values():
+            logger.debug(
+                f"Stage {stats.name}: {stats.items} articles in {stats.busy_seconds:.2f}s "
+                f"({stats.throughput:.1f}/s, {stats.errors} errors)"
+            )
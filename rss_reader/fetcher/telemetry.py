@@ -0,0 +1,132 @@
+"""Reports over the per-feed fetch log.
+
+ingest_feed records one row per feed per refresh with the time spent
+downloading, parsing, extracting, embedding and storing, plus byte and
+article counts. This module summarises those rows per feed, so the feeds
+that make refreshes slow or expensive can be found.
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from ..db import models
+from .refresh import utc_now
+
+
+# Steps whose mean time is reported, as named in the fetch log
+STEPS = ("download", "parse", "extract", "embed", "store")
+
+# Orderings offered by feed_report: "slowest" by p90 refresh time,
+# "costliest" by total time spent, "largest" by bytes downloaded
+SORT_KEYS = {
+    "slowest": lambda report: report.p90,
+    "costliest": lambda report: report.total_seconds,
+    "largest": lambda report: report.bytes_received,
+}
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Get a percentile of some values, interpolating between ranks.
+    
+    Args:
+        values: Sample values (need not be sorted)
+        fraction: Percentile as a fraction between 0 and 1
+    
+    Returns:
+        The percentile, or 0.0 for no values
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * fraction
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+@dataclass
+class FeedReport:
+    """Fetch statistics of one feed over a time window.
+    
+    Attributes:
+        feed_id: Feed ID
+        name: Feed name
+        fetches: Number of recorded refreshes
+        errors: Refreshes that failed
+        p50: Median refresh time in seconds
+        p90: 90th percentile refresh time in seconds
+        p99: 99th percentile refresh time in seconds
+        total_seconds: Time spent on all refreshes
+        step_seconds: Mean time per refresh of each step in STEPS
+        bytes_received: Feed bytes downloaded
+        entries_seen: Entries parsed
+        new_articles: New articles stored
+    """
+    feed_id: int
+    name: str
+    fetches: int
+    errors: int
+    p50: float
+    p90: float
+    p99: float
+    total_seconds: float
+    step_seconds: dict[str, float]
+    bytes_received: int
+    entries_seen: int
+    new_articles: int
+
+
+def feed_report(
+    days: float = 7,
+    sort: str = "slowest",
+    limit: Optional[int] = None,
+    now: Optional[datetime] = None
+) -> list[FeedReport]:
+    """Summarise the fetch log per feed.
+    
+    Args:
+        days: Length of the window, ending now
+        sort: One of SORT_KEYS
+        limit: Maximum number of feeds to return (default all)
+        now: Current UTC time (defaults to the wall clock)
+    
+    Returns:
+        Reports of the feeds fetched in the window, worst first
+    
+    Raises:
+        ValueError: If sort is not one of SORT_KEYS
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort {sort!r}, expected one of {', '.join(SORT_KEYS)}")
+    
+    since = (now or utc_now()) - timedelta(days=days)
+    rows_by_feed: dict[int, list] = {}
+    for row in models.get_feed_fetch_log(since):
+        rows_by_feed.setdefault(row['feed_id'], []).append(row)
+    
+    reports = []
+    for feed_id, rows in rows_by_feed.items():
+        totals = [row['total_seconds'] for row in rows]
+        reports.append(FeedReport(
+            feed_id=feed_id,
+            name=rows[0]['feed_name'],
+            fetches=len(rows),
+            errors=sum(1 for row in rows if row['outcome'] == "error"),
+            p50=percentile(totals, 0.5),
+            p90=percentile(totals, 0.9),
+            p99=percentile(totals, 0.99),
+            total_seconds=sum(totals),
+            step_seconds={
+                step: sum(row[f"{step}_seconds"] for row in rows) / len(rows)
+                for step in STEPS
+            },
+            bytes_received=sum(row['bytes_received'] for row in rows),
+            entries_seen=sum(row['entries_seen'] for row in rows),
+            new_articles=sum(row['new_articles'] for row in rows),
+        ))
+    
+    reports.sort(key=SORT_KEYS[sort], reverse=True)
+    return reports[:limit] if limit is not None else reports
+
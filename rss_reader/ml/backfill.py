@@ -0,0 +1,66 @@
+"""Backfill embeddings for articles stored without one."""
+
+import logging
+
+from ..db import get_connection, transaction
+from ..db.bodies import body_column
+from .embeddings import generate_article_embeddings
+from .vector_store import store_embedding
+
+logger = logging.getLogger(__name__)
+
+# Articles encoded in one model call and stored in one transaction
+BACKFILL_BATCH_SIZE = 32
+
+
+def backfill_embeddings() -> tuple[int, int]:
+    """Generate embeddings for articles that don't have them.
+    
+    Returns:
+        Tuple of (embeddings generated, articles missing an embedding)
+    """
+    conn = get_connection()
+    
+    # Find articles without embeddings (near duplicates are never embedded)
+    cursor = conn.execute(f"""
+        SELECT
+            a.article_id, a.title,
+            {body_column('body', 'summary')}, {body_column('body', 'full_text')}
+        FROM articles a
+        LEFT JOIN article_bodies body ON body.article_id = a.article_id
+        LEFT JOIN embeddings e ON a.article_id = e.article_id
+        WHERE e.article_id IS NULL AND a.duplicate_of IS NULL
+    """)
+    
+    articles = cursor.fetchall()
+    
+    if not articles:
+        logger.info("All articles already have embeddings")
+        return 0, 0
+    
+    logger.info(f"Generating embeddings for {len(articles)} articles...")
+    
+    success_count = 0
+    for start in range(0, len(articles), BACKFILL_BATCH_SIZE):
+        batch = articles[start:start + BACKFILL_BATCH_SIZE]
+        embeddings = generate_article_embeddings([
+            {'title': row[1], 'summary': row[2], 'full_text': row[3]}
+            for row in batch
+        ])
+        
+        # Encode outside the transaction so the write lock is held only to store
+        with transaction():
+            for row, embedding in zip(batch, embeddings):
+                article_id = row[0]
+                if embedding is None:
+                    logger.warning(f"  Failed to generate embedding for article {article_id}")
+                    continue
+                try:
+                    store_embedding(article_id, embedding)
+                    success_count += 1
+                except Exception as e:
+                    logger.error(f"  Error processing article {article_id}: {e}")
+        logger.info(f"  Progress: {success_count}/{len(articles)}")
+    
+    logger.info(f"✓ Successfully generated {success_count}/{len(articles)} embeddings")
+    return success_count, len(articles)
@@ -5,7 +5,7 @@ import numpy as np
 from typing import Optional, List
 from sklearn.cluster import KMeans
 
-from ..db import get_liked_articles
+from ..db import get_liked_canonical_ids
 from .vector_store import get_embeddings_for_articles
 
 logger = logging.getLogger(__name__)
@@ -21,19 +21,18 @@ def get_taste_centroids(user_id: int = 1, n_clusters: int = 5) -> Optional[np.nd
     Returns:
         Array of shape (k, 384) with taste centroids, or None if insufficient data
     """
-    # Get liked articles
-    liked_articles = get_liked_articles(user_id)
+    # Liked near duplicates have no embedding; use their canonical article's
+    article_ids = get_liked_canonical_ids(user_id)
     
-    if not liked_articles:
+    if not article_ids:
         logger.info("No liked articles found")
         return None
     
-    if len(liked_articles) < 2:
-        logger.info(f"Only {len(liked_articles)} liked article(s), need at least 2 for clustering")
+    if len(article_ids) < 2:
+        logger.info(f"Only {len(article_ids)} liked article(s), need at least 2 for clustering")
         return None
     
     # Get embeddings for liked articles
-    article_ids = [a['article_id'] for a in liked_articles]
     embeddings_dict = get_embeddings_for_articles(article_ids)
     
     if not embeddings_dict:
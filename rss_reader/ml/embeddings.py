@@ -1,6 +1,7 @@
 """Embedding generation using sentence-transformers."""
 
 import logging
+import threading
 import numpy as np
 from typing import Optional
 
@@ -8,6 +9,7 @@ logger = logging.getLogger(__name__)
 
 # Global model cache
 _model = None
+_model_lock = threading.Lock()
 
 
 def get_model():
@@ -21,7 +23,13 @@ def get_model():
     """
     global _model
     
-    if _model is None:
+    if _model is not None:
+        return _model
+    
+    # Feeds may be refreshed from several threads; load the model only once
+    with _model_lock:
+        if _model is not None:
+            return _model
         try:
             from sentence_transformers import SentenceTransformer
             logger.info("Loading sentence-transformers model: all-MiniLM-L6-v2")
@@ -112,3 +120,38 @@ def generate_article_embedding(article: dict) -> Optional[np.ndarray]:
     """
     text = prepare_article_text(article)
     return generate_embedding(text)
+
+
+def generate_article_embeddings(articles: list[dict]) -> list[Optional[np.ndarray]]:
+    """Generate embeddings for several articles in one model call.
+    
+    Encoding a batch is much cheaper per article than encoding articles
+    one at a time.
+    
+    Args:
+        articles: Article dictionaries
+        
+    Returns:
+        One 384-dimensional embedding per article, or None for articles
+        without text or if generation fails
+    """
+    texts = [prepare_article_text(article) for article in articles]
+    indexes = [i for i, text in enumerate(texts) if text.strip()]
+    embeddings: list[Optional[np.ndarray]] = [None] * len(articles)
+    if not indexes:
+        return embeddings
+    
+    try:
+        model = get_model()
+        encoded = model.encode([texts[i] for i in indexes], convert_to_numpy=True)
+    except Exception as e:
+        logger.error(f"Error generating embeddings: {e}")
+        return embeddings
+    
+    for i, embedding in zip(indexes, encoded):
+        if embedding.shape != (384,):
+            logger.error(f"Unexpected embedding shape: {embedding.shape}")
+            continue
+        embeddings[i] = embedding
+    
+    return embeddings
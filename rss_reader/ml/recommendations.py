@@ -4,7 +4,8 @@ import logging
 import numpy as np
 from typing import List, Dict, Optional
 
-from ..db import get_liked_articles, get_connection
+from ..db import get_liked_canonical_ids, get_connection
+from ..db.bodies import body_column
 from .clustering import get_taste_centroids
 from .vector_store import search_similar, cosine_similarity
 
@@ -21,9 +22,9 @@ def get_recommendations(user_id: int = 1, limit: int = 50) -> List[Dict]:
     Returns:
         List of article dictionaries with similarity scores
     """
-    # Get liked articles to exclude from recommendations
-    liked_articles = get_liked_articles(user_id)
-    liked_ids = {a['article_id'] for a in liked_articles}
+    # Get liked articles to exclude from recommendations (a liked near
+    # duplicate excludes its canonical article, which holds the embedding)
+    liked_ids = set(get_liked_canonical_ids(user_id))
     
     # Check minimum liked articles
     if len(liked_ids) < 5:
@@ -74,9 +75,12 @@ def get_recommendations(user_id: int = 1, limit: int = 50) -> List[Dict]:
     placeholders = ",".join("?" * len(top_article_ids))
     cursor = conn.execute(
         f"""
-        SELECT a.article_id, a.title, a.link, a.summary, a.published_date, f.name as feed_name
+        SELECT
+            a.article_id, a.title, a.link, {body_column('body', 'summary')},
+            a.published_date, f.name as feed_name
         FROM articles a
         JOIN feeds f ON a.feed_id = f.feed_id
+        LEFT JOIN article_bodies body ON body.article_id = a.article_id
         WHERE a.article_id IN ({placeholders})
         """,
         top_article_ids
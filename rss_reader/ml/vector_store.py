@@ -5,32 +5,43 @@ import numpy as np
 import sqlite3
 from typing import Optional, List, Tuple
 
-from ..db import get_connection
+from ..db import get_connection, transaction
 
 logger = logging.getLogger(__name__)
 
 
-def store_embedding(article_id: int, embedding: np.ndarray) -> None:
-    """Store embedding for an article.
+def serialize_embedding(embedding: np.ndarray) -> bytes:
+    """Serialize an embedding for the embeddings table.
     
     Args:
-        article_id: Article ID
         embedding: 384-dimensional numpy array
+        
+    Returns:
+        Raw bytes of the array
+        
+    Raises:
+        ValueError: If the embedding does not have 384 dimensions
     """
     if embedding.shape != (384,):
         raise ValueError(f"Expected embedding shape (384,), got {embedding.shape}")
+    return embedding.tobytes()
+
+
+def store_embedding(article_id: int, embedding: np.ndarray) -> None:
+    """Store embedding for an article.
     
-    conn = get_connection()
-    
-    # Serialize embedding as bytes
-    embedding_bytes = embedding.tobytes()
+    Args:
+        article_id: Article ID
+        embedding: 384-dimensional numpy array
+    """
+    embedding_bytes = serialize_embedding(embedding)
     
     try:
-        conn.execute(
-            "INSERT OR REPLACE INTO embeddings (article_id, embedding) VALUES (?, ?)",
-            (article_id, embedding_bytes)
-        )
-        conn.commit()
+        with transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO embeddings (article_id, embedding) VALUES (?, ?)",
+                (article_id, embedding_bytes)
+            )
         logger.debug(f"Stored embedding for article {article_id}")
     except sqlite3.Error as e:
         logger.error(f"Error storing embedding for article {article_id}: {e}")
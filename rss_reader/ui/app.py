@@ -7,8 +7,8 @@ from textual.widgets import Header, Footer
 from textual.binding import Binding
 from textual.worker import Worker, WorkerState
 
-from ..db import add_feed, delete_feed, like_article, unlike_article, get_liked_articles, get_all_feeds
-from ..fetcher import fetch_and_store_feed, FeedFetchError
+from ..db import add_feed, delete_feed, mark_article_read, like_article, unlike_article, is_article_liked, get_all_feeds
+from ..fetcher import fetch_all_feeds
 from .widgets import FeedList, ArticleList, ArticleReader, AddFeedDialog, ConfirmDeleteDialog
 
 
@@ -181,7 +181,9 @@ class RSSReaderApp(App):
     def on_article_list_article_selected(self, message: ArticleList.ArticleSelected) -> None:
         """Handle article selection."""
         reader = self.query_one("#article-reader", ArticleReader)
-        reader.load_article(message.article_id, message.article)
+        reader.load_article(message.article_id)
+        mark_article_read(message.article_id)
+        self.query_one("#feed-list", FeedList).refresh_counts()
     
     def action_move_down(self) -> None:
         """Move selection down (vim j key)."""
@@ -256,8 +258,7 @@ class RSSReaderApp(App):
             return
         
         # Check if already liked
-        liked_articles = get_liked_articles()
-        is_liked = any(a['article_id'] == reader.current_article_id for a in liked_articles)
+        is_liked = is_article_liked(reader.current_article_id)
         
         try:
             if is_liked:
@@ -271,6 +272,7 @@ class RSSReaderApp(App):
             reader.refresh_article()
             article_list = self.query_one("#article-list", ArticleList)
             article_list.refresh_articles()
+            self.query_one("#feed-list", FeedList).refresh_counts()
         except Exception as e:
             self.notify(f"Error toggling like: {e}", severity="error", timeout=10)
     
@@ -289,25 +291,14 @@ class RSSReaderApp(App):
     
     def _update_feeds_worker(self, feeds: list) -> None:
         """Worker to update feeds in background thread."""
-        total_new = 0
-        errors = []
-        
-        for feed in feeds:
-            try:
-                new_count = fetch_and_store_feed(feed['feed_id'])
-                total_new += new_count
-                logger.info(f"Updated {feed['name']}: {new_count} new articles")
-            except FeedFetchError as e:
-                logger.error(f"Failed to update {feed['name']}: {e}")
-                errors.append(feed['name'])
-            except Exception as e:
-                logger.error(f"Unexpected error updating {feed['name']}: {e}")
-                errors.append(feed['name'])
+        summary = fetch_all_feeds(feeds)
         
         # Refresh UI on main thread
-        self.call_from_thread(self._after_update, total_new, len(feeds), errors)
+        self.call_from_thread(
+            self._after_update, summary.total_new, summary.total_feeds, summary.errors, summary.skipped
+        )
     
-    def _after_update(self, total_new: int, total_feeds: int, errors: list) -> None:
+    def _after_update(self, total_new: int, total_feeds: int, errors: list, skipped: list) -> None:
         """Called after update completes to refresh UI."""
         # Refresh all widgets
         feed_list = self.query_one("#feed-list", FeedList)
@@ -317,15 +308,17 @@ class RSSReaderApp(App):
         article_list.refresh_articles()
         
         # Show notification
+        # Feeds skipped after repeated failures are marked ⚠ in the feed list
+        waiting = f" {len(skipped)} failing feeds skipped." if skipped else ""
         if errors:
             self.notify(
                 f"Updated {total_feeds - len(errors)}/{total_feeds} feeds. "
-                f"Added {total_new} articles. {len(errors)} failed.",
+                f"Added {total_new} articles. {len(errors)} failed.{waiting}",
                 severity="warning",
                 timeout=8
             )
         else:
-            self.notify(f"Updated {total_feeds} feeds. Added {total_new} new articles.", timeout=5)
+            self.notify(f"Updated {total_feeds} feeds. Added {total_new} new articles.{waiting}", timeout=5)
     
     def action_recommendations(self) -> None:
         """Show recommendations (placeholder for Phase 3)."""
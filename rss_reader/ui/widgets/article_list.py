@@ -5,12 +5,25 @@ from textual.widgets import Static, ListView, ListItem, Label
 from textual.message import Message
 from textual.reactive import reactive
 
-from ...db import get_articles_by_feed, get_all_articles_sorted, get_liked_articles
-from ...ml import get_recommendations
+from ...db import get_articles_page, get_liked_article_list
+
+
+# Articles loaded per page of the All Articles and feed views
+PAGE_SIZE = 50
+
+# Load the next page when the highlight or scroll position gets this close
+# to the end of the loaded articles
+PREFETCH_ROWS = 10
 
 
 class ArticleList(Static):
-    """Widget displaying articles from selected feed."""
+    """Widget displaying articles from selected feed.
+    
+    All Articles and single feeds are loaded a page at a time; further
+    pages are appended as the user moves or scrolls towards the end.
+    Items hold only what the list shows; the reader loads the article
+    text when one is opened.
+    """
     
     class ArticleSelected(Message):
         """Message sent when an article is selected."""
@@ -23,23 +36,47 @@ class ArticleList(Static):
     current_feed_id: reactive[int | None] = reactive(None)
     selected_article_id: reactive[int | None] = reactive(None)
     
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # Token for the next page of the current view, None when all are loaded
+        self._next_cursor: str | None = None
+    
     def compose(self) -> ComposeResult:
         """Create child widgets."""
         yield Label("📰 Articles", id="article-header")
         yield ListView(id="article-listview")
     
-    def load_articles(self, feed_id: int) -> None:
-        """Load articles from database for given feed."""
+    def on_mount(self) -> None:
+        """Page in more articles when the list is scrolled near its end."""
+        listview = self.query_one("#article-listview", ListView)
+        self.watch(listview, "scroll_y", lambda _: self._load_more_if_near_end(), init=False)
+    
+    def _page_feed_id(self) -> int | None:
+        """Feed filter of the paged view (None for All Articles)."""
+        return None if self.current_feed_id == 0 else self.current_feed_id
+    
+    def load_articles(self, feed_id: int, until: str | None = None) -> None:
+        """Load articles from database for given feed.
+        
+        Args:
+            feed_id: Feed to show (0 for All Articles, -1 for Recommended,
+                -2 for Liked)
+            until: Page token of a paged view; every article up to that
+                page is loaded instead of the first page
+        """
         self.current_feed_id = feed_id
+        self._next_cursor = None
         listview = self.query_one("#article-listview", ListView)
         listview.clear()
         
-        # Check if this is "All Articles" (feed_id == 0)
-        if feed_id == 0:
-            articles = get_all_articles_sorted(limit=100)
+        # Check if this is "All Articles" (feed_id == 0) or a single feed
+        if feed_id >= 0:
+            articles, self._next_cursor = get_articles_page(
+                self._page_feed_id(), page_size=PAGE_SIZE, until=until
+            )
         elif feed_id == -1:
             # Recommended feed
-            liked_count = len(get_liked_articles())
+            liked_count = len(get_liked_article_list())
             if liked_count < 5:
                 listview.append(ListItem(Label(
                     f"[dim]Like at least 5 articles to see recommendations (you have {liked_count})[/dim]\n\n"
@@ -48,6 +85,9 @@ class ArticleList(Static):
                 return
             
             try:
+                # Imported here so numpy/scikit-learn load only when needed
+                from ...ml import get_recommendations
+                
                 articles = get_recommendations(limit=50)
                 if not articles:
                     listview.append(ListItem(Label(
@@ -63,34 +103,31 @@ class ArticleList(Static):
                 return
         elif feed_id == -2:
             # Liked feed
-            liked_articles = get_liked_articles()
-            if not liked_articles:
+            articles = get_liked_article_list()
+            if not articles:
                 listview.append(ListItem(Label(
                     "[dim]No liked articles yet[/dim]\n\n"
                     "[dim]Press 'l' while reading articles to save them here.[/dim]\n"
                     "[dim]Liked articles are used for personalized recommendations.[/dim]"
                 )))
                 return
-            
-            # Sort by most recently liked (newest first)
-            # Note: get_liked_articles() should already return liked_date
-            articles = sorted(liked_articles, 
-                             key=lambda x: x.get('liked_date', ''), 
-                             reverse=True)
-        else:
-            articles = get_articles_by_feed(feed_id, limit=100)
         
         if not articles:
             listview.append(ListItem(Label("[dim]No articles yet. Press 'u' to fetch.[/dim]")))
             return
         
-        # Get liked articles for this user
-        liked_articles = get_liked_articles()
-        liked_ids = {a['article_id'] for a in liked_articles}
+        self._append_articles(articles)
+    
+    def _append_articles(self, articles: list) -> None:
+        """Add list items for articles of the current view."""
+        listview = self.query_one("#article-listview", ListView)
+        feed_id = self.current_feed_id
         
-        for article in articles:
-            # Format article info
-            heart = "♥ " if article['article_id'] in liked_ids else ""
+        for row in articles:
+            article = dict(row)
+            
+            # Format article info (recommendations never include liked articles)
+            heart = "♥ " if article.get('liked') else ""
             date_str = ""
             if article['published_date']:
                 date_str = f" [dim]{article['published_date'][:10]}[/dim]"
@@ -110,9 +147,31 @@ class ArticleList(Static):
             label = Label(f"{heart}{title}{date_str}{score_str}")
             item = ListItem(label)
             item.article_id = article['article_id']
-            item.article_data = dict(article)
+            item.article_data = article
             listview.append(item)
     
+    def _load_more_if_near_end(self) -> None:
+        """Append the next page once the user is close to the last loaded article."""
+        if self._next_cursor is None:
+            return
+        listview = self.query_one("#article-listview", ListView)
+        near_end_of_items = (listview.index or 0) >= len(listview) - PREFETCH_ROWS
+        near_end_of_scroll = listview.max_scroll_y - listview.scroll_y <= PREFETCH_ROWS
+        if not (near_end_of_items or near_end_of_scroll):
+            return
+        self._load_next_page()
+    
+    def _load_next_page(self) -> None:
+        """Append the page following the loaded articles."""
+        articles, self._next_cursor = get_articles_page(
+            self._page_feed_id(), cursor=self._next_cursor, page_size=PAGE_SIZE
+        )
+        self._append_articles(articles)
+    
+    def on_list_view_highlighted(self, event: ListView.Highlighted) -> None:
+        """Page in more articles as the highlight moves towards the end."""
+        self._load_more_if_near_end()
+    
     def on_list_view_selected(self, event: ListView.Selected) -> None:
         """Handle article selection."""
         if hasattr(event.item, 'article_id'):
@@ -120,6 +179,33 @@ class ArticleList(Static):
             self.post_message(self.ArticleSelected(event.item.article_id, event.item.article_data))
     
     def refresh_articles(self) -> None:
-        """Reload articles for current feed."""
-        if self.current_feed_id is not None:
-            self.load_articles(self.current_feed_id)
+        """Reload articles for current feed, keeping the loaded pages and position.
+        
+        Every page loaded so far is reloaded in one query, and the
+        highlighted article stays highlighted even if new articles arrived
+        above it.
+        """
+        if self.current_feed_id is None:
+            return
+        listview = self.query_one("#article-listview", ListView)
+        highlighted = getattr(listview.highlighted_child, 'article_id', None)
+        index, scroll_y = listview.index, listview.scroll_y
+        loaded = len(listview)
+        
+        self.load_articles(self.current_feed_id, until=self._next_cursor)
+        # A view paged to its end has no token to reload up to
+        while self._next_cursor is not None and len(listview) < loaded:
+            self._load_next_page()
+        
+        article_ids = [getattr(item, 'article_id', None) for item in listview.children]
+        if highlighted in article_ids:
+            # Keep the highlighted article where it was on screen
+            scroll_y += article_ids.index(highlighted) - index
+            index = article_ids.index(highlighted)
+        
+        def restore() -> None:
+            if index is not None and index < len(listview):
+                listview.index = index
+            listview.scroll_to(y=scroll_y, animate=False)
+        
+        self.call_after_refresh(restore)
@@ -5,7 +5,7 @@ from textual.widgets import Static, Label
 from textual.containers import VerticalScroll
 from textual.reactive import reactive
 
-from ...db import get_liked_articles
+from ...db import get_article, is_article_liked
 
 
 class ArticleReader(Static):
@@ -42,14 +42,25 @@ class ArticleReader(Static):
             id="reader-container"
         )
     
-    def load_article(self, article_id: int, article: dict) -> None:
-        """Load and display article content."""
+    def load_article(self, article_id: int) -> None:
+        """Load and display article content.
+        
+        Only the opened article's text is read; list views carry no text.
+        """
+        reader_content = self.query_one("#reader-content", Static)
+        row = get_article(article_id)
+        if row is None:
+            self.current_article_id = None
+            self.current_article = None
+            reader_content.update("[dim]This article is no longer available[/dim]")
+            return
+        
+        article = dict(row)
         self.current_article_id = article_id
         self.current_article = article
         
         # Check if article is liked
-        liked_articles = get_liked_articles()
-        is_liked = any(a['article_id'] == article_id for a in liked_articles)
+        is_liked = is_article_liked(article_id)
         
         # Format article content
         heart = "♥ Liked" if is_liked else ""
@@ -69,10 +80,9 @@ class ArticleReader(Static):
 """
         
         # Update reader content
-        reader_content = self.query_one("#reader-content", Static)
         reader_content.update(content)
     
     def refresh_article(self) -> None:
         """Reload current article (to update liked status)."""
-        if self.current_article_id and self.current_article:
-            self.load_article(self.current_article_id, self.current_article)
+        if self.current_article_id:
+            self.load_article(self.current_article_id)
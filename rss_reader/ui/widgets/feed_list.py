@@ -7,8 +7,7 @@ from textual.containers import VerticalScroll, Vertical
 from textual.message import Message
 from textual.reactive import reactive
 
-from ...db import get_all_feeds, get_articles_by_feed, get_all_articles_sorted, get_liked_articles
-from ...ml import get_recommendations
+from ...db import get_all_feeds, get_feed_counts
 
 
 logger = logging.getLogger(__name__)
@@ -30,20 +29,30 @@ class FeedItem(Static):
     }
     """
     
-    def __init__(self, feed_id: int, feed_name: str, article_count: int, is_all_articles: bool = False, is_recommended: bool = False, is_liked: bool = False):
+    def __init__(self, feed_id: int, feed_name: str, article_count: int, unread_count: int = 0, is_all_articles: bool = False, is_recommended: bool = False, is_liked: bool = False, failures: int = 0, last_error: str | None = None):
         super().__init__()
         self.feed_id = feed_id
         self.feed_name = feed_name
         self.article_count = article_count
+        self.unread_count = unread_count
         self.is_all_articles = is_all_articles
         self.is_recommended = is_recommended
         self.is_liked = is_liked
+        self.failures = failures
+        if failures and last_error:
+            self.tooltip = f"Failed {failures} times in a row: {last_error}"
+    
+    def _counts(self) -> str:
+        """Article count, preceded by the unread count if any are unread."""
+        if self.unread_count:
+            return f"{self.unread_count}/{self.article_count}"
+        return str(self.article_count)
     
     def render(self) -> str:
         """Render the feed item."""
         if self.is_all_articles:
             # Bold/highlighted for "All Articles"
-            return f"[bold]📰 {self.feed_name}[/bold] [dim]({self.article_count})[/dim]"
+            return f"[bold]📰 {self.feed_name}[/bold] [dim]({self._counts()})[/dim]"
         if self.is_recommended:
             # Bold/highlighted for "Recommended"
             if self.article_count == 0:
@@ -52,7 +61,10 @@ class FeedItem(Static):
         if self.is_liked:
             # Bold/highlighted for "Liked"
             return f"[bold]♥ {self.feed_name}[/bold] [dim]({self.article_count})[/dim]"
-        return f"{self.feed_name} [dim]({self.article_count})[/dim]"
+        if self.failures:
+            # Feed keeps failing to fetch; see tooltip for the last error
+            return f"[yellow]⚠[/yellow] {self.feed_name} [dim]({self._counts()}, {self.failures} failed)[/dim]"
+        return f"{self.feed_name} [dim]({self._counts()})[/dim]"
     
     async def on_click(self) -> None:
         """Handle click on feed item."""
@@ -105,27 +117,27 @@ class FeedList(Vertical):
             feeds = get_all_feeds()
             logger.info(f"load_feeds: Got {len(feeds)} feeds from database")
             
-            # Calculate total article count across all feeds
-            total_count = 0
-            feed_counts = {}
-            
-            for feed in feeds:
-                articles = get_articles_by_feed(feed['feed_id'], limit=1000)
-                count = len(articles)
-                feed_counts[feed['feed_id']] = count
-                total_count += count
+            # Total, unread and liked counts of every feed in one query
+            feed_counts = get_feed_counts()
+            total_count = sum(counts['total'] for counts in feed_counts.values())
+            unread_count = sum(counts['unread'] for counts in feed_counts.values())
             
             # Add "All Articles" as first item
             items = []
-            all_articles_item = FeedItem(0, "All Articles", total_count, is_all_articles=True)
+            all_articles_item = FeedItem(
+                0, "All Articles", total_count, unread_count=unread_count, is_all_articles=True
+            )
             items.append(all_articles_item)
             
             logger.info(f"load_feeds: Added 'All Articles' with {total_count} total articles")
             
             # Add "Recommended" feed
-            liked_count = len(get_liked_articles())
+            liked_count = sum(counts['liked'] for counts in feed_counts.values())
             if liked_count >= 5:
                 try:
+                    # Imported here so numpy/scikit-learn load only when needed
+                    from ...ml import get_recommendations
+                    
                     recommendations = get_recommendations(limit=50)
                     rec_count = len(recommendations)
                 except Exception as e:
@@ -154,9 +166,12 @@ class FeedList(Vertical):
             
             # Mount each feed item
             for feed in feeds:
-                count = feed_counts[feed['feed_id']]
-                logger.info(f"load_feeds: Creating FeedItem for {feed['name']} with {count} articles")
-                item = FeedItem(feed['feed_id'], feed['name'], count)
+                counts = feed_counts.get(feed['feed_id'], {'total': 0, 'unread': 0})
+                logger.info(f"load_feeds: Creating FeedItem for {feed['name']} with {counts['total']} articles")
+                item = FeedItem(
+                    feed['feed_id'], feed['name'], counts['total'], unread_count=counts['unread'],
+                    failures=feed['consecutive_failures'], last_error=feed['last_error']
+                )
                 items.append(item)
             
             # Mount all items at once
@@ -169,3 +184,22 @@ class FeedList(Vertical):
     def refresh_feeds(self) -> None:
         """Reload feeds from database."""
         self.load_feeds()
+    
+    def refresh_counts(self) -> None:
+        """Update the shown article counts after articles are read or liked.
+        
+        Unlike refresh_feeds the items are kept, and recommendations are
+        not recomputed.
+        """
+        feed_counts = get_feed_counts()
+        for item in self.query(FeedItem):
+            if item.is_all_articles:
+                item.article_count = sum(counts['total'] for counts in feed_counts.values())
+                item.unread_count = sum(counts['unread'] for counts in feed_counts.values())
+            elif item.is_liked:
+                item.article_count = sum(counts['liked'] for counts in feed_counts.values())
+            elif not item.is_recommended:
+                counts = feed_counts.get(item.feed_id, {'total': 0, 'unread': 0})
+                item.article_count = counts['total']
+                item.unread_count = counts['unread']
+            item.refresh()
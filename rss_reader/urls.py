@@ -0,0 +1,130 @@
+"""URL normalization used to recognise the same article under different URLs."""
+
+from dataclasses import dataclass
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+# Query parameters that only carry tracking information
+TRACKING_PARAMS = frozenset({
+    "fbclid",
+    "gclid",
+    "mc_cid",
+    "mc_eid",
+    "ref",
+    "ref_src",
+})
+
+# Query parameter prefixes that only carry tracking information
+TRACKING_PREFIXES = ("utm_",)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+@dataclass(frozen=True)
+class UrlNormalizer:
+    """Configurable mapping of URLs to a lookup key.
+    
+    The scheme and host are always lowercased and default ports,
+    fragments and tracking query parameters dropped; the remaining
+    parameters are sorted.
+    
+    Attributes:
+        tracking_params: Query parameters to drop
+        tracking_prefixes: Prefixes of query parameters to drop
+        fold_scheme: Treat http and https URLs as the same (keys use https)
+        strip_trailing_slash: Treat /story/ and /story as the same
+        strip_www: Treat www.example.com and example.com as the same
+    """
+    tracking_params: frozenset[str] = TRACKING_PARAMS
+    tracking_prefixes: tuple[str, ...] = TRACKING_PREFIXES
+    fold_scheme: bool = False
+    strip_trailing_slash: bool = False
+    strip_www: bool = False
+    
+    def _is_tracking_param(self, name: str) -> bool:
+        """Check whether a query parameter only carries tracking information."""
+        name = name.lower()
+        return name in self.tracking_params or name.startswith(self.tracking_prefixes)
+    
+    def __call__(self, url: str) -> str:
+        """Normalize a URL.
+        
+        Args:
+            url: URL to normalize
+        
+        Returns:
+            Normalized URL
+        """
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").lower()
+        
+        if self.strip_www and host.startswith("www."):
+            host = host[4:]
+        if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+            host = f"{host}:{parts.port}"
+        if self.fold_scheme and scheme == "http":
+            scheme = "https"
+        
+        path = parts.path or "/"
+        if self.strip_trailing_slash and len(path) > 1:
+            path = path.rstrip("/") or "/"
+        
+        query = sorted(
+            (name, value)
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not self._is_tracking_param(name)
+        )
+        
+        return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+# Keys of the extraction cache
+_CACHE_NORMALIZER = UrlNormalizer()
+
+# Canonical links of stored articles, used to recognise an article that is
+# already stored under another variant of its URL
+DEFAULT_LINK_NORMALIZER = UrlNormalizer(fold_scheme=True, strip_trailing_slash=True)
+
+_link_normalizer = DEFAULT_LINK_NORMALIZER
+
+
+def normalize_url(url: str) -> str:
+    """Normalize an article URL for use as a lookup key.
+    
+    Lowercases the scheme and host, drops default ports, fragments and
+    tracking query parameters, and sorts the remaining parameters.
+    
+    Args:
+        url: Article URL
+    
+    Returns:
+        Normalized URL
+    """
+    return _CACHE_NORMALIZER(url)
+
+
+def canonical_link(url: str) -> str:
+    """Get the canonical form of an article link.
+    
+    Args:
+        url: Article URL as listed in the feed
+    
+    Returns:
+        Link normalized by the configured link normalizer
+    """
+    return _link_normalizer(url)
+
+
+def set_link_normalizer(normalizer: UrlNormalizer) -> None:
+    """Choose how article links are canonicalized.
+    
+    Only links stored from now on use the new normalizer; articles that
+    are already stored keep their canonical link.
+    
+    Args:
+        normalizer: Normalizer for article links
+    """
+    global _link_normalizer
+    
+    _link_normalizer = normalizer
@@ -0,0 +1,31 @@
+"""Shared pytest configuration."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from rss_reader.db import connection
+from rss_reader.fetcher import backends
+
+
+@pytest.fixture(autouse=True)
+def isolated_database():
+    """Give every test a fresh in-memory database unless it sets its own.
+    
+    Extraction goes through the SQLite-backed extraction cache, so tests
+    that do not request a database fixture must not share cached text or
+    create a database file in the working directory.
+    """
+    connection.close_connection()
+    connection.set_database_path(":memory:")
+    yield
+    connection.close_connection()
+
+
+@pytest.fixture
+def mock_article_class():
+    """Replace newspaper3k's Article class in the backend registry with a mock."""
+    article_class = Mock()
+    backends.registry.register("newspaper", lambda: article_class)
+    yield article_class
+    backends.registry.register("newspaper", backends.load_newspaper_article)
@@ -0,0 +1,22 @@
+"""Parse functions run inside ParsePool worker processes during tests.
+
+They live in their own module so spawned workers can import them cheaply.
+"""
+
+import os
+import time
+
+
+def fake_parse(url, html):
+    """Parse a fake page whose HTML says how the parse should behave."""
+    if html == "hang":
+        time.sleep(60)
+    if html == "slow":
+        time.sleep(2)
+    if html == "crash":
+        os._exit(1)
+    if html == "error":
+        raise ValueError("malformed page")
+    if html == "pid":
+        return str(os.getpid())
+    return html.upper()
@@ -0,0 +1,160 @@
+"""Tests for the headless command-line interface."""
+
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from rss_reader import cli
+from rss_reader.db import connection, models
+from rss_reader.fetcher import RefreshSummary
+from rss_reader.fetcher.opml import ImportResult
+
+
+@pytest.fixture
+def db():
+    """Create in-memory database for testing."""
+    connection.set_database_path(":memory:")
+    conn = connection.get_connection()
+    yield conn
+    connection.close_connection()
+
+
+class TestCli:
+    """Test rss-reader-cli subcommands."""
+    
+    def test_fetch_all_feeds(self, db, capsys):
+        """Test fetch refreshes every feed and prints a summary."""
+        feed_id = models.add_feed("https://example.com/feed", "Feed")
+        summary = RefreshSummary(new_counts={feed_id: 3})
+        
+        with patch('rss_reader.fetcher.refresh.fetch_all_feeds', return_value=summary) as mock_fetch:
+            exit_code = cli.main(["fetch", "--max-workers", "4", "--no-embeddings"])
+        
+        assert exit_code == 0
+        assert "added 3 new articles" in capsys.readouterr().out
+        feeds = mock_fetch.call_args.args[0]
+        assert [feed['feed_id'] for feed in feeds] == [feed_id]
+        assert mock_fetch.call_args.kwargs['max_workers'] == 4
+        assert mock_fetch.call_args.kwargs['generate_embeddings'] is False
+    
+    def test_fetch_unknown_feed(self, db, capsys):
+        """Test fetch rejects unknown feed ids."""
+        assert cli.main(["fetch", "--feed", "42"]) == 2
+        assert "Unknown feed id(s): 42" in capsys.readouterr().err
+    
+    def test_fetch_fails_only_when_every_feed_fails(self, db, capsys):
+        """Test the exit code signals a completely failed run."""
+        models.add_feed("https://example.com/feed", "Feed")
+        summary = RefreshSummary(errors=["Feed"], failures={1: "HTTP 500"})
+        
+        with patch('rss_reader.fetcher.refresh.fetch_all_feeds', return_value=summary):
+            assert cli.main(["fetch"]) == 1
+    
+    def test_stats(self, db, capsys):
+        """Test stats prints table counts."""
+        feed_id = models.add_feed("https://example.com/feed", "Feed")
+        models.add_article(feed_id, "Article", "https://example.com/1", full_text="Text")
+        
+        assert cli.main(["stats"]) == 0
+        
+        out = capsys.readouterr().out
+        assert "Feeds:              1" in out
+        assert "with full text:   1" in out
+    
+    def test_compact_trains_dictionary(self, db, capsys):
+        """Test compact recompresses articles against a trained dictionary."""
+        feed_id = models.add_feed("https://example.com/feed", "Feed")
+        for i in range(3):
+            models.add_article(
+                feed_id, f"Article {i}", f"https://example.com/{i}",
+                full_text=f"Story {i}. Read more from Feed, your daily source of news."
+            )
+        
+        assert cli.main(["compact", "--train-dictionary"]) == 0
+        
+        out = capsys.readouterr().out
+        assert "recompressed 3 articles" in out
+        assert models.get_article(1)['full_text'] == "Story 0. Read more from Feed, your daily source of news."
+    
+    def test_report(self, db, capsys):
+        """Test report lists feeds from the fetch log."""
+        feed_id = models.add_feed("https://example.com/feed", "Slow Feed")
+        models.add_feed_fetch_log(feed_id, "new", 4.0, bytes_received=2048, new_articles=3)
+        
+        assert cli.main(["report", "--sort", "costliest"]) == 0
+        
+        out = capsys.readouterr().out
+        assert "Slow Feed" in out
+        assert "4.00" in out
+    
+    def test_report_without_fetches(self, db, capsys):
+        """Test report says when nothing was recorded."""
+        assert cli.main(["report", "--days", "1"]) == 0
+        assert "No fetches recorded in the last 1 days." in capsys.readouterr().out
+    
+    def test_recommend(self, db, capsys):
+        """Test recommend prints scored articles."""
+        recommendations = [{
+            'article_id': 1,
+            'title': "Great Article",
+            'link': "https://example.com/1",
+            'feed_name': "Feed",
+            'similarity_score': 0.87,
+        }]
+        
+        with patch('rss_reader.ml.get_recommendations', return_value=recommendations):
+            assert cli.main(["recommend", "--limit", "5"]) == 0
+        
+        assert "0.87  [Feed] Great Article" in capsys.readouterr().out
+    
+    def test_import_opml(self, db, capsys, tmp_path):
+        """Test import-opml reports added and invalid feeds."""
+        path = tmp_path / "feeds.opml"
+        path.write_text("<opml/>")
+        result = ImportResult(
+            added={"https://example.com/feed": 1},
+            invalid={"https://example.com/gone": "HTTP 404"}
+        )
+        
+        with patch('rss_reader.fetcher.opml.import_opml', return_value=result) as mock_import:
+            assert cli.main(["import-opml", str(path), "--no-validate"]) == 0
+        
+        captured = capsys.readouterr()
+        assert "Added 1 feeds, 0 already subscribed, 1 invalid." in captured.out
+        assert "invalid: https://example.com/gone (HTTP 404)" in captured.err
+        assert mock_import.call_args.kwargs['validate'] is False
+    
+    def test_import_opml_missing_file(self, db, capsys, tmp_path):
+        """Test import-opml fails cleanly on an unreadable file."""
+        assert cli.main(["import-opml", str(tmp_path / "missing.opml")]) == 2
+        assert "Cannot import" in capsys.readouterr().err
+    
+    def test_export_opml(self, db, capsys, tmp_path):
+        """Test export-opml writes every feed."""
+        models.add_feed("https://example.com/feed", "Feed")
+        path = tmp_path / "out.opml"
+        
+        assert cli.main(["export-opml", str(path)]) == 0
+        
+        assert "Exported 1 feeds" in capsys.readouterr().out
+        assert 'xmlUrl="https://example.com/feed"' in path.read_text()
+    
+    def test_fetch_does_not_import_heavy_dependencies(self, tmp_path):
+        """Test the fetch path loads no UI or ML stack."""
+        code = (
+            "import sys\n"
+            "from rss_reader import cli\n"
+            f"cli.main(['--db', {str(tmp_path / 'cli.db')!r}, 'fetch'])\n"
+            "heavy = ('textual', 'torch', 'sentence_transformers', 'sklearn', 'numpy', 'newspaper')\n"
+            "print('loaded:' + ','.join(m for m in heavy if m in sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent.parent
+        )
+        
+        assert result.stdout.strip().splitlines()[-1] == "loaded:"
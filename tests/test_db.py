@@ -2,9 +2,10 @@
 
 import pytest
 import sqlite3
+import threading
 from datetime import datetime
 
-from rss_reader.db import connection, models, schema
+from rss_reader.db import bodies, connection, links, models, schema
 
 
 @pytest.fixture
@@ -35,6 +36,19 @@ class TestFeeds:
         with pytest.raises(sqlite3.IntegrityError):
             models.add_feed("https://example.com/feed", "Duplicate Feed")
     
+    def test_add_feeds_skips_subscribed(self, db):
+        """Test batch insert adds new feeds and skips known URLs."""
+        models.add_feed("https://example.com/feed1", "Feed 1")
+        
+        added = models.add_feeds([
+            ("https://example.com/feed1", "Again"),
+            ("https://example.com/feed2", "Feed 2"),
+        ])
+        
+        assert list(added) == ["https://example.com/feed2"]
+        assert models.get_feed(added["https://example.com/feed2"])['name'] == "Feed 2"
+        assert len(models.get_all_feeds()) == 2
+    
     def test_get_all_feeds(self, db):
         """Test getting all feeds."""
         models.add_feed("https://example.com/feed1", "Feed 1")
@@ -53,6 +67,202 @@ class TestFeeds:
         assert feed is None
 
 
+class TestSchema:
+    """Test schema creation and upgrades."""
+    
+    def test_upgrade_adds_missing_columns(self, tmp_path):
+        """Test databases from an older schema gain new columns."""
+        db_path = tmp_path / "old.db"
+        old = sqlite3.connect(db_path)
+        old.execute(
+            """
+            CREATE TABLE feeds (
+                feed_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL UNIQUE,
+                name TEXT NOT NULL,
+                last_updated TIMESTAMP,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        old.execute("INSERT INTO feeds (url, name) VALUES ('https://example.com/feed', 'Old')")
+        old.commit()
+        old.close()
+        
+        conn = schema.initialize_database(db_path)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(feeds)")}
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        conn.close()
+        
+        assert {"etag", "modified", "last_status"} <= columns
+        assert version == schema.SCHEMA_VERSION
+    
+    def test_upgrade_adds_article_columns_and_indexes(self, tmp_path):
+        """Test indexes on added article columns are created after the columns."""
+        db_path = tmp_path / "old.db"
+        old = sqlite3.connect(db_path)
+        old.execute(
+            """
+            CREATE TABLE articles (
+                article_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                feed_id INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                link TEXT NOT NULL UNIQUE,
+                summary TEXT,
+                full_text TEXT,
+                published_date TIMESTAMP,
+                fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        old.commit()
+        old.close()
+        
+        conn = schema.initialize_database(db_path)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(articles)")}
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(articles)")}
+        conn.close()
+        
+        assert {"minhash", "duplicate_of", "canonical_link", "read_at"} <= columns
+        assert {"idx_articles_duplicate_of", "idx_articles_canonical_link", "idx_articles_feed_read"} <= indexes
+    
+    def test_upgrade_moves_inline_bodies(self, tmp_path, monkeypatch):
+        """Test bodies stored in the articles table move to article_bodies in batches."""
+        db_path = tmp_path / "old.db"
+        old = sqlite3.connect(db_path)
+        old.executescript(
+            """
+            CREATE TABLE feeds (
+                feed_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL UNIQUE,
+                name TEXT NOT NULL
+            );
+            CREATE TABLE articles (
+                article_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                feed_id INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                link TEXT NOT NULL UNIQUE,
+                summary TEXT,
+                full_text TEXT,
+                published_date TIMESTAMP,
+                fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            INSERT INTO feeds (url, name) VALUES ('https://example.com/feed', 'Old');
+            """
+        )
+        old.executemany(
+            "INSERT INTO articles (feed_id, title, link, summary, full_text) VALUES (1, ?, ?, ?, ?)",
+            [(f"Article {i}", f"https://example.com/{i}", f"Summary {i}", "Text " * i or None) for i in range(7)]
+        )
+        old.commit()
+        old.close()
+        
+        moved = []
+        monkeypatch.setattr(
+            schema, "migrate_inline_bodies",
+            lambda conn: moved.append(bodies.migrate_inline_bodies(conn, batch_size=3))
+        )
+        connection.set_database_path(db_path)
+        try:
+            conn = connection.get_connection()
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(articles)")}
+            article = models.get_article(4)
+            empty = models.get_article(1)
+        finally:
+            connection.close_connection()
+        
+        assert moved == [7]
+        assert not {"summary", "full_text"} & columns
+        assert (article['summary'], article['full_text']) == ("Summary 3", "Text " * 3)
+        assert (empty['summary'], empty['full_text']) == ("Summary 0", None)
+    
+    def test_upgrade_folds_duplicate_links(self, tmp_path):
+        """Test articles without a canonical link are folded once on upgrade."""
+        db_path = tmp_path / "old.db"
+        connection.set_database_path(db_path)
+        try:
+            feed_id = models.add_feed("https://example.com/feed", "Example Feed")
+            kept = models.add_article(feed_id, "Story", "https://example.com/story?utm_source=a")
+            copy = models.add_article(feed_id, "Story", "http://example.com/story/",
+                                      canonical_link="https://example.com/copy")
+            models.like_article(copy)
+            conn = connection.get_connection()
+            conn.execute("UPDATE articles SET canonical_link = NULL")
+            conn.execute("PRAGMA user_version = 12")
+            conn.commit()
+        finally:
+            connection.close_connection()
+        
+        conn = schema.initialize_database(db_path)
+        rows = conn.execute("SELECT article_id, canonical_link FROM articles").fetchall()
+        likes = conn.execute("SELECT article_id FROM user_likes").fetchall()
+        conn.close()
+        
+        assert rows == [(kept, "https://example.com/story")]
+        assert likes == [(kept,)]
+    
+    def test_upgrade_drops_uncompressed_cache_entries(self, tmp_path):
+        """Test extraction cache entries stored as plain text are dropped on upgrade."""
+        db_path = tmp_path / "old.db"
+        conn = schema.initialize_database(db_path)
+        conn.execute(
+            "INSERT INTO extraction_cache (url_key, extractor, size, created_at, last_access, content) "
+            "VALUES ('https://example.com/a', 'newspaper', 4, 0, 0, 'text')"
+        )
+        conn.execute("PRAGMA user_version = 13")
+        conn.commit()
+        conn.close()
+        
+        conn = schema.initialize_database(db_path)
+        entries = conn.execute("SELECT COUNT(*) FROM extraction_cache").fetchone()[0]
+        conn.close()
+        
+        assert entries == 0
+    
+    def test_current_schema_is_not_upgraded_again(self, tmp_path, monkeypatch):
+        """Test opening a database at SCHEMA_VERSION skips the upgrade steps."""
+        db_path = tmp_path / "current.db"
+        schema.initialize_database(db_path).close()
+        
+        upgrades = []
+        monkeypatch.setattr(schema, "add_missing_columns", upgrades.append)
+        monkeypatch.setattr(schema, "migrate_inline_bodies", upgrades.append)
+        schema.initialize_database(db_path).close()
+        
+        assert upgrades == []
+    
+    def test_update_feed_http_cache(self, db):
+        """Test storing HTTP cache validators for a feed."""
+        feed_id = models.add_feed("https://example.com/feed", "Example Feed")
+        
+        models.update_feed_http_cache(feed_id, '"abc"', "Mon, 01 Jan 2024 00:00:00 GMT", 200)
+        
+        feed = models.get_feed(feed_id)
+        assert feed['etag'] == '"abc"'
+        assert feed['modified'] == "Mon, 01 Jan 2024 00:00:00 GMT"
+        assert feed['last_status'] == 200
+    
+    def test_record_feed_failure_and_success(self, db):
+        """Test failures are counted until a fetch succeeds."""
+        feed_id = models.add_feed("https://example.com/feed", "Example Feed")
+        retry_at = datetime(2024, 6, 1, 12, 5, 0)
+        
+        models.record_feed_failure(feed_id, "HTTP 503", None)
+        models.record_feed_failure(feed_id, "timed out", retry_at)
+        
+        feed = models.get_feed(feed_id)
+        assert feed['consecutive_failures'] == 2
+        assert feed['last_error'] == "timed out"
+        assert feed['retry_at'] == str(retry_at)
+        
+        models.record_feed_success(feed_id)
+        
+        feed = models.get_feed(feed_id)
+        assert feed['consecutive_failures'] == 0
+        assert feed['last_error'] is None
+        assert feed['retry_at'] is None
+
+
 class TestArticles:
     """Test article operations."""
     
@@ -106,6 +316,123 @@ class TestArticles:
         articles = models.get_articles_by_feed(feed_id)
         assert len(articles) == 2
     
+    def test_get_existing_links(self, db):
+        """Test finding already stored links in one query."""
+        feed_id = models.add_feed("https://example.com/feed", "Example Feed")
+        models.add_article(feed_id, "Article 1", "https://example.com/1")
+        models.add_article(feed_id, "Article 2", "https://example.com/2")
+        
+        existing = models.get_existing_links([
+            "https://example.com/1",
+            "https://example.com/3",
+            "https://example.com/2",
+        ])
+        
+        assert existing == {"https://example.com/1", "https://example.com/2"}
+        assert models.get_existing_links([]) == set()
+    
+    def test_add_articles(self, db):
+        """Test a batch is stored with its embeddings and band keys, skipping duplicates."""
+        feed_id = models.add_feed("https://example.com/feed", "Example Feed")
+        models.add_article(feed_id, "Old", "https://example.com/old")
+        
+        article_ids = models.add_articles(feed_id, [
+            {'title': "A", 'link': "https://example.com/a", 'embedding': b"\x00" * 8,
+             'minhash': b"sig", 'minhash_bands': [11, 12]},
+            {'title': "Old", 'link': "https://example.com/old"},
+            {'title': "A again", 'link': "https://example.com/a?utm_source=rss",
+             'canonical_link': "https://example.com/a"},
+        ])
+        
+        assert article_ids[0] is not None
+        assert article_ids[1:] == [None, None]
+        assert db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] == 1
+        assert [tuple(row) for row in models.get_minhash_candidates([11])] == [(article_ids[0], b"sig")]
+    
+    def test_canonical_link_is_unique(self, db):
+        """Test an article is rejected when its canonical link is stored."""
+        feed_id = models.add_feed("https://example.com/feed", "Example Feed")
+        models.add_article(feed_id, "Article", "https://example.com/1?utm_source=rss",
+                           canonical_link="https://example.com/1")
+        
+        assert models.add_article(feed_id, "Article", "http://example.com/1",
+                                  canonical_link="https://example.com/1") is None
+        assert models.get_existing_canonical_links([
+            "https://example.com/1",
+            "https://example.com/2",
+        ]) == {"https://example.com/1"}
+    
+    def test_delete_feed_promotes_near_duplicate(self, db):
+        """Test a near duplicate in another feed takes over its deleted canonical article."""
+        feed1 = models.add_feed("https://one.example.com/feed", "Feed 1")
+        feed2 = models.add_feed("https://two.example.com/feed", "Feed 2")
+        canonical, = models.add_articles(feed1, [
+            {'title': "Storm", 'link': "https://one.example.com/storm", 'full_text': "Text",
+             'minhash': b"sig", 'minhash_bands': [11, 12], 'embedding': b"\x00" * 8},
+        ])
+        first = models.add_article(feed2, "Storm", "https://two.example.com/storm",
+                                   summary="Summary", duplicate_of=canonical)
+        second = models.add_article(feed2, "Storm", "https://two.example.com/storm-2",
+                                    duplicate_of=canonical)
+        
+        models.delete_feed(feed1)
+        
+        promoted = models.get_article(first)
+        assert promoted['duplicate_of'] is None
+        assert (promoted['summary'], promoted['full_text']) == ("Summary", "Text")
+        assert models.get_article(second)['duplicate_of'] == first
+        assert models.get_article(second)['full_text'] == "Text"
+        assert [row[0] for row in db.execute("SELECT article_id FROM embeddings")] == [first]
+        assert [row[0] for row in models.get_minhash_candidates([11])] == [first]
+    
+    def test_delete_feed_waits_for_concurrent_writer(self, tmp_path):
+        """Test deleting a feed waits for another connection's commit instead of failing."""
+        connection.set_database_path(tmp_path / "rss.db")
+        feed_id = models.add_feed("https://example.com/feed", "Example Feed")
+        other = sqlite3.connect(tmp_path / "rss.db", isolation_level=None, check_same_thread=False)
+        other.execute("BEGIN IMMEDIATE")
+        other.execute("INSERT INTO feeds (url, name) VALUES ('https://other.example.com', 'Other')")
+        committer = threading.Timer(0.2, other.commit)
+        committer.start()
+        try:
+            models.delete_feed(feed_id)
+        finally:
+            committer.join()
+            other.close()
+            connection.close_connection()
+        
+        connection.set_database_path(tmp_path / "rss.db")
+        assert [feed['name'] for feed in models.get_all_feeds()] == ["Other"]
+        connection.close_connection()
+    
+    def test_links_are_canonicalized_on_insert(self, db):
+        """Test links stored without a canonical link are normalized."""
+        feed_id = models.add_feed("https://example.com/feed", "Example Feed")
+        article_id = models.add_article(feed_id, "Article", "http://Example.com/1/?utm_source=rss")
+        
+        assert models.add_article(feed_id, "Article", "https://example.com/1") is None
+        assert models.get_existing_canonical_links(["https://example.com/1"]) == {"https://example.com/1"}
+        assert models.get_article(article_id)['link'] == "http://Example.com/1/?utm_source=rss"
+    
+    def test_fold_duplicate_links(self, db):
+        """Test articles without a canonical link are merged into the first copy."""
+        feed_id = models.add_feed("https://example.com/feed", "Example Feed")
+        kept = models.add_article(feed_id, "Article", "https://example.com/1")
+        copy = models.add_article(feed_id, "Article", "https://example.com/1/", full_text="Text",
+                                  canonical_link="https://example.com/copy")
+        other = models.add_article(feed_id, "Other", "https://example.com/2")
+        models.like_article(copy)
+        db.execute("UPDATE articles SET canonical_link = NULL WHERE article_id != ?", (kept,))
+        db.commit()
+        
+        assert links.fold_duplicate_links(db, lambda link: link.rstrip("/")) == 1
+        assert links.fold_duplicate_links(db, lambda link: link.rstrip("/")) == 0
+        
+        assert models.get_article(copy) is None
+        assert models.get_article(kept)['full_text'] == "Text"
+        assert models.get_article(other) is not None
+        assert [row['article_id'] for row in models.get_liked_articles()] == [kept]
+    
     def test_cascade_delete(self, db):
         """Test articles are deleted when feed is deleted."""
         feed_id = models.add_feed("https://example.com/feed", "Example Feed")
@@ -184,6 +511,86 @@ class TestArticles:
         assert articles[1]['feed_name'] == "B Feed"
         assert articles[1]['title'] == "A Article"  # A before Z in B Feed
         assert articles[2]['title'] == "Z Article"
+    
+    
+    def test_get_articles_page_walks_every_article(self, db):
+        """Test pages follow each other without gaps, undated articles last."""
+        feed_id = models.add_feed("https://example.com/feed", "Test Feed")
+        other_id = models.add_feed("https://example.com/other", "Other Feed")
+        same_date = datetime(2024, 1, 1)
+        for i in range(7):
+            models.add_article(feed_id, f"Dated {i}", f"https://example.com/{i}", published_date=same_date)
+        for i in range(3):
+            models.add_article(feed_id, f"Undated {i}", f"https://example.com/u{i}")
+        models.add_article(other_id, "Newest", "https://example.com/new", published_date=datetime(2024, 2, 1))
+        
+        titles, cursor, pages = [], None, 0
+        while True:
+            rows, cursor = models.get_articles_page(feed_id, cursor=cursor, page_size=4)
+            titles += [row['title'] for row in rows]
+            pages += 1
+            if cursor is None:
+                break
+        
+        assert pages == 3
+        assert titles == [f"Dated {i}" for i in range(6, -1, -1)] + [f"Undated {i}" for i in (2, 1, 0)]
+        first, _ = models.get_articles_page(page_size=1)
+        assert first[0]['title'] == "Newest"
+        assert first[0]['feed_name'] == "Other Feed"
+    
+    def test_get_articles_page_until_reloads_loaded_pages(self, db):
+        """Test until returns every article up to a page's end, including new ones."""
+        feed_id = models.add_feed("https://example.com/feed", "Test Feed")
+        for i in range(5):
+            models.add_article(feed_id, f"Dated {i}", f"https://example.com/{i}",
+                               published_date=datetime(2024, 1, i + 1))
+        for i in range(3):
+            models.add_article(feed_id, f"Undated {i}", f"https://example.com/u{i}")
+        first, cursor = models.get_articles_page(feed_id, page_size=3)
+        second, undated_cursor = models.get_articles_page(feed_id, cursor=cursor, page_size=3)
+        models.add_article(feed_id, "Newest", "https://example.com/new", published_date=datetime(2024, 2, 1))
+        
+        rows, next_cursor = models.get_articles_page(feed_id, until=cursor)
+        assert [row['title'] for row in rows] == ["Newest"] + [row['title'] for row in first]
+        assert next_cursor == cursor
+        
+        rows, _ = models.get_articles_page(feed_id, until=undated_cursor)
+        assert [row['title'] for row in rows] == ["Newest"] + [row['title'] for row in first + second]
+    
+    def test_get_articles_page_lists_without_text(self, db):
+        """Test list pages carry no article text and flag liked articles."""
+        feed_id = models.add_feed("https://example.com/feed", "Test Feed")
+        liked = models.add_article(
+            feed_id, "Liked", "https://example.com/1", summary="Summary", full_text="Body " * 1000
+        )
+        models.add_article(feed_id, "Other", "https://example.com/2")
+        models.like_article(liked)
+        
+        rows, _ = models.get_articles_page(feed_id)
+        
+        assert set(rows[0].keys()) == {
+            'article_id', 'feed_id', 'title', 'published_date', 'feed_name', 'liked'
+        }
+        assert {row['title']: row['liked'] for row in rows} == {"Liked": 1, "Other": 0}
+        assert models.get_article(liked)['full_text'] == "Body " * 1000
+    
+    def test_get_articles_page_uses_index(self, db):
+        """Test deep pages seek through the composite index instead of scanning."""
+        cursor = models._encode_cursor({'published_date': "2024-01-01 00:00:00", 'article_id': 5})
+        captured = []
+        db.set_trace_callback(captured.append)
+        models.get_articles_page(1, cursor=cursor)
+        db.set_trace_callback(None)
+        
+        plan = " ".join(
+            row[3] for row in db.execute(f"EXPLAIN QUERY PLAN {captured[0]}")
+        )
+        assert "SEARCH a USING INDEX idx_articles_feed_page (feed_id=? AND published_date<?)" in plan
+    
+    def test_get_articles_page_rejects_invalid_cursor(self, db):
+        """Test a token not made by get_articles_page is refused."""
+        with pytest.raises(ValueError):
+            models.get_articles_page(cursor="not a cursor")
 
 
 class TestUserLikes:
@@ -221,3 +628,149 @@ class TestUserLikes:
         
         liked = models.get_liked_articles()
         assert len(liked) == 0
+    
+    def test_get_liked_article_list(self, db):
+        """Test the liked list has list columns and only the user's likes."""
+        feed_id = models.add_feed("https://example.com/feed", "Example Feed")
+        mine = models.add_article(feed_id, "Mine", "https://example.com/1", full_text="Body")
+        theirs = models.add_article(feed_id, "Theirs", "https://example.com/2")
+        
+        models.like_article(mine)
+        models.like_article(theirs, user_id=2)
+        
+        liked = models.get_liked_article_list()
+        assert [(row['article_id'], row['liked'], row['feed_name']) for row in liked] == [
+            (mine, 1, "Example Feed")
+        ]
+        assert 'full_text' not in liked[0].keys()
+        assert models.is_article_liked(mine)
+        assert not models.is_article_liked(theirs)
+    
+    def test_get_feed_counts(self, db):
+        """Test total, unread and liked counts are returned for every feed."""
+        busy = models.add_feed("https://example.com/feed", "Busy Feed")
+        empty = models.add_feed("https://example.org/feed", "Empty Feed")
+        article_ids = [
+            models.add_article(busy, f"Article {i}", f"https://example.com/{i}")
+            for i in range(3)
+        ]
+        
+        models.mark_article_read(article_ids[0])
+        models.mark_article_read(article_ids[0])
+        models.like_article(article_ids[1])
+        models.like_article(article_ids[1], user_id=2)
+        
+        assert models.get_feed_counts() == {
+            busy: {'total': 3, 'unread': 2, 'liked': 1},
+            empty: {'total': 0, 'unread': 0, 'liked': 0},
+        }
+
+
+class TestArticleBodies:
+    """Test compressed storage of article summaries and text."""
+    
+    def test_bodies_are_stored_compressed(self, db):
+        """Test bodies are compressed on write and read back as text."""
+        feed_id = models.add_feed("https://example.com/feed", "Example Feed")
+        text = "All work and no play makes a dull feed. " * 200
+        article_id = models.add_article(feed_id, "Article", "https://example.com/1", full_text=text)
+        
+        stored = db.execute(
+            "SELECT full_text FROM article_bodies WHERE article_id = ?", (article_id,)
+        ).fetchone()[0]
+        
+        assert len(stored) < len(text) / 10
+        assert bodies.decompress_body(stored) == text
+        assert models.get_article(article_id)['full_text'] == text
+    
+    def test_train_dictionary_keeps_shared_text(self):
+        """Test text recurring across samples makes up the dictionary."""
+        footer = "The post appeared first on Example News, read more stories there."
+        samples = [f"Story number {i} is unlike any other story {i * 7}. {footer}" for i in range(20)]
+        
+        dictionary = bodies.train_dictionary(samples)
+        
+        assert footer.encode() in dictionary
+        assert b"number 3 " not in dictionary
+        compressed = bodies.compress_body(samples[0], dictionary)
+        assert len(compressed) < len(bodies.compress_body(samples[0]))
+        assert bodies.decompress_body(compressed, dictionary) == samples[0]
+    
+    def test_recompress_with_dictionary(self, db):
+        """Test bodies are recompressed against a newly stored dictionary."""
+        feed_id = models.add_feed("https://example.com/feed", "Example Feed")
+        footer = "Subscribe to the Example News newsletter for the day's top stories."
+        for i in range(5):
+            models.add_article(
+                feed_id, f"Article {i}", f"https://example.com/{i}",
+                summary=f"Summary {i}. {footer}", full_text=f"Text {i}. {footer}"
+            )
+        before = [dict(row) for row in models.get_articles_by_feed(feed_id)]
+        
+        dictionary_id = models.add_compression_dictionary(
+            bodies.train_dictionary(models.get_body_samples())
+        )
+        
+        assert models.recompress_article_bodies(batch_size=2) == 5
+        assert models.recompress_article_bodies() == 0
+        assert {row[0] for row in db.execute("SELECT dictionary_id FROM article_bodies")} == {dictionary_id}
+        assert [dict(row) for row in models.get_articles_by_feed(feed_id)] == before
+    
+    def test_fold_keeps_text_of_duplicate(self, db):
+        """Test a folded article's text moves to the kept article if it has none."""
+        feed_id = models.add_feed("https://example.com/feed", "Example Feed")
+        kept = models.add_article(feed_id, "Article", "https://example.com/a", summary="Summary")
+        duplicate = models.add_article(feed_id, "Article", "https://example.com/a/", full_text="Text",
+                                       canonical_link="https://example.com/copy")
+        db.execute("UPDATE articles SET canonical_link = NULL")
+        db.commit()
+        
+        assert links.fold_duplicate_links(db, lambda link: link.rstrip("/")) == 1
+        
+        assert models.get_article(duplicate) is None
+        assert models.get_article(kept)['full_text'] == "Text"
+        assert db.execute("SELECT COUNT(*) FROM article_bodies").fetchone()[0] == 1
+
+
+class TestTransactions:
+    """Test grouping model writes into one transaction."""
+    
+    @pytest.fixture
+    def file_db(self, tmp_path):
+        """Database file that a second connection can observe."""
+        connection.set_database_path(tmp_path / "test.db")
+        yield tmp_path / "test.db"
+        connection.close_connection()
+    
+    def test_writes_commit_when_outer_block_exits(self, file_db):
+        """Test model functions join the transaction instead of committing."""
+        observer = sqlite3.connect(file_db)
+        
+        with connection.transaction():
+            feed_id = models.add_feed("https://example.com/feed", "Example Feed")
+            models.add_article(feed_id, "Article", "https://example.com/1")
+            models.update_feed_timestamp(feed_id)
+            assert observer.execute("SELECT COUNT(*) FROM feeds").fetchone()[0] == 0
+        
+        assert observer.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 1
+        observer.close()
+    
+    def test_error_rolls_back_every_write(self, db):
+        """Test an exception in the block undoes all of its writes."""
+        with pytest.raises(RuntimeError):
+            with connection.transaction():
+                models.add_feed("https://example.com/feed", "Example Feed")
+                raise RuntimeError("abort")
+        
+        assert models.get_all_feeds() == []
+    
+    def test_handled_inner_error_keeps_other_writes(self, db):
+        """Test a failed nested write only undoes itself."""
+        with connection.transaction():
+            models.add_feed("https://example.com/feed", "Example Feed")
+            with pytest.raises(sqlite3.IntegrityError):
+                models.add_feed("https://example.com/feed", "Duplicate Feed")
+            models.add_feed("https://example.com/other", "Other Feed")
+        
+        assert [feed['name'] for feed in models.get_all_feeds()] == ["Example Feed", "Other Feed"]
+
@@ -1,50 +1,121 @@
 """Tests for RSS fetcher."""
 
+import io
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
 import pytest
+import requests
 from unittest.mock import Mock, patch
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from rss_reader import urls
+from rss_reader.fetcher import feed_parser, article_extractor, backends, http_pool, parse_pool, extraction_cache, scheduler, refresh, opml, minhash, telemetry
+from rss_reader.db import bodies, connection, models
+from tests.fixtures.parse_functions import fake_parse
+from tests.fixtures.sample_feed import SAMPLE_RSS
 
-from rss_reader.fetcher import feed_parser, article_extractor
+
+def _feed_response(status, body=b"", headers=None, url="https://example.com/feed"):
+    """Build an HTTP response as returned by the shared pool."""
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers.update(headers or {})
+    response.url = url
+    return response
 
 
 class TestFeedParser:
     """Test RSS feed parsing."""
     
-    @patch('rss_reader.fetcher.feed_parser.feedparser.parse')
-    def test_fetch_feed_success(self, mock_parse):
+    @patch('rss_reader.fetcher.feed_parser.get_http_pool')
+    def test_fetch_feed_success(self, mock_get_pool):
         """Test successful feed fetch."""
-        mock_feed = Mock()
-        mock_feed.status = 200
-        mock_feed.entries = [Mock()]
-        mock_feed.bozo = False
-        mock_parse.return_value = mock_feed
+        mock_get_pool.return_value.get.return_value = _feed_response(
+            200, SAMPLE_RSS.encode(), {"ETag": '"v1"'}
+        )
         
         result = feed_parser.fetch_feed("https://example.com/feed")
-        assert result == mock_feed
+        
+        assert [entry.title for entry in result.entries] == ["Test Article 1", "Test Article 2"]
+        assert result.status == 200
+        assert result.etag == '"v1"'
     
-    @patch('rss_reader.fetcher.feed_parser.feedparser.parse')
-    def test_fetch_feed_http_error(self, mock_parse):
+    @patch('rss_reader.fetcher.feed_parser.get_http_pool')
+    def test_fetch_feed_http_error(self, mock_get_pool):
         """Test feed fetch with HTTP error."""
-        mock_feed = Mock()
-        mock_feed.status = 404
-        mock_feed.entries = []
-        mock_parse.return_value = mock_feed
+        mock_get_pool.return_value.get.return_value = _feed_response(404)
         
         with pytest.raises(feed_parser.FeedFetchError):
             feed_parser.fetch_feed("https://example.com/feed")
     
-    @patch('rss_reader.fetcher.feed_parser.feedparser.parse')
-    def test_fetch_feed_invalid_format(self, mock_parse):
+    @patch('rss_reader.fetcher.feed_parser.get_http_pool')
+    def test_fetch_feed_connection_error(self, mock_get_pool):
+        """Test network errors are reported as FeedFetchError."""
+        mock_get_pool.return_value.get.side_effect = requests.ConnectionError("refused")
+        
+        with pytest.raises(feed_parser.FeedFetchError):
+            feed_parser.fetch_feed("https://example.com/feed")
+    
+    @patch('rss_reader.fetcher.feed_parser.get_http_pool')
+    def test_fetch_feed_invalid_format(self, mock_get_pool):
         """Test feed fetch with invalid format."""
-        mock_feed = Mock()
-        mock_feed.bozo = True
-        mock_feed.bozo_exception = "Invalid XML"
-        mock_feed.entries = []
-        mock_parse.return_value = mock_feed
+        mock_get_pool.return_value.get.return_value = _feed_response(200, b"<html><body>Not a feed")
         
         with pytest.raises(feed_parser.FeedFetchError):
             feed_parser.fetch_feed("https://example.com/feed")
     
+    @patch('rss_reader.fetcher.feed_parser.get_http_pool')
+    def test_fetch_feed_sends_validators(self, mock_get_pool):
+        """Test cache validators are sent as conditional GET headers."""
+        mock_get_pool.return_value.get.return_value = _feed_response(200, SAMPLE_RSS.encode())
+        
+        feed_parser.fetch_feed("https://example.com/feed", etag='"abc"', modified="Mon, 01 Jan 2024 00:00:00 GMT")
+        
+        headers = mock_get_pool.return_value.get.call_args.kwargs['headers']
+        assert headers["If-None-Match"] == '"abc"'
+        assert headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    
+    @patch('rss_reader.fetcher.feed_parser.get_http_pool')
+    def test_fetch_feed_not_modified(self, mock_get_pool):
+        """Test 304 response is returned without raising."""
+        mock_get_pool.return_value.get.return_value = _feed_response(304)
+        
+        result = feed_parser.fetch_feed("https://example.com/feed", etag='"abc"')
+        
+        assert feed_parser.is_not_modified(result)
+        assert result.entries == []
+    
+    def test_payload_hash_tracks_body_bytes(self):
+        """Test the content hash only changes with the body."""
+        first = feed_parser.FeedPayload(url="https://example.com/feed", status=200, body=b"<rss/>")
+        same = feed_parser.FeedPayload(url="https://example.com/feed", status=200, body=b"<rss/>", etag='"x"')
+        other = feed_parser.FeedPayload(url="https://example.com/feed", status=200, body=b"<rss></rss>")
+        
+        assert first.content_hash == same.content_hash
+        assert first.content_hash != other.content_hash
+    
+    def test_get_cache_validators(self):
+        """Test validators are read from the fetched feed."""
+        mock_feed = Mock()
+        mock_feed.etag = '"abc"'
+        mock_feed.modified = "Mon, 01 Jan 2024 00:00:00 GMT"
+        mock_feed.status = 200
+        
+        assert feed_parser.get_cache_validators(mock_feed) == (
+            '"abc"', "Mon, 01 Jan 2024 00:00:00 GMT", 200
+        )
+    
+    def test_get_cache_validators_missing(self):
+        """Test missing validators are returned as None."""
+        mock_feed = Mock(spec=['entries'])
+        
+        assert feed_parser.get_cache_validators(mock_feed) == (None, None, None)
+    
     def test_parse_feed(self):
         """Test parsing feed entries."""
         mock_entry = Mock()
@@ -82,11 +153,74 @@ class TestFeedParser:
         assert articles[0]['title'] == "Complete Article"
 
 
+def _entry(number, day=None):
+    """Build a mock feed entry whose GUID is its link."""
+    entry = Mock()
+    entry.title = f"Article {number}"
+    entry.link = f"https://example.com/article{number}"
+    entry.id = entry.link
+    entry.summary = ""
+    entry.published_parsed = (2024, 1, day or number, 12, 0, 0, 0, 1, 0)
+    return entry
+
+
+class TestIncrementalParsing:
+    """Test parsing stops at a feed's high-water mark."""
+    
+    def test_entry_key_prefers_guid(self):
+        """Test entries are keyed by GUID, falling back to link."""
+        entry = Mock()
+        entry.id = "tag:example.com,2024:1"
+        entry.link = "https://example.com/article1"
+        assert feed_parser.entry_key(entry) == "tag:example.com,2024:1"
+        
+        entry.id = None
+        assert feed_parser.entry_key(entry) == "https://example.com/article1"
+    
+    def test_parse_stops_at_known_entries(self):
+        """Test parsing stops after a run of already-seen entries."""
+        mock_feed = Mock()
+        mock_feed.entries = [_entry(n) for n in range(10, 0, -1)]
+        known = {f"https://example.com/article{n}" for n in range(1, 9)}
+        
+        articles = feed_parser.parse_feed(mock_feed, known_keys=known)
+        
+        assert [a['title'] for a in articles] == ["Article 10", "Article 9"]
+        # Entries past the stop point are never looked at
+        assert not mock_feed.entries[-1].mock_calls
+    
+    def test_parse_skips_known_entries_before_run(self):
+        """Test a single known entry does not stop parsing early."""
+        mock_feed = Mock()
+        mock_feed.entries = [_entry(4), _entry(3), _entry(2), _entry(1)]
+        known = {"https://example.com/article3", "https://example.com/article1",
+                 "https://example.com/article0", "https://example.com/article-1"}
+        
+        articles = feed_parser.parse_feed(mock_feed, known_keys=known)
+        
+        assert [a['title'] for a in articles] == ["Article 4", "Article 2"]
+    
+    def test_parse_oldest_first_feed(self):
+        """Test feeds listing oldest entries first are walked from the end."""
+        mock_feed = Mock()
+        mock_feed.entries = [_entry(n) for n in range(1, 7)]
+        known = {f"https://example.com/article{n}" for n in range(1, 5)}
+        
+        articles = feed_parser.parse_feed(mock_feed, known_keys=known)
+        
+        # Returned in feed order
+        assert [a['title'] for a in articles] == ["Article 5", "Article 6"]
+        assert feed_parser.newest_entry_keys(mock_feed, count=2) == [
+            "https://example.com/article6",
+            "https://example.com/article5",
+        ]
+
+
 class TestArticleExtractor:
     """Test article text extraction."""
     
-    @patch('rss_reader.fetcher.article_extractor.Article')
-    def test_extract_article_text_success(self, mock_article_class):
+    @patch('rss_reader.fetcher.article_extractor.fetch_html', return_value="<html></html>")
+    def test_extract_article_text_success(self, mock_fetch_html, mock_article_class):
         """Test successful article extraction."""
         mock_article = Mock()
         mock_article.text = "Full article text content"
@@ -98,8 +232,8 @@ class TestArticleExtractor:
         mock_article.download.assert_called_once()
         mock_article.parse.assert_called_once()
     
-    @patch('rss_reader.fetcher.article_extractor.Article')
-    def test_extract_article_text_failure(self, mock_article_class):
+    @patch('rss_reader.fetcher.article_extractor.fetch_html', return_value="<html></html>")
+    def test_extract_article_text_failure(self, mock_fetch_html, mock_article_class):
         """Test article extraction failure returns None."""
         mock_article = Mock()
         mock_article.download.side_effect = Exception("Download failed")
@@ -109,8 +243,26 @@ class TestArticleExtractor:
         
         assert result is None
     
-    @patch('rss_reader.fetcher.article_extractor.Article')
-    def test_extract_article_text_empty(self, mock_article_class):
+    @patch('rss_reader.fetcher.article_extractor.fetch_html', return_value="<html>page</html>")
+    def test_extract_parses_pooled_download(self, mock_fetch_html, mock_article_class):
+        """Test newspaper3k parses HTML downloaded through the HTTP pool."""
+        mock_article_class.return_value.text = "Text"
+        
+        article_extractor.extract_article_text("https://example.com/article")
+        
+        mock_fetch_html.assert_called_once_with("https://example.com/article")
+        mock_article_class.return_value.download.assert_called_once_with(input_html="<html>page</html>")
+    
+    @patch('rss_reader.fetcher.article_extractor.fetch_html', side_effect=requests.Timeout("read timeout"))
+    def test_extract_download_timeout(self, mock_fetch_html, mock_article_class):
+        """Test download errors from the pool return None without parsing."""
+        result = article_extractor.extract_article_text("https://example.com/article")
+        
+        assert result is None
+        mock_article_class.assert_not_called()
+    
+    @patch('rss_reader.fetcher.article_extractor.fetch_html', return_value="<html></html>")
+    def test_extract_article_text_empty(self, mock_fetch_html, mock_article_class):
         """Test article with no text returns None."""
         mock_article = Mock()
         mock_article.text = ""
@@ -119,3 +271,791 @@ class TestArticleExtractor:
         result = article_extractor.extract_article_text("https://example.com/article")
         
         assert result is None
+
+
+class FakeTavilyClient:
+    """Local stand-in for TavilyClient mimicking the extract response shape."""
+    
+    def __init__(self, contents: dict, failing: bool = False):
+        self.contents = contents
+        self.failing = failing
+        self.calls = []
+    
+    def extract(self, urls):
+        self.calls.append(list(urls))
+        if self.failing:
+            raise RuntimeError("Tavily unavailable")
+        return {
+            "results": [
+                {"url": url, "raw_content": self.contents[url]}
+                for url in urls if url in self.contents
+            ],
+            "failed_results": [
+                {"url": url, "error": "Failed to fetch url"}
+                for url in urls if url not in self.contents
+            ],
+            "response_time": 0.1,
+        }
+
+
+class TestBackendRegistry:
+    """Test extraction backends are built lazily."""
+    
+    def test_backend_built_once_on_first_use(self):
+        """Test a factory runs on first get() only."""
+        factory = Mock(return_value="backend")
+        registry = backends.BackendRegistry()
+        registry.register("fake", factory)
+        
+        assert not registry.is_built("fake")
+        factory.assert_not_called()
+        
+        assert registry.get("fake") == "backend"
+        assert registry.get("fake") == "backend"
+        factory.assert_called_once()
+    
+    def test_unavailable_backend_remembered(self):
+        """Test a backend that is unavailable is not looked up again."""
+        factory = Mock(return_value=None)
+        registry = backends.BackendRegistry()
+        registry.register("fake", factory)
+        
+        assert registry.get("fake") is None
+        assert registry.get("fake") is None
+        factory.assert_called_once()
+        
+        registry.reset()
+        registry.get("fake")
+        assert factory.call_count == 2
+    
+    def test_tavily_unavailable_without_key(self, monkeypatch):
+        """Test no Tavily client is created without an API key."""
+        monkeypatch.delenv("TAVILY_API_KEY", raising=False)
+        assert backends.create_tavily_client() is None
+    
+    def test_import_builds_no_backends(self):
+        """Test importing the fetcher does not import extraction libraries."""
+        code = (
+            "import sys\n"
+            "import rss_reader.fetcher\n"
+            "from rss_reader.fetcher.backends import registry\n"
+            "loaded = [m for m in ('newspaper', 'tavily') if m in sys.modules]\n"
+            "built = [n for n in registry.names() if registry.is_built(n)]\n"
+            "print(loaded, built)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent.parent
+        )
+        
+        assert result.stdout.strip() == "[] []"
+
+
+ARTICLE_PAGE = """
+<html><head><title>Test</title><script>var tracking = true;</script></head>
+<body>
+  <nav><a href="/">Home</a> <a href="/news">News</a></nav>
+  <div class="content">
+    <h1>Headline</h1>
+    <p>The first paragraph of the article explains what happened, where it happened and why it matters.</p>
+    <p>The second paragraph adds detail, quotes a witness, and mentions the next steps for everyone involved.</p>
+    <p>The third paragraph closes the story with background that readers may not know about yet.</p>
+  </div>
+  <div class="sidebar"><p>Popular elsewhere on the site this week, as chosen by our editors.</p></div>
+  <div id="comments"><p>First! This is a comment that should never end up in the article text.</p></div>
+  <footer>Copyright</footer>
+</body></html>
+"""
+
+
+class TestExtractorEngines:
+    """Test pluggable extractor engines."""
+    
+    def test_readability_extracts_article_body(self):
+        """Test the lxml engine keeps the body and drops page chrome."""
+        text = article_extractor.get_engine("readability").extract("https://example.com/a", ARTICLE_PAGE)
+        
+        assert text.startswith("The first paragraph")
+        assert "The third paragraph" in text
+        assert "comment" not in text
+        assert "Popular elsewhere" not in text
+        assert "tracking" not in text
+    
+    def test_readability_rejects_pages_without_article(self):
+        """Test pages with too little text yield None."""
+        engine = article_extractor.get_engine("readability")
+        
+        assert engine.extract("https://example.com/a", "<html><body><p>Short.</p></body></html>") is None
+        assert engine.extract("https://example.com/a", "") is None
+    
+    def test_unknown_engine(self):
+        """Test selecting an unregistered engine fails clearly."""
+        with pytest.raises(ValueError):
+            article_extractor.set_default_engine("nonexistent")
+    
+    def test_engines_are_registered_backends(self):
+        """Test engines are built lazily by the backend registry and must implement extract()."""
+        class IncompleteEngine(article_extractor.ExtractorEngine):
+            name = "incomplete"
+        
+        assert article_extractor.engine_names() == ["newspaper", "readability"]
+        assert article_extractor.get_engine("readability") is article_extractor.get_engine("readability")
+        assert backends.registry.is_built("engine:readability")
+        with pytest.raises(TypeError):
+            IncompleteEngine()
+    
+    @patch('rss_reader.fetcher.article_extractor.fetch_html', return_value=ARTICLE_PAGE)
+    def test_extract_articles_with_engine(self, mock_fetch_html):
+        """Test extract_articles uses the chosen engine and records it in the cache."""
+        cache = extraction_cache.ExtractionCache()
+        
+        with patch('rss_reader.fetcher.article_extractor.get_tavily_client', return_value=None):
+            contents = article_extractor.extract_articles(
+                ["https://example.com/a"],
+                cache=cache,
+                engine=article_extractor.get_engine("readability")
+            )
+        
+        assert contents["https://example.com/a"].startswith("The first paragraph")
+        extractor = connection.get_connection().execute("SELECT extractor FROM extraction_cache").fetchone()[0]
+        assert extractor == "readability"
+
+
+class TestTavilyBatchExtractor:
+    """Test batched Tavily extraction."""
+    
+    def test_extract_batches_urls(self):
+        """Test URLs are sent in batches and mapped back by URL."""
+        urls = [f"https://example.com/{i}" for i in range(25)]
+        client = FakeTavilyClient({url: f"text {url}" for url in urls})
+        
+        extractor = article_extractor.TavilyBatchExtractor(client, batch_size=10, max_wait=0.01)
+        results = extractor.extract(urls)
+        
+        assert [len(call) for call in client.calls] == [10, 10, 5]
+        assert results == {url: f"text {url}" for url in urls}
+    
+    def test_extract_marks_failed_urls(self):
+        """Test URLs missing from results map to None."""
+        client = FakeTavilyClient({"https://example.com/ok": "text"})
+        
+        extractor = article_extractor.TavilyBatchExtractor(client, batch_size=5, max_wait=0.01)
+        results = extractor.extract(["https://example.com/ok", "https://example.com/bad"])
+        
+        assert results == {"https://example.com/ok": "text", "https://example.com/bad": None}
+    
+    def test_concurrent_callers_share_batches(self):
+        """Test URLs from several threads are combined into full requests."""
+        urls = [f"https://example.com/{i}" for i in range(12)]
+        client = FakeTavilyClient({url: f"text {url}" for url in urls})
+        extractor = article_extractor.TavilyBatchExtractor(client, batch_size=4, max_wait=5)
+        results = {}
+        
+        def extract(chunk):
+            results.update(extractor.extract(chunk))
+        
+        threads = [threading.Thread(target=extract, args=(urls[i::6],)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=2)
+        
+        assert [len(call) for call in client.calls] == [4, 4, 4]
+        assert results == {url: f"text {url}" for url in urls}
+    
+    def test_partial_batch_sent_after_max_wait(self):
+        """Test a batch that does not fill is sent once its deadline passes."""
+        client = FakeTavilyClient({"https://example.com/1": "text"})
+        extractor = article_extractor.TavilyBatchExtractor(client, batch_size=10, max_wait=0.05)
+        
+        future = extractor.submit("https://example.com/1")
+        
+        assert future.result(timeout=2) == "text"
+        assert client.calls == [["https://example.com/1"]]
+    
+    @patch('rss_reader.fetcher.article_extractor.fetch_html', return_value="<html></html>")
+    def test_extract_articles_falls_back_for_failed_urls(self, mock_fetch_html, mock_article_class):
+        """Test only URLs Tavily failed on are extracted with newspaper3k."""
+        client = FakeTavilyClient({"https://example.com/1": "tavily text"})
+        mock_article_class.return_value.text = "newspaper text"
+        
+        results = article_extractor.extract_articles(
+            ["https://example.com/1", "https://example.com/2"],
+            tavily=article_extractor.TavilyBatchExtractor(client, max_wait=0.01)
+        )
+        
+        assert results == {
+            "https://example.com/1": "tavily text",
+            "https://example.com/2": "newspaper text",
+        }
+        mock_article_class.assert_called_once_with("https://example.com/2")
+    
+    @patch('rss_reader.fetcher.article_extractor.fetch_html', return_value="<html></html>")
+    def test_extract_articles_client_error(self, mock_fetch_html, mock_article_class):
+        """Test a failing Tavily call falls back for every URL."""
+        client = FakeTavilyClient({}, failing=True)
+        mock_article_class.return_value.text = "newspaper text"
+        
+        tavily = article_extractor.TavilyBatchExtractor(client, max_wait=0.01)
+        
+        results = article_extractor.extract_articles(["https://example.com/1"], tavily=tavily)
+        
+        assert results == {"https://example.com/1": "newspaper text"}
+
+
+class TestParsePool:
+    """Test parsing in worker processes with per-page deadlines."""
+    
+    @pytest.fixture
+    def pool(self):
+        pool = parse_pool.ParsePool(workers=2, timeout=1.0, parse=fake_parse)
+        yield pool
+        pool.close()
+    
+    def test_parse_many(self, pool):
+        """Test pages are parsed in worker processes."""
+        results = pool.parse_many({f"https://example.com/{i}": f"page {i}" for i in range(5)})
+        
+        assert results == {f"https://example.com/{i}": f"PAGE {i}" for i in range(5)}
+    
+    def test_hanging_page_is_killed(self, pool):
+        """Test a page exceeding the deadline yields None without stalling others."""
+        start = time.monotonic()
+        results = pool.parse_many({
+            "https://example.com/slow": "hang",
+            "https://example.com/ok": "fine",
+        })
+        
+        assert time.monotonic() - start < 10
+        assert results == {"https://example.com/slow": None, "https://example.com/ok": "FINE"}
+        assert pool.timeouts == 1
+        # The killed worker was replaced
+        assert pool.parse("https://example.com/again", "still works") == "STILL WORKS"
+    
+    def test_crashed_worker_is_replaced(self, pool):
+        """Test a worker dying mid-parse is restarted."""
+        assert pool.parse("https://example.com/crash", "crash") is None
+        assert pool.crashes == 1
+        assert pool.parse("https://example.com/ok", "ok") == "OK"
+    
+    def test_parse_error_returns_none(self, pool):
+        """Test an exception while parsing keeps the worker alive."""
+        assert pool.parse("https://example.com/bad", "error") is None
+        assert pool.crashes == 0
+    
+    def test_close_during_parse_many(self):
+        """Test closing the pool mid-call parses the waiting pages in-process."""
+        pool = parse_pool.ParsePool(workers=1, timeout=10.0, parse=fake_parse)
+        results = {}
+        # The slow page, handed out first, keeps the only worker busy past close()
+        caller = threading.Thread(target=lambda: results.update(pool.parse_many({
+            "https://example.com/waiting": "waiting",
+            "https://example.com/slow": "slow",
+        })))
+        caller.start()
+        time.sleep(0.5)
+        pool.close()
+        caller.join(10)
+        
+        assert not caller.is_alive()
+        assert results == {"https://example.com/slow": "SLOW", "https://example.com/waiting": "WAITING"}
+    
+    def test_workers_recycled_after_max_tasks(self):
+        """Test workers are replaced after max_tasks_per_worker pages."""
+        pool = parse_pool.ParsePool(workers=1, max_tasks_per_worker=2, parse=fake_parse)
+        try:
+            pids = [pool.parse(f"https://example.com/{i}", "pid") for i in range(3)]
+        finally:
+            pool.close()
+        
+        assert pids[0] == pids[1]
+        assert pids[2] != pids[0]
+    
+    @patch('rss_reader.fetcher.article_extractor.fetch_html', side_effect=lambda url: f"html of {url}")
+    def test_extract_articles_uses_parse_pool(self, mock_fetch_html):
+        """Test the newspaper fallback parses through the pool when given one."""
+        pool = Mock()
+        pool.engine = "newspaper"
+        pool.parse_many.side_effect = lambda pages: {url: "Text" for url in pages}
+        
+        with patch('rss_reader.fetcher.article_extractor.get_tavily_client', return_value=None):
+            contents = article_extractor.extract_articles(
+                ["https://example.com/a", "https://example.com/b"], parse_pool=pool
+            )
+        
+        assert contents == {"https://example.com/a": "Text", "https://example.com/b": "Text"}
+        pool.parse_many.assert_called_once_with({
+            "https://example.com/a": "html of https://example.com/a",
+            "https://example.com/b": "html of https://example.com/b",
+        })
+
+
+class FakeClock:
+    """Manually advanced clock for token bucket tests."""
+    
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestHttpPool:
+    """Test pooled HTTP downloads and rate limiting."""
+    
+    def test_token_bucket_allows_burst_then_waits(self):
+        """Test a bucket serves its capacity at once, then the rate."""
+        clock = FakeClock()
+        bucket = http_pool.TokenBucket(rate=2.0, capacity=3, clock=clock, sleep=clock.sleep)
+        
+        waits = [bucket.acquire() for _ in range(5)]
+        
+        assert waits[:3] == [0.0, 0.0, 0.0]
+        assert waits[3] == pytest.approx(0.5)
+        assert waits[4] == pytest.approx(0.5)
+    
+    def test_token_bucket_pause(self):
+        """Test a paused bucket waits out the pause."""
+        clock = FakeClock()
+        bucket = http_pool.TokenBucket(rate=10.0, capacity=1, clock=clock, sleep=clock.sleep)
+        
+        bucket.pause(30)
+        
+        assert bucket.acquire() >= 30
+    
+    def test_rate_limiter_buckets_per_host(self):
+        """Test URLs on the same host share a bucket."""
+        limiter = http_pool.HostRateLimiter()
+        
+        same1 = limiter.bucket_for("https://Example.com/a")
+        same2 = limiter.bucket_for("https://example.com/b")
+        other = limiter.bucket_for("https://other.com/a")
+        
+        assert same1 is same2
+        assert same1 is not other
+    
+    def test_get_uses_timeouts(self):
+        """Test requests carry explicit connect and read timeouts."""
+        pool = http_pool.HttpPool(connect_timeout=3, read_timeout=7)
+        response = Mock(status_code=200)
+        
+        with patch.object(pool.session, 'get', return_value=response) as mock_get:
+            assert pool.get("https://example.com/a") is response
+        
+        mock_get.assert_called_once_with("https://example.com/a", headers=None, timeout=(3, 7))
+    
+    def test_pools_kept_per_host(self):
+        """Test connections are reused across many hosts, not only the last few."""
+        pool = http_pool.HttpPool(pool_size=3, pool_hosts=50)
+        
+        manager = pool.session.get_adapter("https://example.com").poolmanager
+        
+        for n in range(50):
+            manager.connection_from_url(f"https://host{n}.example.com/")
+        
+        assert len(manager.pools) == 50
+        assert manager.connection_pool_kw['maxsize'] == 3
+    
+    def test_get_pauses_host_on_429(self):
+        """Test HTTP 429 pauses the host for Retry-After seconds."""
+        pool = http_pool.HttpPool()
+        response = Mock(status_code=429, headers={"Retry-After": "12"})
+        
+        with patch.object(pool.session, 'get', return_value=response):
+            with patch.object(http_pool.TokenBucket, 'pause') as mock_pause:
+                pool.get("https://example.com/a")
+        
+        mock_pause.assert_called_once_with(12.0)
+    
+    def test_shared_pool_is_reused(self):
+        """Test the process-wide pool is created once."""
+        assert http_pool.get_http_pool() is http_pool.get_http_pool()
+
+
+class TestUrlNormalization:
+    """Test URL normalization for cache keys."""
+    
+    def test_normalize_url(self):
+        """Test host case, default ports, fragments and tracking are folded."""
+        assert urls.normalize_url(
+            "HTTPS://Example.COM:443/story?utm_source=rss&id=2&a=1#comments"
+        ) == "https://example.com/story?a=1&id=2"
+    
+    def test_normalize_url_keeps_meaningful_parts(self):
+        """Test non-default ports and paths are kept."""
+        assert urls.normalize_url("http://example.com:8080/a/b") == "http://example.com:8080/a/b"
+        assert urls.normalize_url("https://example.com") == "https://example.com/"
+    
+    def test_canonical_link_folds_variants(self):
+        """Test scheme and trailing slash variants share a canonical link."""
+        expected = "https://example.com/story?id=2"
+        assert urls.canonical_link("http://EXAMPLE.com/story/?id=2&utm_source=rss") == expected
+        assert urls.canonical_link("https://example.com/story?id=2#top") == expected
+    
+    def test_configured_link_normalizer(self):
+        """Test a custom normalizer drops extra parameters and www."""
+        normalizer = urls.UrlNormalizer(
+            tracking_params=urls.TRACKING_PARAMS | {"source"},
+            strip_www=True
+        )
+        try:
+            urls.set_link_normalizer(normalizer)
+            assert urls.canonical_link("https://www.example.com/a?source=feed") == (
+                "https://example.com/a"
+            )
+        finally:
+            urls.set_link_normalizer(urls.DEFAULT_LINK_NORMALIZER)
+
+
+class TestExtractionCache:
+    """Test the persistent extraction cache."""
+    
+    def test_put_and_get(self):
+        """Test cached text is found under an equivalent URL."""
+        cache = extraction_cache.ExtractionCache()
+        cache.put("https://example.com/a?utm_source=rss", "text", "newspaper")
+        
+        assert cache.get("https://EXAMPLE.com/a#top") == "text"
+        assert cache.get("https://example.com/b") is None
+        assert cache.hits == 1
+        assert cache.misses == 1
+    
+    def test_get_many_urls_sharing_a_key(self):
+        """Test URLs differing only in tracking parameters are looked up together."""
+        cache = extraction_cache.ExtractionCache()
+        cache.put("http://a.com/x", "text", "newspaper")
+        
+        found = cache.get_many(["http://a.com/x?utm_source=1", "http://a.com/x"])
+        
+        assert found == {"http://a.com/x?utm_source=1": "text", "http://a.com/x": "text"}
+        assert cache.hits == 2
+    
+    def test_ttl_expiry(self):
+        """Test expired entries are misses and evicted."""
+        clock = FakeClock()
+        cache = extraction_cache.ExtractionCache(ttl_seconds=60, clock=clock)
+        cache.put("https://example.com/a", "text", "newspaper")
+        
+        clock.now += 61
+        
+        assert cache.get("https://example.com/a") is None
+        assert cache.evict() == 1
+        assert cache.stats()['entries'] == 0
+    
+    def test_size_eviction_removes_least_recently_used(self):
+        """Test the cache is trimmed to max_bytes oldest access first."""
+        clock = FakeClock()
+        entry_bytes = len(bodies.compress_body("aaaaa"))
+        cache = extraction_cache.ExtractionCache(max_bytes=2 * entry_bytes, clock=clock)
+        cache.put("https://example.com/a", "aaaaa", "newspaper")
+        clock.now += 1
+        cache.put("https://example.com/b", "bbbbb", "newspaper")
+        clock.now += 1
+        cache.get("https://example.com/a")
+        clock.now += 1
+        cache.put("https://example.com/c", "ccccc", "newspaper")
+        
+        assert cache.evict() == 1
+        assert cache.get("https://example.com/b") is None
+        assert cache.get("https://example.com/a") == "aaaaa"
+        assert cache.stats()['bytes'] == 2 * entry_bytes
+    
+    def test_text_is_stored_compressed(self):
+        """Test cached text is stored as a compressed body and sized by it."""
+        cache = extraction_cache.ExtractionCache()
+        text = "Paragraph of article text. " * 200
+        cache.put("https://example.com/a", text, "newspaper")
+        
+        content, size = connection.get_connection().execute(
+            "SELECT content, size FROM extraction_cache"
+        ).fetchone()
+        assert bodies.decompress_body(content) == text
+        assert size == len(content) < len(text) / 10
+        assert cache.get("https://example.com/a") == text
+    
+    @patch('rss_reader.fetcher.article_extractor.fetch_html', return_value="<html></html>")
+    def test_extract_articles_uses_cache(self, mock_fetch_html, mock_article_class):
+        """Test a second extraction of the same URL is served from cache."""
+        cache = extraction_cache.ExtractionCache()
+        mock_article_class.return_value.text = "newspaper text"
+        
+        first = article_extractor.extract_articles(["https://example.com/1"], cache=cache)
+        second = article_extractor.extract_articles(["https://example.com/1?utm_medium=feed"], cache=cache)
+        
+        assert first == {"https://example.com/1": "newspaper text"}
+        assert second == {"https://example.com/1?utm_medium=feed": "newspaper text"}
+        mock_fetch_html.assert_called_once()
+        assert cache.stats()['hits'] == 1
+    
+    @patch('rss_reader.fetcher.article_extractor.fetch_html', return_value="<html></html>")
+    def test_failed_extractions_are_not_cached(self, mock_fetch_html, mock_article_class):
+        """Test failures are retried rather than cached."""
+        cache = extraction_cache.ExtractionCache()
+        mock_article_class.return_value.text = ""
+        
+        article_extractor.extract_articles(["https://example.com/1"], cache=cache)
+        article_extractor.extract_articles(["https://example.com/1"], cache=cache)
+        
+        assert mock_fetch_html.call_count == 2
+        assert cache.stats()['entries'] == 0
+
+
+class TestPollScheduling:
+    """Test learning of per-feed polling intervals."""
+    
+    NOW = datetime(2024, 6, 1, 12, 0, 0)
+    
+    def test_default_interval_without_history(self):
+        """Test feeds with too little history use the default interval."""
+        assert scheduler.estimate_poll_interval([], self.NOW) == scheduler.DEFAULT_POLL_INTERVAL
+        assert scheduler.estimate_poll_interval([self.NOW], self.NOW) == scheduler.DEFAULT_POLL_INTERVAL
+    
+    def test_busy_feed_polled_often(self):
+        """Test a feed publishing hourly is polled every half hour."""
+        dates = [self.NOW - timedelta(hours=i) for i in range(10)]
+        
+        assert scheduler.estimate_poll_interval(dates, self.NOW) == 30 * 60
+    
+    def test_interval_clamped(self):
+        """Test intervals stay within the allowed range."""
+        very_busy = [self.NOW - timedelta(minutes=i) for i in range(10)]
+        weekly = [self.NOW - timedelta(weeks=i) for i in range(10)]
+        
+        assert scheduler.estimate_poll_interval(very_busy, self.NOW) == scheduler.MIN_POLL_INTERVAL
+        assert scheduler.estimate_poll_interval(weekly, self.NOW) == scheduler.MAX_POLL_INTERVAL
+    
+    def test_dormant_feed_polled_rarely(self):
+        """Test a feed silent for much longer than usual backs off."""
+        last_post = self.NOW - timedelta(days=2)
+        dates = [last_post - timedelta(hours=i) for i in range(10)]
+        
+        interval = scheduler.estimate_poll_interval(dates, self.NOW)
+        
+        assert interval == 12 * 60 * 60
+    
+    def test_quiet_poll_backs_off(self):
+        """Test a poll with nothing new lengthens the interval."""
+        assert scheduler.next_poll_interval(1800, 3600, new_articles=0, failures=0) == 5400
+        assert scheduler.next_poll_interval(1800, 3600, new_articles=2, failures=0) == 1800
+    
+    def test_failures_back_off_exponentially(self):
+        """Test consecutive failures double the interval each time."""
+        assert scheduler.next_poll_interval(1800, 1800, new_articles=0, failures=1) == 3600
+        assert scheduler.next_poll_interval(1800, 3600, new_articles=0, failures=2) == 7200
+        assert scheduler.next_poll_interval(1800, 3600, new_articles=0, failures=20) == scheduler.MAX_POLL_INTERVAL
+
+
+class TestCircuitBreaker:
+    """Test retry delays for failing feeds."""
+    
+    def test_single_failure_keeps_breaker_closed(self):
+        """Test one failure does not delay the next attempt."""
+        assert refresh.breaker_delay(1) is None
+    
+    def test_delay_doubles_up_to_cap(self):
+        """Test the retry delay grows exponentially and is capped."""
+        assert refresh.breaker_delay(2) == refresh.BREAKER_BASE_DELAY
+        assert refresh.breaker_delay(3) == 2 * refresh.BREAKER_BASE_DELAY
+        assert refresh.breaker_delay(4) == 4 * refresh.BREAKER_BASE_DELAY
+        assert refresh.breaker_delay(100) == refresh.BREAKER_MAX_DELAY
+    
+    def test_is_breaker_open(self):
+        """Test a feed is skipped only until its retry time."""
+        now = datetime(2024, 6, 1, 12, 0, 0)
+        
+        assert not refresh.is_breaker_open({'retry_at': None}, now)
+        assert refresh.is_breaker_open({'retry_at': "2024-06-01 12:05:00"}, now)
+        assert not refresh.is_breaker_open({'retry_at': "2024-06-01 11:55:00"}, now)
+
+
+SAMPLE_OPML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<opml version="2.0">
+  <head><title>Subscriptions</title></head>
+  <body>
+    <outline text="Tech">
+      <outline type="rss" text="Good Feed" xmlUrl="https://good.example.com/feed"/>
+      <outline type="rss" xmlUrl="https://untitled.example.com/rss"/>
+      <outline type="rss" text="Broken" xmlUrl="https://broken.example.com/feed"/>
+    </outline>
+    <outline type="rss" text="Good Feed again" xmlUrl="https://good.example.com/feed"/>
+    <outline type="rss" text="Subscribed" xmlUrl="https://old.example.com/feed"/>
+  </body>
+</opml>
+"""
+
+
+def _fake_fetch_feed(url, etag=None, modified=None):
+    """Stand-in for fetch_feed that fails for broken.example.com."""
+    if "broken" in url:
+        raise feed_parser.FeedFetchError(f"HTTP 404 error fetching feed: {url}")
+    feed = Mock()
+    feed.feed = {'title': "Feed Title"}
+    return feed
+
+
+class TestOpml:
+    """Test OPML import and export."""
+    
+    def test_iter_opml_walks_categories_and_skips_repeats(self):
+        """Test nested outlines are found and repeated URLs yielded once."""
+        feeds = list(opml.iter_opml(io.BytesIO(SAMPLE_OPML)))
+        
+        assert [feed.url for feed in feeds] == [
+            "https://good.example.com/feed",
+            "https://untitled.example.com/rss",
+            "https://broken.example.com/feed",
+            "https://old.example.com/feed",
+        ]
+        assert feeds[0].title == "Good Feed"
+        assert feeds[1].title is None
+    
+    def test_iter_opml_rejects_malformed_xml(self):
+        """Test a broken file raises OpmlError."""
+        with pytest.raises(opml.OpmlError):
+            list(opml.iter_opml(io.BytesIO(b"<opml><body><outline></body>")))
+    
+    @patch('rss_reader.fetcher.opml.fetch_feed', side_effect=_fake_fetch_feed)
+    def test_import_adds_only_valid_new_feeds(self, mock_fetch):
+        """Test invalid and already subscribed feeds are not added."""
+        models.add_feed("https://old.example.com/feed", "Old")
+        
+        result = opml.import_opml(io.BytesIO(SAMPLE_OPML), max_workers=2)
+        
+        assert set(result.added) == {"https://good.example.com/feed", "https://untitled.example.com/rss"}
+        assert result.existing == ["https://old.example.com/feed"]
+        assert list(result.invalid) == ["https://broken.example.com/feed"]
+        assert mock_fetch.call_count == 3
+        names = {feed['url']: feed['name'] for feed in models.get_all_feeds()}
+        assert names["https://good.example.com/feed"] == "Good Feed"
+        assert names["https://untitled.example.com/rss"] == "Feed Title"
+    
+    @patch('rss_reader.fetcher.opml.fetch_feed')
+    def test_import_without_validation(self, mock_fetch):
+        """Test --no-validate adds every new feed without fetching."""
+        result = opml.import_opml(io.BytesIO(SAMPLE_OPML), validate=False)
+        
+        assert len(result.added) == 4
+        mock_fetch.assert_not_called()
+    
+    @patch('rss_reader.fetcher.opml.fetch_all_feeds')
+    @patch('rss_reader.fetcher.opml.fetch_feed', side_effect=_fake_fetch_feed)
+    def test_import_runs_first_fetch(self, mock_fetch, mock_fetch_all):
+        """Test the added feeds are fetched together when requested."""
+        mock_fetch_all.return_value = refresh.RefreshSummary(new_counts={1: 5, 2: 3})
+        
+        result = opml.import_opml(io.BytesIO(SAMPLE_OPML), fetch=True, generate_embeddings=False)
+        
+        feeds = mock_fetch_all.call_args.args[0]
+        assert sorted(feed['url'] for feed in feeds) == sorted(result.added)
+        assert mock_fetch_all.call_args.kwargs['generate_embeddings'] is False
+        assert result.refresh.total_new == 8
+    
+    def test_export_round_trip(self, tmp_path):
+        """Test exported OPML imports back to the same subscriptions."""
+        models.add_feed("https://a.example.com/feed", "A & B")
+        models.add_feed("https://c.example.com/feed", "C")
+        path = tmp_path / "feeds.opml"
+        
+        assert opml.export_opml(path) == 2
+        
+        feeds = list(opml.iter_opml(path))
+        assert [(feed.url, feed.title) for feed in feeds] == [
+            ("https://a.example.com/feed", "A & B"),
+            ("https://c.example.com/feed", "C"),
+        ]
+
+
+STORY = " ".join(
+    f"Section {n} of the transit plan adds route {n * 7} to district {n % 9}, "
+    f"and council members debated its cost of {n * 13} million for hour {n}."
+    for n in range(40)
+)
+
+
+class TestMinHash:
+    """Test near-duplicate signatures."""
+    
+    def test_small_edits_stay_similar(self):
+        """Test a lightly edited copy is recognised as a near duplicate."""
+        edited = "Reporting by the wire desk. " + STORY.replace("route 70 ", "route 71 ")
+        
+        assert minhash.similarity(minhash.minhash(STORY), minhash.minhash(edited)) >= minhash.MIN_SIMILARITY
+    
+    def test_different_texts_are_dissimilar(self):
+        """Test unrelated articles do not count as duplicates."""
+        other = " ".join(f"Match {n} ended with {n % 4} goals for team {n * 3}." for n in range(60))
+        
+        assert minhash.similarity(minhash.minhash(STORY), minhash.minhash(other)) < 0.2
+    
+    def test_signatures_are_deterministic(self):
+        """Test signatures stay comparable across calls."""
+        signature = minhash.minhash(STORY)
+        
+        assert signature == minhash.minhash(STORY)
+        assert len(signature) == minhash.NUM_PERMUTATIONS * 4
+        assert len(minhash.band_keys(signature)) == minhash.BANDS
+    
+    def test_short_text_has_no_signature(self):
+        """Test texts too short to compare are not fingerprinted."""
+        assert minhash.minhash("Just a headline") is None
+        assert minhash.minhash(None) is None
+    
+    def test_find_near_duplicate_uses_band_index(self):
+        """Test lookups find indexed canonical articles only."""
+        feed_id = models.add_feed("https://example.com/feed", "Feed")
+        signature = minhash.minhash(STORY)
+        canonical_id = models.add_article(
+            feed_id, "Story", "https://example.com/story", full_text=STORY,
+            minhash=signature, minhash_bands=minhash.band_keys(signature)
+        )
+        # Stored with a signature but not indexed, like a linked duplicate
+        models.add_article(feed_id, "Copy", "https://example.com/copy", minhash=signature)
+        
+        edited = minhash.minhash(STORY + " Updated at noon with a correction.")
+        other = minhash.minhash(" ".join(f"Match {n} ended with {n % 4} goals." for n in range(60)))
+        assert minhash.find_near_duplicate(edited) == canonical_id
+        assert minhash.find_near_duplicate(other) is None
+
+
+class TestTelemetry:
+    """Test the per-feed fetch report."""
+    
+    def test_percentile(self):
+        """Test percentiles interpolate between ranks."""
+        values = [4.0, 1.0, 3.0, 2.0, 5.0]
+        assert telemetry.percentile(values, 0.5) == 3.0
+        assert telemetry.percentile(values, 0.9) == pytest.approx(4.6)
+        assert telemetry.percentile([], 0.5) == 0.0
+    
+    def test_feed_report_orders_feeds(self):
+        """Test feeds are summarised and sorted by the requested cost."""
+        slow = models.add_feed("https://slow.example.com/feed", "Slow")
+        big = models.add_feed("https://big.example.com/feed", "Big")
+        for seconds in (1.0, 2.0, 9.0):
+            models.add_feed_fetch_log(slow, "new", seconds, download_seconds=seconds / 2)
+        models.add_feed_fetch_log(slow, "error", 3.0, error="timed out")
+        models.add_feed_fetch_log(big, "new", 0.5, bytes_received=10_000_000)
+        
+        now = refresh.utc_now() + timedelta(minutes=1)
+        slowest = telemetry.feed_report(days=1, now=now)
+        largest = telemetry.feed_report(days=1, sort="largest", limit=1, now=now)
+        
+        assert [report.name for report in slowest] == ["Slow", "Big"]
+        assert slowest[0].fetches == 4
+        assert slowest[0].errors == 1
+        assert slowest[0].p50 == 2.5
+        assert slowest[0].total_seconds == 15.0
+        assert slowest[0].step_seconds['download'] == 1.5
+        assert [report.name for report in largest] == ["Big"]
+        assert telemetry.feed_report(days=1, now=now + timedelta(days=2)) == []
+    
+    def test_unknown_sort(self):
+        """Test an unknown ordering is rejected."""
+        with pytest.raises(ValueError):
+            telemetry.feed_report(sort="fastest")
@@ -1,14 +1,45 @@
 """Integration tests for end-to-end workflows."""
 
+import itertools
+import queue
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
 import pytest
 from unittest.mock import patch, Mock
 from io import BytesIO
+from pathlib import Path
 
+from rss_reader import daemon, fetcher
 from rss_reader.db import connection, models
-from rss_reader.fetcher import pipeline
+from rss_reader.fetcher import pipeline, FeedFetchError
+from rss_reader.fetcher.feed_parser import FeedPayload
+from rss_reader.fetcher.scheduler import FeedScheduler
+from rss_reader.fetcher.minhash import minhash
+from rss_reader.fetcher.stages import _DONE, IngestPipeline, PipelineAborted
 from tests.fixtures.sample_feed import SAMPLE_RSS
 
 
+@pytest.fixture
+def served_feeds():
+    """Answer feed downloads without network access.
+    
+    Every poll gets a different 200 body, so unchanged-body detection
+    never kicks in unless a test sets its own return value.
+    """
+    polls = itertools.count()
+    
+    def download(url, etag=None, modified=None):
+        return FeedPayload(url=url, status=200, body=f"{url} poll {next(polls)}".encode())
+    
+    with patch('rss_reader.fetcher.pipeline.download_feed', side_effect=download) as mock_download:
+        yield mock_download
+
+
 @pytest.fixture
 def db():
     """Create in-memory database for testing."""
@@ -21,9 +52,9 @@ def db():
 class TestEndToEnd:
     """Test complete fetch and store workflow."""
     
-    @patch('rss_reader.fetcher.article_extractor.Article')
     @patch('rss_reader.fetcher.feed_parser.feedparser.parse')
-    def test_fetch_and_store_feed(self, mock_parse, mock_article_class, db):
+    @patch('rss_reader.fetcher.article_extractor.fetch_html', return_value="<html></html>")
+    def test_fetch_and_store_feed(self, mock_fetch_html, mock_parse, mock_article_class, db, served_feeds):
         """Test complete fetch and store pipeline."""
         # Setup: Add feed
         feed_id = models.add_feed("https://example.com/feed", "Test Feed")
@@ -68,9 +99,9 @@ class TestEndToEnd:
         assert articles[0]['full_text'] == "Full text 2"
         assert articles[1]['title'] == "Test Article 1"
     
-    @patch('rss_reader.fetcher.article_extractor.Article')
     @patch('rss_reader.fetcher.feed_parser.feedparser.parse')
-    def test_fetch_idempotency(self, mock_parse, mock_article_class, db):
+    @patch('rss_reader.fetcher.article_extractor.fetch_html', return_value="<html></html>")
+    def test_fetch_idempotency(self, mock_fetch_html, mock_parse, mock_article_class, db, served_feeds):
         """Test re-fetching doesn't create duplicates."""
         feed_id = models.add_feed("https://example.com/feed", "Test Feed")
         
@@ -105,9 +136,9 @@ class TestEndToEnd:
         articles = models.get_articles_by_feed(feed_id)
         assert len(articles) == 1
     
-    @patch('rss_reader.fetcher.article_extractor.Article')
     @patch('rss_reader.fetcher.feed_parser.feedparser.parse')
-    def test_extraction_failure_fallback(self, mock_parse, mock_article_class, db):
+    @patch('rss_reader.fetcher.article_extractor.fetch_html', return_value="<html></html>")
+    def test_extraction_failure_fallback(self, mock_fetch_html, mock_parse, mock_article_class, db, served_feeds):
         """Test graceful degradation when article extraction fails."""
         feed_id = models.add_feed("https://example.com/feed", "Test Feed")
         
@@ -139,3 +170,700 @@ class TestEndToEnd:
         assert len(articles) == 1
         assert articles[0]['summary'] == "Test summary"
         assert articles[0]['full_text'] is None
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    """Create file-backed database shared by worker threads."""
+    connection.set_database_path(tmp_path / "test.db")
+    conn = connection.get_connection()
+    yield conn
+    connection.close_connection()
+
+
+class TestFetchAllFeeds:
+    """Test concurrent refresh of all feeds."""
+    
+    @patch('rss_reader.fetcher.feed_parser.feedparser.parse')
+    @patch('rss_reader.fetcher.article_extractor.fetch_html', return_value="<html></html>")
+    def test_fetch_all_feeds_stores_articles(
+        self, mock_fetch_html, mock_parse, mock_article_class, file_db, served_feeds
+    ):
+        """Test all feeds are fetched and counted per feed."""
+        feed1_id = models.add_feed("https://one.example.com/feed", "Feed 1")
+        feed2_id = models.add_feed("https://two.example.com/feed", "Feed 2")
+        
+        def make_feed(body, response_headers):
+            url = response_headers["content-location"]
+            mock_entry = Mock()
+            mock_entry.title = f"Article from {url}"
+            mock_entry.link = f"{url}/article"
+            mock_entry.summary = "Summary"
+            mock_entry.published_parsed = (2024, 1, 1, 12, 0, 0, 0, 1, 0)
+            
+            mock_feed = Mock()
+            mock_feed.status = 200
+            mock_feed.bozo = False
+            mock_feed.entries = [mock_entry]
+            return mock_feed
+        
+        mock_parse.side_effect = make_feed
+        mock_article_class.return_value.text = "Full text"
+        
+        summary = fetcher.fetch_all_feeds(generate_embeddings=False)
+        
+        assert summary.new_counts == {feed1_id: 1, feed2_id: 1}
+        assert summary.errors == []
+        assert summary.total_new == 2
+        assert summary.total_feeds == 2
+        assert len(models.get_all_articles_sorted()) == 2
+    
+    def test_fetch_all_feeds_runs_concurrently(self, file_db):
+        """Test wall time is close to the slowest feed, not the sum."""
+        for i in range(6):
+            models.add_feed(f"https://host{i}.example.com/feed", f"Feed {i}")
+        
+        def slow_fetch(feed_id, generate_embeddings=True, download_slot=None):
+            time.sleep(0.2)
+            return 1
+        
+        with patch('rss_reader.fetcher.refresh.fetch_and_store_feed', side_effect=slow_fetch):
+            start = time.monotonic()
+            summary = fetcher.fetch_all_feeds(max_workers=6)
+            elapsed = time.monotonic() - start
+        
+        assert summary.total_new == 6
+        assert elapsed < 0.2 * 6 / 2
+    
+    def test_fetch_all_feeds_per_host_limit(self, file_db):
+        """Test downloads from a single host are capped but storing is not."""
+        for i in range(6):
+            models.add_feed(f"https://same.example.com/feed{i}", f"Feed {i}")
+        
+        lock = threading.Lock()
+        downloading = storing = 0
+        peak_downloading = peak_storing = 0
+        
+        def tracking_fetch(feed_id, generate_embeddings=True, download_slot=None):
+            nonlocal downloading, storing, peak_downloading, peak_storing
+            with download_slot:
+                with lock:
+                    downloading += 1
+                    peak_downloading = max(peak_downloading, downloading)
+                time.sleep(0.05)
+                with lock:
+                    downloading -= 1
+            with lock:
+                storing += 1
+                peak_storing = max(peak_storing, storing)
+            time.sleep(0.2)
+            with lock:
+                storing -= 1
+            return 0
+        
+        with patch('rss_reader.fetcher.refresh.fetch_and_store_feed', side_effect=tracking_fetch):
+            fetcher.fetch_all_feeds(max_workers=6, per_host_limit=2)
+        
+        assert peak_downloading == 2
+        assert peak_storing > 2
+    
+    def test_fetch_all_feeds_collects_errors(self, file_db):
+        """Test failed feeds are reported by name."""
+        ok_id = models.add_feed("https://ok.example.com/feed", "Good Feed")
+        models.add_feed("https://bad.example.com/feed", "Bad Feed")
+        
+        def flaky_fetch(feed_id, generate_embeddings=True, download_slot=None):
+            if feed_id != ok_id:
+                raise FeedFetchError("HTTP 500")
+            return 3
+        
+        with patch('rss_reader.fetcher.refresh.fetch_and_store_feed', side_effect=flaky_fetch):
+            summary = fetcher.fetch_all_feeds()
+        
+        assert summary.new_counts == {ok_id: 3}
+        assert summary.errors == ["Bad Feed"]
+        assert summary.total_feeds == 2
+
+
+class TestCircuitBreaker:
+    """Test failing feeds are skipped while their breaker is open."""
+    
+    NOW = datetime(2024, 6, 1, 12, 0, 0)
+    
+    def test_failing_feed_skipped_until_retry_time(self, file_db):
+        """Test repeated failures open the breaker and success closes it."""
+        dead_id = models.add_feed("https://dead.example.com/feed", "Dead")
+        ok_id = models.add_feed("https://ok.example.com/feed", "OK")
+        
+        def fetch(feed_id, generate_embeddings=True, download_slot=None):
+            if feed_id == dead_id:
+                raise FeedFetchError("HTTP 503")
+            return 0
+        
+        with patch('rss_reader.fetcher.refresh.fetch_and_store_feed', side_effect=fetch) as mock_fetch:
+            fetcher.fetch_all_feeds(now=self.NOW)
+            fetcher.fetch_all_feeds(now=self.NOW)
+            
+            feed = models.get_feed(dead_id)
+            assert feed['consecutive_failures'] == 2
+            assert feed['last_error'] == "HTTP 503"
+            assert feed['retry_at'] == str(self.NOW + timedelta(minutes=5))
+            
+            mock_fetch.reset_mock()
+            summary = fetcher.fetch_all_feeds(now=self.NOW + timedelta(minutes=1))
+            
+            assert summary.skipped == ["Dead"]
+            assert summary.new_counts == {ok_id: 0}
+            assert [c.args[0] for c in mock_fetch.call_args_list] == [ok_id]
+            
+            # Half-open: one attempt once the retry time has passed
+            mock_fetch.side_effect = None
+            mock_fetch.return_value = 2
+            summary = fetcher.fetch_all_feeds(now=self.NOW + timedelta(minutes=6))
+        
+        assert summary.new_counts == {dead_id: 2, ok_id: 2}
+        feed = models.get_feed(dead_id)
+        assert feed['consecutive_failures'] == 0
+        assert feed['retry_at'] is None
+    
+    def test_ignore_breaker(self, file_db):
+        """Test an open breaker can be overridden."""
+        feed_id = models.add_feed("https://dead.example.com/feed", "Dead")
+        models.record_feed_failure(feed_id, "HTTP 503", self.NOW + timedelta(hours=1))
+        
+        with patch('rss_reader.fetcher.refresh.fetch_and_store_feed', return_value=0) as mock_fetch:
+            summary = fetcher.fetch_all_feeds(ignore_breaker=True, now=self.NOW)
+        
+        mock_fetch.assert_called_once()
+        assert summary.skipped == []
+
+
+class TestConditionalGet:
+    """Test conditional GET handling in the pipeline."""
+    
+    @patch('rss_reader.fetcher.feed_parser.feedparser.parse')
+    @patch('rss_reader.fetcher.article_extractor.fetch_html', return_value="<html></html>")
+    def test_validators_round_trip(self, mock_fetch_html, mock_parse, mock_article_class, db, served_feeds):
+        """Test validators are stored and sent on the next poll."""
+        feed_id = models.add_feed("https://example.com/feed", "Test Feed")
+        
+        mock_entry = Mock()
+        mock_entry.title = "Test Article"
+        mock_entry.link = "https://example.com/article1"
+        mock_entry.summary = "Test summary"
+        mock_entry.published_parsed = (2024, 1, 1, 12, 0, 0, 0, 1, 0)
+        
+        mock_feed = Mock()
+        mock_feed.bozo = False
+        mock_feed.entries = [mock_entry]
+        mock_parse.return_value = mock_feed
+        mock_article_class.return_value.text = "Full text"
+        served_feeds.side_effect = None
+        served_feeds.return_value = FeedPayload(
+            url="https://example.com/feed", status=200, body=b"<rss>v1</rss>",
+            etag='"v1"', modified="Mon, 01 Jan 2024 00:00:00 GMT"
+        )
+        
+        pipeline.fetch_and_store_feed(feed_id, generate_embeddings=False)
+        
+        feed = models.get_feed(feed_id)
+        assert feed['etag'] == '"v1"'
+        assert feed['last_status'] == 200
+        
+        # Second poll: server reports no change
+        served_feeds.return_value = FeedPayload(url="https://example.com/feed", status=304)
+        mock_article_class.reset_mock()
+        
+        with patch('rss_reader.fetcher.pipeline.parse_feed') as mock_parse_feed:
+            result = pipeline.ingest_feed(feed_id)
+        
+        assert result.new_articles == 0
+        assert result.not_modified
+        served_feeds.assert_called_with(
+            "https://example.com/feed",
+            etag='"v1"',
+            modified="Mon, 01 Jan 2024 00:00:00 GMT"
+        )
+        mock_parse_feed.assert_not_called()
+        mock_article_class.assert_not_called()
+        
+        feed = models.get_feed(feed_id)
+        assert feed['etag'] == '"v1"'
+        assert feed['last_status'] == 304
+        assert feed['last_updated'] is not None
+    
+    @patch('rss_reader.fetcher.stages.extract_articles',
+           side_effect=lambda links: dict.fromkeys(links))
+    def test_unchanged_body_skips_parsing(self, mock_extract, db, served_feeds):
+        """Test a 200 response with the same bytes is not parsed again."""
+        feed_id = models.add_feed("https://example.com/feed", "Test Feed")
+        served_feeds.side_effect = None
+        served_feeds.return_value = FeedPayload(
+            url="https://example.com/feed", status=200, body=SAMPLE_RSS.encode()
+        )
+        
+        first = pipeline.ingest_feed(feed_id, generate_embeddings=False)
+        assert first.new_articles == 2
+        assert models.get_feed(feed_id)['content_hash'] == served_feeds.return_value.content_hash
+        
+        with patch('rss_reader.fetcher.pipeline.parse_payload') as mock_parse_payload:
+            second = pipeline.ingest_feed(feed_id, generate_embeddings=False)
+        
+        assert second.unchanged
+        assert not second.not_modified
+        assert second.entries_seen == 0
+        mock_parse_payload.assert_not_called()
+        assert mock_extract.call_count == 1
+        assert models.get_feed(feed_id)['last_status'] == 200
+    
+    @patch('rss_reader.fetcher.pipeline.IngestPipeline.run', side_effect=RuntimeError("disk full"))
+    def test_hash_not_stored_when_ingest_fails(self, mock_run, db, served_feeds):
+        """Test a failed poll does not make the next identical body look processed."""
+        feed_id = models.add_feed("https://example.com/feed", "Test Feed")
+        served_feeds.side_effect = None
+        served_feeds.return_value = FeedPayload(
+            url="https://example.com/feed", status=200, body=SAMPLE_RSS.encode()
+        )
+        
+        with pytest.raises(RuntimeError):
+            pipeline.ingest_feed(feed_id, generate_embeddings=False)
+        
+        assert models.get_feed(feed_id)['content_hash'] is None
+        assert models.get_feed(feed_id)['last_status'] is None
+
+
+
+class TestFetchTelemetry:
+    """Test every fetch is recorded in the feed fetch log."""
+    
+    @patch('rss_reader.fetcher.stages.extract_articles',
+           side_effect=lambda links: dict.fromkeys(links))
+    def test_fetch_is_logged_with_timings(self, mock_extract, db, served_feeds):
+        """Test a fetch records counts, bytes and per-step timings."""
+        feed_id = models.add_feed("https://example.com/feed", "Test Feed")
+        served_feeds.side_effect = None
+        served_feeds.return_value = FeedPayload(
+            url="https://example.com/feed", status=200, body=SAMPLE_RSS.encode()
+        )
+        
+        pipeline.ingest_feed(feed_id, generate_embeddings=False)
+        pipeline.ingest_feed(feed_id, generate_embeddings=False)
+        
+        first, second = models.get_feed_fetch_log(datetime(2000, 1, 1))
+        assert first['outcome'] == "new"
+        assert first['http_status'] == 200
+        assert first['bytes_received'] == len(SAMPLE_RSS.encode())
+        assert first['entries_seen'] == 2
+        assert first['new_articles'] == 2
+        assert first['total_seconds'] >= first['download_seconds'] + first['parse_seconds']
+        assert first['store_seconds'] > 0
+        assert second['outcome'] == "unchanged"
+    
+    def test_failed_fetch_is_logged(self, db, served_feeds):
+        """Test a failed fetch is recorded with its error."""
+        feed_id = models.add_feed("https://example.com/feed", "Test Feed")
+        served_feeds.side_effect = FeedFetchError("HTTP 503")
+        
+        with pytest.raises(FeedFetchError):
+            pipeline.ingest_feed(feed_id, generate_embeddings=False)
+        
+        (row,) = models.get_feed_fetch_log(datetime(2000, 1, 1))
+        assert row['outcome'] == "error"
+        assert row['error'] == "HTTP 503"
+
+
+class TestIncrementalParsing:
+    """Test polls only parse entries newer than the high-water mark."""
+    
+    @patch('rss_reader.fetcher.feed_parser.feedparser.parse')
+    @patch('rss_reader.fetcher.stages.extract_articles',
+           side_effect=lambda links: dict.fromkeys(links))
+    def test_second_poll_parses_only_new_entries(self, mock_extract, mock_parse, db, served_feeds):
+        """Test the stored high-water mark stops the next parse early."""
+        feed_id = models.add_feed("https://example.com/feed", "Test Feed")
+        
+        def make_feed(numbers):
+            entries = []
+            for number in numbers:
+                entry = Mock()
+                entry.title = f"Article {number}"
+                entry.link = f"https://example.com/article{number}"
+                entry.id = entry.link
+                entry.summary = ""
+                entry.published_parsed = (2024, 1, number, 12, 0, 0, 0, 1, 0)
+                entries.append(entry)
+            feed = Mock()
+            feed.status = 200
+            feed.bozo = False
+            feed.etag = None
+            feed.modified = None
+            feed.entries = entries
+            return feed
+        
+        mock_parse.return_value = make_feed(range(5, 0, -1))
+        assert pipeline.fetch_and_store_feed(feed_id, generate_embeddings=False) == 5
+        assert models.get_feed_high_water_mark(feed_id) == {
+            f"https://example.com/article{n}" for n in range(1, 6)
+        }
+        
+        second = make_feed(range(7, 0, -1))
+        mock_parse.return_value = second
+        result = pipeline.ingest_feed(feed_id, generate_embeddings=False)
+        
+        assert result.new_articles == 2
+        assert result.entries_seen == 2
+        # The oldest entries were never parsed
+        assert not second.entries[-1].mock_calls
+        assert "https://example.com/article7" in models.get_feed_high_water_mark(feed_id)
+
+
+class TestExtractionDedupe:
+    """Test extraction is skipped for already stored links."""
+    
+    @patch('rss_reader.fetcher.stages.extract_articles')
+    @patch('rss_reader.fetcher.feed_parser.feedparser.parse')
+    def test_only_new_links_are_extracted(self, mock_parse, mock_extract, db, served_feeds):
+        """Test stored and repeated links are not extracted again."""
+        feed_id = models.add_feed("https://example.com/feed", "Test Feed")
+        models.add_article(feed_id, "Old", "https://example.com/old")
+        
+        entries = []
+        for link in ["https://example.com/new", "https://example.com/old", "https://example.com/new"]:
+            mock_entry = Mock()
+            mock_entry.title = link
+            mock_entry.link = link
+            mock_entry.summary = "Summary"
+            mock_entry.published_parsed = (2024, 1, 1, 12, 0, 0, 0, 1, 0)
+            entries.append(mock_entry)
+        
+        mock_feed = Mock()
+        mock_feed.status = 200
+        mock_feed.bozo = False
+        mock_feed.entries = entries
+        mock_parse.return_value = mock_feed
+        mock_extract.return_value = {"https://example.com/new": "Full text"}
+        
+        result = pipeline.ingest_feed(feed_id, generate_embeddings=False)
+        
+        mock_extract.assert_called_once_with(["https://example.com/new"])
+        assert result.entries_seen == 3
+        assert result.extractions_skipped == 2
+        assert result.new_articles == 1
+    
+    
+    @patch('rss_reader.fetcher.stages.extract_articles')
+    @patch('rss_reader.fetcher.feed_parser.feedparser.parse')
+    def test_url_variants_of_stored_link_are_not_extracted(
+        self, mock_parse, mock_extract, db, served_feeds
+    ):
+        """Test tracking parameters, scheme and trailing slash do not make a new article."""
+        feed_id = models.add_feed("https://example.com/feed", "Test Feed")
+        models.add_article(feed_id, "Old", "https://example.com/old")
+        
+        mock_entry = Mock()
+        mock_entry.title = "Old"
+        mock_entry.link = "http://Example.com/old/?utm_source=rss&utm_medium=feed#comments"
+        mock_entry.summary = "Summary"
+        mock_entry.published_parsed = (2024, 1, 1, 12, 0, 0, 0, 1, 0)
+        mock_feed = Mock()
+        mock_feed.status = 200
+        mock_feed.bozo = False
+        mock_feed.entries = [mock_entry]
+        mock_parse.return_value = mock_feed
+        
+        result = pipeline.ingest_feed(feed_id, generate_embeddings=False)
+        
+        mock_extract.assert_not_called()
+        assert result.extractions_skipped == 1
+        assert result.new_articles == 0
+
+
+def _parsed_articles(count):
+    """Build article dicts as returned by parse_feed."""
+    return [
+        {
+            'title': f"Article {n}",
+            'link': f"https://example.com/article{n}",
+            'summary': "",
+            'published_date': datetime(2024, 1, 1) + timedelta(hours=n),
+        }
+        for n in range(count)
+    ]
+
+
+class TestIngestPipeline:
+    """Test the staged extract/embed/store pipeline."""
+    
+    @patch('rss_reader.ml.generate_article_embeddings')
+    @patch('rss_reader.fetcher.stages.extract_articles',
+           side_effect=lambda links: {link: f"Text of {link}" for link in links})
+    def test_all_articles_flow_through_stages(self, mock_extract, mock_embed, db):
+        """Test every article is extracted, embedded in batches and stored."""
+        feed_id = models.add_feed("https://example.com/feed", "Test Feed")
+        batch_sizes = []
+        
+        def embed(articles):
+            batch_sizes.append(len(articles))
+            return [np.full(384, 0.5, dtype=np.float32) for _ in articles]
+        mock_embed.side_effect = embed
+        
+        stages = IngestPipeline(extract_workers=3, extract_chunk=5, embed_batch_size=8, queue_size=4)
+        new_count = stages.run(feed_id, _parsed_articles(50))
+        
+        assert new_count == 50
+        assert mock_extract.call_count == 10
+        assert sum(batch_sizes) == 50
+        assert max(batch_sizes) <= 8
+        
+        stored = models.get_articles_by_feed(feed_id, limit=100)
+        assert len(stored) == 50
+        assert all(a['full_text'] == f"Text of {a['link']}" for a in stored)
+        assert connection.get_connection().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] == 50
+        
+        assert {name: s.items for name, s in stages.stats.items()} == {
+            'extract': 50, 'embed': 50, 'store': 50
+        }
+    
+    @patch('rss_reader.fetcher.stages.extract_articles', side_effect=RuntimeError("boom"))
+    def test_extraction_failure_stores_without_text(self, mock_extract, db):
+        """Test articles are still stored when extraction raises."""
+        feed_id = models.add_feed("https://example.com/feed", "Test Feed")
+        
+        stages = IngestPipeline(generate_embeddings=False, extract_chunk=2)
+        assert stages.run(feed_id, _parsed_articles(5)) == 5
+        assert stages.stats['extract'].errors == 3
+        assert all(a['full_text'] is None for a in models.get_articles_by_feed(feed_id))
+    
+    @patch('rss_reader.fetcher.stages.models.add_articles', side_effect=RuntimeError("disk full"))
+    @patch('rss_reader.fetcher.stages.extract_articles', side_effect=lambda links: dict.fromkeys(links))
+    def test_writer_failure_stops_all_stages(self, mock_extract, mock_add, db):
+        """Test a failing writer does not leave stages blocked on full queues."""
+        stages = IngestPipeline(generate_embeddings=False, extract_chunk=1, queue_size=1)
+        
+        with pytest.raises(RuntimeError):
+            stages.run(1, _parsed_articles(20))
+        
+        # run() joins its threads, so nothing is left running
+        assert not [t for t in threading.enumerate() if t.daemon and t.is_alive() and 'run_stage' in t.name]
+    
+    def test_writer_stores_queued_articles_in_one_transaction(self, db):
+        """Test articles waiting for the writer are inserted by one add_articles call."""
+        feed_id = models.add_feed("https://example.com/feed", "Test Feed")
+        embedded = queue.Queue()
+        for article_data in _parsed_articles(50) + _parsed_articles(2):
+            embedded.put((article_data, None, None, None))
+        embedded.put(_DONE)
+        
+        stages = IngestPipeline(generate_embeddings=False)
+        with patch('rss_reader.fetcher.stages.models.add_articles',
+                   wraps=models.add_articles) as mock_add:
+            assert stages._store(feed_id, embedded) == 50
+        
+        mock_add.assert_called_once()
+        assert stages.stats['store'].items == 52
+    
+    def test_writer_links_copies_within_one_batch(self, db):
+        """Test a copy of an article in the same batch is linked to it."""
+        feed_id = models.add_feed("https://example.com/feed", "Test Feed")
+        embedded = queue.Queue()
+        for n, article_data in enumerate(_parsed_articles(3)):
+            article_data['link'] = f"https://example.com/copy{n}"
+            text = _syndicated_text(article_data['link'])
+            embedded.put((article_data, text, None, minhash(text)))
+        embedded.put(_DONE)
+        
+        stages = IngestPipeline(generate_embeddings=False)
+        assert stages._store(feed_id, embedded) == 3
+        
+        rows = db.execute("SELECT article_id, duplicate_of FROM articles ORDER BY article_id").fetchall()
+        canonical_id = rows[0][0]
+        assert [row[1] for row in rows] == [None, canonical_id, canonical_id]
+        assert stages.duplicates == 2
+    
+    @patch('rss_reader.fetcher.stages.extract_articles', side_effect=lambda links: dict.fromkeys(links))
+    def test_crashed_stage_aborts_pipeline(self, mock_extract, db):
+        """Test an unexpected error in a worker stage is raised to the caller."""
+        stages = IngestPipeline(generate_embeddings=False)
+        
+        with patch.object(stages, '_embed_batch', side_effect=ValueError("bug")):
+            with pytest.raises(PipelineAborted):
+                stages.run(1, _parsed_articles(3))
+
+
+SYNDICATED_STORY = " ".join(
+    f"Part {n} of the wire report covers harbour {n * 5} and the storm in region {n % 6}."
+    for n in range(40)
+)
+
+
+def _syndicated_text(link):
+    """Extraction stand-in: the same story under every /copy URL."""
+    if "/copy" in link:
+        return f"Republished from the wire for {link}. " + SYNDICATED_STORY
+    return " ".join(f"Unique item {n} about {link} number {n * 11}." for n in range(30))
+
+
+class TestNearDuplicates:
+    """Test syndicated copies are linked instead of stored and embedded again."""
+    
+    @patch('rss_reader.ml.generate_article_embeddings')
+    @patch('rss_reader.fetcher.stages.extract_articles',
+           side_effect=lambda links: {link: _syndicated_text(link) for link in links})
+    def test_copy_of_stored_article_is_not_embedded(self, mock_extract, mock_embed, file_db):
+        """Test a later copy is linked to the stored article and skips encoding."""
+        feed1 = models.add_feed("https://one.example.com/feed", "Feed 1")
+        feed2 = models.add_feed("https://two.example.com/feed", "Feed 2")
+        embedded = []
+        
+        def embed(articles):
+            embedded.extend(article['full_text'] for article in articles)
+            return [np.full(384, 0.5, dtype=np.float32) for _ in articles]
+        mock_embed.side_effect = embed
+        
+        first = [{'title': "Storm", 'link': "https://one.example.com/copy", 'summary': "",
+                  'published_date': datetime(2024, 1, 1)}]
+        assert IngestPipeline().run(feed1, first) == 1
+        
+        second = _parsed_articles(2) + [
+            {'title': "Storm", 'link': "https://two.example.com/copy", 'summary': "",
+             'published_date': datetime(2024, 1, 2)}
+        ]
+        stages = IngestPipeline()
+        assert stages.run(feed2, second) == 3
+        
+        assert stages.duplicates == 1
+        assert len(embedded) == 3
+        canonical = connection.get_connection().execute(
+            "SELECT article_id FROM articles WHERE link = ?", ("https://one.example.com/copy",)
+        ).fetchone()[0]
+        copy = connection.get_connection().execute(
+            """
+            SELECT a.article_id, body.full_text, a.duplicate_of
+            FROM articles a LEFT JOIN article_bodies body USING (article_id)
+            WHERE a.link = ?
+            """,
+            ("https://two.example.com/copy",)
+        ).fetchone()
+        assert copy['duplicate_of'] == canonical
+        assert copy['full_text'] is None
+        assert models.get_article(copy['article_id'])['full_text'] == models.get_article(canonical)['full_text']
+        assert connection.get_connection().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] == 3
+    
+    @patch('rss_reader.fetcher.stages.extract_articles',
+           side_effect=lambda links: {link: _syndicated_text(link) for link in links})
+    def test_copies_within_one_run_are_linked(self, mock_extract, db):
+        """Test the writer links copies that arrive in the same run."""
+        feed_id = models.add_feed("https://example.com/feed", "Feed")
+        articles = [
+            {'title': f"Storm {n}", 'link': f"https://example.com/copy{n}", 'summary': "",
+             'published_date': datetime(2024, 1, 1) + timedelta(hours=n)}
+            for n in range(3)
+        ]
+        
+        stages = IngestPipeline(generate_embeddings=False)
+        assert stages.run(feed_id, articles) == 3
+        
+        rows = db.execute("SELECT duplicate_of FROM articles ORDER BY article_id").fetchall()
+        assert [row[0] is None for row in rows] == [True, False, False]
+        assert stages.duplicates == 2
+        assert models.get_database_stats()['duplicates'] == 2
+
+
+class TestFeedScheduler:
+    """Test the adaptive polling scheduler."""
+    
+    NOW = datetime(2024, 6, 1, 12, 0, 0)
+    
+    def test_run_once_polls_due_feeds_and_reschedules(self, file_db):
+        """Test due feeds are polled and given a learned next poll time."""
+        busy_id = models.add_feed("https://busy.example.com/feed", "Busy")
+        for i in range(10):
+            models.add_article(
+                busy_id, f"Post {i}", f"https://busy.example.com/{i}",
+                published_date=self.NOW - timedelta(hours=i)
+            )
+        
+        with patch('rss_reader.fetcher.refresh.fetch_and_store_feed', return_value=1) as mock_fetch:
+            summary = FeedScheduler().run_once(self.NOW)
+        
+        assert summary.new_counts == {busy_id: 1}
+        mock_fetch.assert_called_once()
+        
+        feed = models.get_feed(busy_id)
+        assert feed['poll_interval'] == 30 * 60
+        assert feed['next_poll_at'] == str(self.NOW + timedelta(minutes=30))
+    
+    def test_feeds_not_due_are_skipped(self, file_db):
+        """Test feeds are only polled once their next poll time passes."""
+        feed_id = models.add_feed("https://example.com/feed", "Feed")
+        models.update_feed_schedule(feed_id, 3600, self.NOW + timedelta(minutes=10))
+        sched = FeedScheduler()
+        
+        with patch('rss_reader.fetcher.refresh.fetch_and_store_feed', return_value=0) as mock_fetch:
+            sched.run_once(self.NOW)
+            assert sched.seconds_until_next(self.NOW) == 600
+            sched.run_once(self.NOW + timedelta(minutes=10))
+        
+        mock_fetch.assert_called_once()
+    
+    def test_failing_feed_backs_off(self, file_db):
+        """Test each consecutive failure pushes the next poll further out."""
+        feed_id = models.add_feed("https://dead.example.com/feed", "Dead")
+        sched = FeedScheduler()
+        intervals = []
+        now = self.NOW
+        
+        with patch('rss_reader.fetcher.refresh.fetch_and_store_feed', side_effect=FeedFetchError("HTTP 503")):
+            for _ in range(3):
+                sched.run_once(now)
+                feed = models.get_feed(feed_id)
+                intervals.append(feed['poll_interval'])
+                now = datetime.fromisoformat(feed['next_poll_at'])
+        
+        assert intervals == [7200, 14400, 28800]
+    
+    def test_manually_refreshed_feed_scheduled_from_last_update(self, file_db):
+        """Test feeds refreshed before the daemon started are not polled at once."""
+        feed_id = models.add_feed("https://example.com/feed", "Feed")
+        file_db.execute(
+            "UPDATE feeds SET last_updated = ? WHERE feed_id = ?",
+            (self.NOW - timedelta(minutes=5), feed_id)
+        )
+        file_db.commit()
+        
+        with patch('rss_reader.fetcher.refresh.fetch_and_store_feed', return_value=0) as mock_fetch:
+            FeedScheduler().run_once(self.NOW)
+        
+        mock_fetch.assert_not_called()
+        feed = models.get_feed(feed_id)
+        assert feed['next_poll_at'] == str(self.NOW + timedelta(minutes=55))
+
+
+class TestDaemon:
+    """Test the daemon loop."""
+    
+    def test_run_daemon_stops_on_event(self):
+        """Test the loop polls, sleeps and exits once stopped."""
+        stop_event = threading.Event()
+        sched = Mock()
+        sched.run_once.return_value = fetcher.RefreshSummary()
+        sched.seconds_until_next.side_effect = lambda: stop_event.set() or 0.0
+        
+        daemon.run_daemon(sched, stop_event)
+        
+        sched.run_once.assert_called_once()
+    
+    def test_daemon_does_not_import_ui(self):
+        """Test the daemon entry point never loads the terminal UI."""
+        code = (
+            "import sys\n"
+            "import rss_reader.daemon\n"
+            "print([m for m in ('textual', 'rss_reader.ui') if m in sys.modules])\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent.parent
+        )
+        
+        assert result.stdout.strip() == "[]"
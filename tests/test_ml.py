@@ -8,6 +8,7 @@ from unittest.mock import Mock, patch
 
 from rss_reader.ml import (
     generate_embedding,
+    generate_article_embeddings,
     prepare_article_text,
     store_embedding,
     get_embedding,
@@ -92,6 +93,22 @@ class TestEmbeddings:
         assert embedding.shape == (384,)
         assert isinstance(embedding, np.ndarray)
     
+    @patch('rss_reader.ml.embeddings.get_model')
+    def test_generate_article_embeddings_batches(self, mock_get_model):
+        """Test several articles are encoded in one model call."""
+        mock_model = Mock()
+        mock_model.encode.side_effect = lambda texts, **kwargs: np.ones((len(texts), 384), dtype=np.float32)
+        mock_get_model.return_value = mock_model
+        
+        articles = [{'title': "First"}, {'title': ""}, {'title': "Third"}]
+        embeddings = generate_article_embeddings(articles)
+        
+        mock_model.encode.assert_called_once()
+        assert mock_model.encode.call_args[0][0] == ["First", "Third"]
+        assert embeddings[0].shape == (384,)
+        assert embeddings[1] is None
+        assert embeddings[2].shape == (384,)
+    
     def test_generate_embedding_empty_text(self):
         """Test embedding generation with empty text."""
         embedding = generate_embedding("")
@@ -280,7 +297,39 @@ class TestRecommendations:
         # No recommendations should be liked articles
         recommended_ids = {r['article_id'] for r in recommendations}
         assert not recommended_ids.intersection(set(liked_ids))
-
+    
+    
+    def test_liked_near_duplicates_resolve_to_canonical(self, test_db):
+        """Test a liked near duplicate counts as a like of its canonical article."""
+        feed_id = add_feed("https://example.com/feed", "Test Feed")
+        
+        canonical_ids = []
+        for i in range(10):
+            article_id = add_article(
+                feed_id=feed_id,
+                title=f"Article {i}",
+                link=f"https://example.com/{i}",
+                full_text="text",
+                published_date="2024-01-01"
+            )
+            store_embedding(article_id, np.random.randn(384).astype(np.float32))
+            canonical_ids.append(article_id)
+        
+        # Like copies of the first 6 articles, which have no embedding
+        for i, canonical_id in enumerate(canonical_ids[:6]):
+            copy_id = add_article(
+                feed_id=feed_id,
+                title=f"Copy {i}",
+                link=f"https://example.com/copy{i}",
+                duplicate_of=canonical_id
+            )
+            like_article(copy_id, user_id=1)
+        
+        assert get_taste_centroids(user_id=1) is not None
+        
+        recommended_ids = {r['article_id'] for r in get_recommendations(user_id=1)}
+        assert recommended_ids
+        assert not recommended_ids.intersection(canonical_ids[:6])
 
 class TestCosineSimilarity:
     """Test cosine similarity calculation."""